@@ -45,14 +45,63 @@ February 2026
 ---
 """
 
+import heapq
+import itertools
 import math
+import random
+import time
+from collections import OrderedDict, deque
+from collections.abc import Sequence
 from datetime import datetime
 
+try:
+    import numpy as np
+except ImportError:  # optional: resonance scans fall back to pure Python
+    np = None
+
 
 # =============================================================================
 #                          RESONANCE FREQUENCY
 # =============================================================================
 
+class _Harmonics(list):
+    """
+    A frequency's harmonics. Still a plain list to read and edit, but
+    every in-place edit is validated first and then reported to the
+    frequency, so what was precomputed from the old values is refreshed.
+    """
+
+    __slots__ = ("_frequency",)
+
+    def __init__(self, frequency, harmonics):
+        super().__init__(harmonics)
+        self._frequency = frequency
+
+    def __reduce__(self):
+        return list, (list(self),)
+
+
+def _harmonics_edit(name):
+    method = getattr(list, name)
+
+    def edit(self, *args, **kwargs):
+        candidate = list(self)
+        result = method(candidate, *args, **kwargs)
+        ResonanceFrequency._validate(candidate)  # nothing changes if the edit is invalid
+        list.__setitem__(self, slice(None), candidate)
+        self._frequency._changed()
+        return self if result is candidate else result
+
+    edit.__name__ = name
+    return edit
+
+
+for _name in ("__setitem__", "__delitem__", "__iadd__", "__imul__", "append", "extend",
+              "insert", "pop", "remove", "clear", "sort", "reverse"):
+    setattr(_Harmonics, _name, _harmonics_edit(_name))
+del _name
+
+
 class ResonanceFrequency:
     """
     A vibrational signature — the unique identity of a being in the omniverse.
@@ -66,14 +115,56 @@ class ResonanceFrequency:
     - Lower harmonics: grounding, physical presence
     - Middle harmonics: emotional and mental resonance
     - Higher harmonics: spiritual and dimensional awareness
+
+    Harmonics may be edited in place or reassigned; the beings using
+    this frequency are told, so network indexes never go stale.
     """
 
     def __init__(self, harmonics):
+        harmonics = list(harmonics)
+        self._validate(harmonics)
+        self._harmonics = _Harmonics(self, harmonics)
+        self._beings = []  # beings whose frequency this is
+        self._version = 0  # bumped by every edit
+        self._refresh()
+
+    @staticmethod
+    def _validate(harmonics):
         if not harmonics:
             raise ValueError("A being must have at least one harmonic.")
         if not all(0.0 <= h <= 1.0 for h in harmonics):
             raise ValueError("Harmonics must be between 0.0 and 1.0.")
-        self.harmonics = list(harmonics)
+
+    @property
+    def harmonics(self):
+        """The harmonics, as a list that may be edited in place."""
+        return self._harmonics
+
+    @harmonics.setter
+    def harmonics(self, harmonics):
+        harmonics = list(harmonics)
+        self._validate(harmonics)
+        list.__setitem__(self._harmonics, slice(None), harmonics)
+        self._changed()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_harmonics"] = list(self._harmonics)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._harmonics = _Harmonics(self, state["_harmonics"])
+
+    def _refresh(self):
+        self._prefix_sums = list(itertools.accumulate(self._harmonics))
+
+    def _changed(self):
+        """Harmonics were edited: refresh derived values and re-index every being using them."""
+        self._refresh()
+        self._version += 1
+        for being in self._beings:
+            being._frequency_edited()
 
     def compatibility(self, other):
         """
@@ -86,15 +177,15 @@ class ResonanceFrequency:
         if not isinstance(other, ResonanceFrequency):
             raise TypeError("Can only calculate compatibility with another ResonanceFrequency.")
 
-        min_len = min(len(self.harmonics), len(other.harmonics))
-        max_len = max(len(self.harmonics), len(other.harmonics))
+        min_len = min(len(self._harmonics), len(other._harmonics))
+        max_len = max(len(self._harmonics), len(other._harmonics))
 
         if min_len == 0:
             return 0.0
 
         # Compare aligned harmonics
         alignment = sum(
-            1.0 - abs(self.harmonics[i] - other.harmonics[i])
+            1.0 - abs(self._harmonics[i] - other._harmonics[i])
             for i in range(min_len)
         )
 
@@ -103,6 +194,19 @@ class ResonanceFrequency:
 
         return round((alignment / min_len) * length_factor, 4)
 
+    def upper_bound(self, other):
+        """
+        A cheap ceiling on compatibility(other), before rounding.
+
+        Over the aligned harmonics the total difference is at least the
+        difference of their sums, |ΣA - ΣB|, read from precomputed prefix
+        sums; the length factor min_len / max_len applies on top.
+        """
+        min_len = min(len(self._harmonics), len(other._harmonics))
+        max_len = max(len(self._harmonics), len(other._harmonics))
+        gap = abs(self._prefix_sums[min_len - 1] - other._prefix_sums[min_len - 1])
+        return (min_len - gap) / max_len
+
     def shift(self, base_frequency):
         """
         Shift this frequency when crossing into a dimension with a different base.
@@ -156,24 +260,24 @@ class Dimension:
     - Akashic (7.0): The universal record. All information, all time.
     """
 
-    def __init__(self, name, base_frequency, description=""):
+    def __init__(self, name, base_frequency, description="", retention=None):
         self.name = name
         self.base_frequency = base_frequency
         self.description = description
-        self.beings = []
-        self.message_log = []
+        self.beings = {}  # insertion-ordered: being -> None
+        self.message_log = MessageLog(**(retention or {}))
 
     def enter(self, being):
         """A being enters this dimension."""
         if being not in self.beings:
-            self.beings.append(being)
+            self.beings[being] = None
             being.dimension = self
         return f"{being.name} enters the {self.name} dimension."
 
     def leave(self, being):
         """A being leaves this dimension."""
         if being in self.beings:
-            self.beings.remove(being)
+            del self.beings[being]
             being.dimension = None
         return f"{being.name} leaves the {self.name} dimension."
 
@@ -212,41 +316,88 @@ class ResonanceField:
         self.created_at = datetime.now().isoformat()
         self.active = self.harmony >= threshold
 
+    @staticmethod
+    def _units(compatibility):
+        # compatibility() is rounded to 4 places, so sums of it are kept
+        # exactly as integer ten-thousandths and never drift
+        return round(compatibility * 10000)
+
     def _calculate_harmony(self):
         """
         Calculate the collective harmony of all beings in this field.
 
         Uses pairwise compatibility averaging — the field is only as
         strong as the average connection between all participants.
-        """
-        if len(self.beings) < 2:
-            return 0.0
 
-        total = 0.0
-        pairs = 0
+        This is the full O(k²) recount; joins and departures afterwards
+        only adjust the running pairwise sum by the pairs they touch.
+        """
+        self._sources = [self._source(being) for being in self.beings]
+        self._frequencies = [self._counted(being) for being in self.beings]
+        self._pair_total = 0
         for i in range(len(self.beings)):
             for j in range(i + 1, len(self.beings)):
-                total += self.beings[i].frequency.compatibility(
-                    self.beings[j].frequency
+                self._pair_total += self._units(
+                    self._frequencies[i].compatibility(self._frequencies[j])
                 )
-                pairs += 1
+        return self._current_harmony()
+
+    def _current_harmony(self):
+        """Average pairwise compatibility from the running sum."""
+        pairs = len(self.beings) * (len(self.beings) - 1) // 2
+        return round(self._pair_total / (pairs * 10000), 4) if pairs > 0 else 0.0
+
+    @staticmethod
+    def _source(being):
+        # Which frequency, at which edit, a member was counted with
+        return being.frequency, being.frequency._version
+
+    @staticmethod
+    def _counted(being):
+        # A copy of the values counted, since harmonics can be edited in place
+        return ResonanceFrequency(being.frequency.harmonics)
+
+    def _contribution(self, index):
+        """Summed compatibility of one member with every other member."""
+        frequency = self._frequencies[index]
+        return sum(
+            self._units(frequency.compatibility(other))
+            for j, other in enumerate(self._frequencies) if j != index
+        )
 
-        return round(total / pairs, 4) if pairs > 0 else 0.0
+    def _resync(self):
+        """Recount the pairs of members whose frequency changed since they were counted."""
+        for i, being in enumerate(self.beings):
+            frequency, version = self._sources[i]
+            if being.frequency is not frequency or being.frequency._version != version:
+                self._pair_total -= self._contribution(i)
+                self._sources[i] = self._source(being)
+                self._frequencies[i] = self._counted(being)
+                self._pair_total += self._contribution(i)
 
     def add_being(self, being):
         """A new being joins the resonance field."""
         if being not in self.beings:
+            self._resync()
             self.beings.append(being)
-            self.harmony = self._calculate_harmony()
+            self._sources.append(self._source(being))
+            self._frequencies.append(self._counted(being))
+            self._pair_total += self._contribution(len(self.beings) - 1)
+            self.harmony = self._current_harmony()
             self.active = self.harmony >= self.threshold
         return self.active
 
     def remove_being(self, being):
         """A being leaves the resonance field."""
         if being in self.beings:
-            self.beings.remove(being)
+            self._resync()
+            index = self.beings.index(being)
+            self._pair_total -= self._contribution(index)
+            del self.beings[index]
+            del self._sources[index]
+            del self._frequencies[index]
             if len(self.beings) >= 2:
-                self.harmony = self._calculate_harmony()
+                self.harmony = self._current_harmony()
                 self.active = self.harmony >= self.threshold
             else:
                 self.harmony = 0.0
@@ -312,10 +463,135 @@ class Message:
         return f"Message(from={self.sender.name if self.sender else '?'}, scope={self.scope})"
 
 
+class MessageLog:
+    """
+    A message log with an optional retention policy.
+
+    Without limits it keeps every message, like a list. With them it is
+    a ring buffer: the oldest messages are evicted once the log holds
+    more than `max_messages`, once they are older than `max_age`
+    seconds, or while the content of those kept exceeds `max_bytes`
+    (the newest message is always kept). Age is also checked on every
+    read, so a quiet log does not keep serving expired messages.
+    `total` counts every message ever appended, evicted or not.
+    """
+
+    def __init__(self, max_messages=None, max_age=None, max_bytes=None):
+        if max_messages is not None and (not isinstance(max_messages, int) or isinstance(max_messages, bool)):
+            raise TypeError(f"max_messages must be an int, not {type(max_messages).__name__}.")
+        for limit, value in (("max_messages", max_messages), ("max_age", max_age), ("max_bytes", max_bytes)):
+            if value is not None and value <= 0:
+                raise ValueError(f"{limit} must be positive.")
+        self.max_messages = max_messages
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self._entries = deque(maxlen=max_messages)  # (arrival time, content bytes, message)
+        self._bytes = 0
+        self.total = 0
+
+    def append(self, message):
+        """Log a message, evicting whatever the retention policy no longer allows."""
+        if len(self._entries) == self.max_messages:
+            self._bytes -= self._entries[0][1]  # the deque drops it on append
+        size = 0 if self.max_bytes is None else len(str(message.content).encode("utf-8"))
+        self._entries.append((time.monotonic(), size, message))
+        self._bytes += size
+        self.total += 1
+        self.compact()
+
+    def _expire(self):
+        """Evict messages older than `max_age`."""
+        if self.max_age is None:
+            return
+        entries = self._entries
+        cutoff = time.monotonic() - self.max_age
+        while entries and entries[0][0] < cutoff:
+            self._bytes -= entries.popleft()[1]
+
+    def compact(self):
+        """Evict messages past their age or over the byte budget."""
+        self._expire()
+        entries = self._entries
+        if self.max_bytes is not None:
+            while self._bytes > self.max_bytes and len(entries) > 1:
+                self._bytes -= entries.popleft()[1]
+
+    @property
+    def evicted(self):
+        """How many messages retention has dropped."""
+        self._expire()
+        return self.total - len(self._entries)
+
+    def __len__(self):
+        self._expire()
+        return len(self._entries)
+
+    def __iter__(self):
+        self._expire()
+        return (message for _, _, message in self._entries)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return list(self)[position]
+        self._expire()
+        return self._entries[position][2]
+
+    def __eq__(self, other):
+        if isinstance(other, (list, MessageLog)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return f"MessageLog(kept={len(self)}, total={self.total})"
+
+
 # =============================================================================
 #                             CONGO BEING
 # =============================================================================
 
+class _InboxView(Sequence):
+    """
+    A live view of a being's unacknowledged messages (nothing is copied).
+
+    It reads like the list the inbox used to be, and append(), extend()
+    and clear() still act on the being's real inbox.
+    """
+
+    def __init__(self, being):
+        self._being = being
+
+    def _range(self):
+        return range(self._being._head, len(self._being._inbox))
+
+    def __len__(self):
+        return len(self._range())
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self._being._inbox[i] for i in self._range()[position]]
+        return self._being._inbox[self._range()[position]]
+
+    def __iter__(self):
+        return map(self._being._inbox.__getitem__, self._range())
+
+    def __eq__(self, other):
+        if isinstance(other, (list, _InboxView)):
+            return len(self) == len(other) and all(a is b or a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def append(self, message):
+        self._being._inbox.append(message)
+
+    def extend(self, messages):
+        self._being._inbox.extend(messages)
+
+    def clear(self):
+        self._being.clear_inbox()
+
+    def __repr__(self):
+        return f"Inbox({list(self)!r})"
+
+
 class CongoBeing:
     """
     An entity that communicates through the Congo network.
@@ -326,16 +602,47 @@ class CongoBeing:
     - A current dimension (where they exist right now)
     - An inbox (messages received through resonance)
     - Connections (other beings they've resonated with)
+
+    Every received message gets a cursor: its position in everything
+    this being has ever received. Clients page through new messages
+    with read_since() and acknowledge them with ack(), which moves the
+    read watermark and releases everything before it.
     """
 
+    # Acknowledged messages are dropped from the front of the store in
+    # batches, once they are at least this many and half of it
+    COMPACT_AFTER = 1024
+
     def __init__(self, name, harmonics):
         self.name = name
+        self._network = None
         self.frequency = ResonanceFrequency(harmonics)
         self.dimension = None
-        self.inbox = []
+        self._inbox = []     # received messages; those before _head are acknowledged
+        self._head = 0
+        self._released = 0   # cursor of _inbox[0]
         self.connections = []
         self.sent_count = 0
 
+    @property
+    def frequency(self):
+        """This being's ResonanceFrequency."""
+        return self._frequency
+
+    @frequency.setter
+    def frequency(self, frequency):
+        previous = getattr(self, "_frequency", None)
+        if previous is not None:
+            previous._beings.remove(self)
+        self._frequency = frequency
+        frequency._beings.append(self)
+        self._frequency_edited()
+
+    def _frequency_edited(self):
+        """Keep the network's resonance indexes current after a frequency change."""
+        if self._network is not None:
+            self._network._frequency_changed(self)
+
     def resonate_with(self, other):
         """
         Attempt to form a resonance connection with another being.
@@ -351,28 +658,656 @@ class CongoBeing:
 
     def receive(self, message):
         """Receive a message through the resonance network."""
-        self.inbox.append(message)
+        self._inbox.append(message)
         if self.name not in message.delivered_to:
             message.delivered_to.append(self.name)
 
+    @property
+    def inbox(self):
+        """Unacknowledged messages, oldest first, as a live view."""
+        return _InboxView(self)
+
+    @property
+    def read_cursor(self):
+        """The read watermark: every message before this cursor is acknowledged."""
+        return self._released + self._head
+
     @property
     def unread_count(self):
-        """Number of messages in inbox."""
-        return len(self.inbox)
+        """Number of messages not yet acknowledged."""
+        return len(self._inbox) - self._head
 
     def read_inbox(self):
-        """Read all messages and return them."""
-        return list(self.inbox)
+        """Read all unacknowledged messages and return them (a copy)."""
+        return self._inbox[self._head:]
+
+    def read_since(self, cursor=None, limit=None):
+        """
+        Page through the inbox without copying all of it.
+
+        Returns up to `limit` messages from `cursor` on (default: the read
+        watermark) and the cursor to continue from. Reading does not
+        acknowledge; acknowledged messages are no longer returned.
+        """
+        end = self._released + len(self._inbox)
+        if cursor is None:
+            cursor = self.read_cursor
+        if not 0 <= cursor <= end:
+            raise ValueError(f"Cursor {cursor} is outside the inbox (0..{end}).")
+        start = max(cursor, self.read_cursor) - self._released
+        stop = len(self._inbox) if limit is None else min(len(self._inbox), start + limit)
+        return {"messages": self._inbox[start:stop], "cursor": self._released + stop}
+
+    def ack(self, cursor):
+        """
+        Acknowledge every message before `cursor`, releasing them.
+
+        The watermark only moves forward. Returns the unread count.
+        """
+        end = self._released + len(self._inbox)
+        if not 0 <= cursor <= end:
+            raise ValueError(f"Cursor {cursor} is outside the inbox (0..{end}).")
+        self._head = max(self._head, cursor - self._released)
+        if self._head >= self.COMPACT_AFTER and self._head * 2 >= len(self._inbox):
+            del self._inbox[:self._head]
+            self._released += self._head
+            self._head = 0
+        return self.unread_count
 
     def clear_inbox(self):
-        """Clear all read messages."""
-        self.inbox.clear()
+        """Acknowledge and release every message."""
+        self._released += len(self._inbox)
+        self._inbox = []
+        self._head = 0
 
     def __repr__(self):
         dim = self.dimension.name if self.dimension else "unanchored"
         return f"CongoBeing({self.name}, dim={dim}, connections={len(self.connections)})"
 
 
+# =============================================================================
+#                           HARMONIC MATRIX
+# =============================================================================
+
+# compatibility() rounds to 4 places, so a raw score this close to the
+# threshold could land on either side; those rows are checked exactly.
+_ROUNDING_BAND = 0.5e-4 + 1e-9
+
+
+class HarmonicMatrix:
+    """
+    Every registered being's harmonics in contiguous NumPy arrays, one
+    2-D array per harmonic depth, so one-vs-all compatibility is a single
+    vectorized expression per depth instead of a Python loop over beings.
+
+    Requires NumPy. Results are exact: rows whose vectorized score is
+    within rounding distance of the threshold are rechecked with
+    ResonanceFrequency.compatibility().
+
+    Each row's harmonic sum is kept too. For a query at least as deep as
+    a group, |ΣA - ΣB| bounds the row's total difference, so rows the
+    bound rules out can be dropped before scoring. That is only worth it
+    when the bound, measured per query, rejects most of the group.
+    """
+
+    # Score only the rows the bound keeps when they are at most this share
+    # of the group; past it gathering them costs more than scoring all rows.
+    PRUNE_SHARE = 0.5
+
+    def __init__(self):
+        self._groups = {}  # depth -> [harmonics array, registration order array, beings, size, row sums]
+        self._rows = {}    # being -> (depth, row)
+
+    def add(self, being, order):
+        """Add a being, remembering its registration order."""
+        harmonics = being.frequency.harmonics
+        depth = len(harmonics)
+        group = self._groups.get(depth)
+        if group is None:
+            group = self._groups[depth] = [np.empty((16, depth)), np.empty(16, dtype=np.int64), [], 0, np.empty(16)]
+        array, orders, beings, size, sums = group
+        if size == len(array):
+            array = group[0] = np.concatenate([array, np.empty_like(array)])
+            orders = group[1] = np.concatenate([orders, np.empty_like(orders)])
+            sums = group[4] = np.concatenate([sums, np.empty_like(sums)])
+        array[size] = harmonics
+        orders[size] = order
+        sums[size] = array[size].sum()
+        beings.append(being)
+        group[3] = size + 1
+        self._rows[being] = (depth, size)
+
+    def remove(self, being):
+        """Remove a being, moving the group's last row into its place."""
+        depth, row = self._rows.pop(being)
+        group = self._groups[depth]
+        array, orders, beings, size, sums = group
+        last = size - 1
+        if row != last:
+            array[row] = array[last]
+            orders[row] = orders[last]
+            sums[row] = sums[last]
+            beings[row] = beings[last]
+            self._rows[beings[row]] = (depth, row)
+        beings.pop()
+        group[3] = last
+
+    def update(self, being):
+        """Refresh a being's row after its frequency changed."""
+        depth, row = self._rows[being]
+        order = int(self._groups[depth][1][row])
+        self.remove(being)
+        self.add(being, order)
+
+    def scores(self, frequency, at_least=None):
+        """
+        Yield (depth, raw scores, rows) per depth group: compatibility with
+        `frequency` before rounding, including the min_len / max_len factor,
+        for the group's rows `rows` (an index array).
+
+        Groups whose length factor alone keeps every score below
+        `at_least` are skipped, and so are rows whose sum bound does when
+        that prunes enough of the group.
+        """
+        query = np.asarray(frequency.harmonics, dtype=float)
+        for depth, (array, _, _, size, sums) in self._groups.items():
+            if not size:
+                continue
+            aligned, longest = min(depth, len(query)), max(depth, len(query))
+            rows = np.arange(size)
+            if at_least is not None:
+                if aligned / longest < at_least:
+                    continue
+                if aligned == depth:
+                    gap = np.abs(sums[:size] - frequency._prefix_sums[aligned - 1])
+                    kept = np.flatnonzero(aligned - gap >= at_least * longest)
+                    if len(kept) <= self.PRUNE_SHARE * size:
+                        rows = kept
+            if len(rows) == size:
+                alignment = (1.0 - np.abs(array[:size, :aligned] - query[:aligned])).sum(axis=1)
+            else:
+                alignment = (1.0 - np.abs(array[rows, :aligned] - query[:aligned])).sum(axis=1)
+            yield depth, alignment / longest, rows
+
+    def resonant(self, frequency, threshold):
+        """Every indexed being whose compatibility with `frequency` is >= threshold, in registration order."""
+        found = []
+        for depth, raw, rows in self.scores(frequency, threshold - _ROUNDING_BAND):
+            array, orders, beings, _, _ = self._groups[depth]
+            sure = raw >= threshold + _ROUNDING_BAND
+            band = ~sure & (raw >= threshold - _ROUNDING_BAND)
+            for row in rows[sure]:
+                found.append((orders[row], beings[row]))
+            for row in rows[band]:
+                if frequency.compatibility(beings[row].frequency) >= threshold:
+                    found.append((orders[row], beings[row]))
+        found.sort(key=lambda item: item[0])
+        return [being for _, being in found]
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __repr__(self):
+        return f"HarmonicMatrix(beings={len(self._rows)}, depths={sorted(self._groups)})"
+
+
+def _pair_scores(a, a_depths, b, b_depths):
+    """
+    Raw compatibility (before rounding) of every row of `a` against every
+    row of `b`: zero-padded harmonics plus each row's true depth.
+    """
+    aligned = np.minimum(a_depths[:, None], b_depths[None, :])
+    longest = np.maximum(a_depths[:, None], b_depths[None, :])
+    alignment = np.zeros(aligned.shape)
+    for k in range(a.shape[1]):
+        active = aligned > k
+        if not active.any():
+            break
+        alignment += np.where(active, 1.0 - np.abs(a[:, k, None] - b[None, :, k]), 0.0)
+    return (alignment / aligned) * (aligned / longest)
+
+
+def _round_scores(raw, exact):
+    """
+    Round raw scores to 4 places as compatibility() does. Scores within
+    float error of a rounding boundary are recomputed with exact(i, j).
+    """
+    scaled = raw * 1e4
+    rounded = np.round(scaled) / 1e4
+    for i, j in zip(*np.nonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6)):
+        rounded[i, j] = exact(i, j)
+    return rounded
+
+
+# =============================================================================
+#                           RESONANCE INDEX
+# =============================================================================
+
+# Thresholds from which a range query on the index beats checking every
+# being: the index prunes well only when few beings qualify, and the
+# vectorized matrix stays competitive longer than a Python scan.
+_INDEX_FROM = 0.8
+_INDEX_FROM_WITH_NUMPY = 0.9
+
+# upper_bound() costs about a third of compatibility(), so checking it
+# first pays once it rejects at least this share of the beings. The scan
+# measures that share chunk by chunk: a chunk scanned without the bound
+# still checks it on its first few beings.
+_PRUNE_BREAKEVEN = 0.3
+_SCAN_CHUNK = 512
+_SCAN_PROBE = 32
+
+
+def _l1(a, b):
+    """L1 distance between two harmonic vectors of equal length."""
+    return sum(abs(x - y) for x, y in zip(a, b))
+
+
+class _VPTree:
+    """
+    A vantage-point tree over equal-length harmonic vectors under L1.
+
+    Each node keeps a vantage point and the median distance `mu` to the
+    rest; points within `mu` go inside, the others outside. Small
+    subtrees are plain lists.
+    """
+
+    LEAF_SIZE = 16
+
+    def __init__(self, items):
+        self.root = self._build(list(items))
+
+    def _build(self, items):
+        if len(items) <= self.LEAF_SIZE:
+            return items
+        vantage = items.pop(len(items) // 2)
+        scored = sorted(((_l1(vantage[1], item[1]), item) for item in items), key=lambda pair: pair[0])
+        half = len(scored) // 2
+        mu = scored[half][0]
+        inside = [item for distance, item in scored[:half + 1]]
+        outside = [item for distance, item in scored[half + 1:]]
+        return (vantage, mu, self._build(inside), self._build(outside))
+
+    def within(self, query, radius):
+        """Yield (distance, being) for every point within `radius` of `query`."""
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, list):
+                for being, vector in node:
+                    distance = _l1(query, vector)
+                    if distance <= radius:
+                        yield distance, being
+                continue
+            (being, vector), mu, inside, outside = node
+            distance = _l1(query, vector)
+            if distance <= radius:
+                yield distance, being
+            if distance - radius <= mu:
+                stack.append(inside)
+            if distance + radius >= mu:
+                stack.append(outside)
+
+    def nearest(self, query, k, skip):
+        """The k (distance, being) pairs closest to `query`, ignoring beings in `skip`."""
+        best = []  # max-heap of (-distance, tiebreak, being)
+        tau = math.inf
+
+        def consider(distance, being):
+            nonlocal tau
+            if being in skip or (len(best) == k and distance >= tau):
+                return
+            heapq.heappush(best, (-distance, id(being), being))
+            if len(best) > k:
+                heapq.heappop(best)
+            if len(best) == k:
+                tau = -best[0][0]
+
+        stack = [(0.0, self.root)]  # (lower bound on distance, node)
+        while stack:
+            bound, node = stack.pop()
+            if bound > tau:
+                continue
+            if isinstance(node, list):
+                for being, vector in node:
+                    consider(_l1(query, vector), being)
+                continue
+            (being, vector), mu, inside, outside = node
+            distance = _l1(query, vector)
+            consider(distance, being)
+            # Push the far side first so the near side is searched first
+            if distance <= mu:
+                stack.append((mu - distance, outside))
+                stack.append((0.0, inside))
+            else:
+                stack.append((distance - mu, inside))
+                stack.append((0.0, outside))
+        return sorted(((-negative, being) for negative, _, being in best), key=lambda pair: pair[0])
+
+
+class _MetricIndex:
+    """
+    A VP-tree over harmonic vectors truncated to `length`, kept current
+    without rebuilding on every change: new vectors wait in a small
+    buffer that is scanned directly, removed ones are skipped, and the
+    tree is rebuilt once the buffer and removals pass 1/8 of its size.
+    """
+
+    def __init__(self, length, vectors=None):
+        self.length = length
+        self.vectors = {}
+        for being, vector in (vectors or {}).items():
+            self.vectors[being] = tuple(vector[:length])
+        self._rebuild()
+
+    def _rebuild(self):
+        self._tree = _VPTree(self.vectors.items())
+        self._in_tree = set(self.vectors)
+        self._pending = {}
+        self._removed = set()
+
+    def add(self, being, harmonics):
+        vector = tuple(harmonics[:self.length])
+        self.vectors[being] = vector
+        self._pending[being] = vector
+        self._maybe_rebuild()
+
+    def remove(self, being):
+        del self.vectors[being]
+        self._pending.pop(being, None)
+        if being in self._in_tree:
+            self._removed.add(being)
+        self._maybe_rebuild()
+
+    def _maybe_rebuild(self):
+        if len(self._pending) + len(self._removed) > max(32, len(self._in_tree) // 8):
+            self._rebuild()
+
+    def within(self, query, radius):
+        """Every being whose vector is within `radius` of `query`."""
+        found = [being for _, being in self._tree.within(query, radius) if being not in self._removed]
+        found.extend(being for being, vector in self._pending.items() if _l1(query, vector) <= radius)
+        return found
+
+    def nearest(self, query, k):
+        """The k (distance, being) pairs closest to `query`."""
+        found = self._tree.nearest(query, k, self._removed)
+        found.extend((_l1(query, vector), being) for being, vector in self._pending.items())
+        found.sort(key=lambda pair: pair[0])
+        return found[:k]
+
+
+class ResonanceIndex:
+    """
+    A metric index for resonance queries that avoids scanning every being.
+
+    For two frequencies whose aligned (shorter) depth is m and longer
+    depth is M, compatibility is (m - L1) / M, where L1 is the distance
+    between their first m harmonics. So "compatibility >= threshold" is
+    "L1 <= m - threshold * M": a range query in a metric space. Beings
+    are grouped by depth, each group with a VP-tree under L1; a query
+    shorter than a group uses a tree over that group's prefixes, built
+    the first time it is needed. Groups whose length factor m / M alone
+    rules them out are skipped.
+
+    Results equal a full scan: candidates are confirmed with
+    ResonanceFrequency.compatibility().
+    """
+
+    def __init__(self):
+        self._depths = {}   # depth -> {being: harmonics as indexed}
+        self._indexes = {}  # (depth, length) -> _MetricIndex
+        self._order = {}    # being -> (registration order, depth)
+
+    def add(self, being, order):
+        """Index a being, remembering its registration order."""
+        harmonics = tuple(being.frequency.harmonics)
+        depth = len(harmonics)
+        self._depths.setdefault(depth, {})[being] = harmonics
+        self._order[being] = (order, depth)
+        for (indexed_depth, _), index in self._indexes.items():
+            if indexed_depth == depth:
+                index.add(being, harmonics)
+
+    def remove(self, being):
+        """Drop a being from the index."""
+        _, depth = self._order.pop(being)
+        del self._depths[depth][being]
+        for (indexed_depth, _), index in self._indexes.items():
+            if indexed_depth == depth:
+                index.remove(being)
+
+    def update(self, being):
+        """Re-index a being after its frequency changed."""
+        order, _ = self._order[being]
+        self.remove(being)
+        self.add(being, order)
+
+    def _index(self, depth, length):
+        index = self._indexes.get((depth, length))
+        if index is None:
+            index = self._indexes[(depth, length)] = _MetricIndex(length, self._depths[depth])
+        return index
+
+    def resonant(self, frequency, threshold):
+        """Every indexed being whose compatibility with `frequency` is >= threshold, in registration order."""
+        query = frequency.harmonics
+        found = []
+        for depth, members in self._depths.items():
+            if not members:
+                continue
+            aligned, longest = min(depth, len(query)), max(depth, len(query))
+            floor = threshold - _ROUNDING_BAND
+            if aligned / longest < floor:
+                continue  # the length factor alone caps compatibility below the threshold
+            radius = aligned - floor * longest + 1e-9
+            for being in self._index(depth, aligned).within(query[:aligned], radius):
+                if frequency.compatibility(being.frequency) >= threshold:
+                    found.append(being)
+        found.sort(key=self._order.__getitem__)
+        return found
+
+    def nearest(self, frequency, k, exclude=None):
+        """
+        The k beings with the highest compatibility with `frequency`, as
+        (being, compatibility), ties in registration order.
+        """
+        if k < 1:
+            return []
+        query = frequency.harmonics
+        candidates = []
+        wanted = k + (exclude is not None)
+        for depth, members in self._depths.items():
+            if not members:
+                continue
+            aligned = min(depth, len(query))
+            for _, being in self._index(depth, aligned).nearest(query[:aligned], wanted):
+                if being is not exclude:
+                    candidates.append(frequency.compatibility(being.frequency))
+        if not candidates:
+            return []
+        candidates.sort(reverse=True)
+        # Everything tied with the k-th best must be considered for the order
+        cutoff = candidates[min(k, len(candidates)) - 1]
+        ranked = [
+            (being, frequency.compatibility(being.frequency))
+            for being in self.resonant(frequency, cutoff) if being is not exclude
+        ]
+        ranked.sort(key=lambda pair: -pair[1])
+        return ranked[:k]
+
+    def __len__(self):
+        return len(self._order)
+
+    def __repr__(self):
+        return f"ResonanceIndex(beings={len(self._order)}, depths={sorted(self._depths)})"
+
+
+# =============================================================================
+#                           RESONANCE LSH
+# =============================================================================
+
+class ResonanceLSH:
+    """
+    Approximate resonance search by locality-sensitive hashing under L1.
+
+    Each hash bit samples one harmonic i and a cut c in [0, 1) and
+    records whether harmonic i lies above c. Two vectors disagree on
+    that bit with probability |x_i - y_i| averaged over i, so they
+    agree with probability alignment / m — the compatibility before the
+    length factor. A table keys beings by `bits` such samples; a query
+    collects the buckets it lands in across enough tables that a being
+    exactly at the threshold is found with probability `recall`.
+    Candidates are confirmed with compatibility(), so results are never
+    wrong, only sometimes incomplete.
+
+    Each depth group and query length has one family of tables, grown
+    only as far as queries need and built on first use; at most
+    `max_families` families are kept (least recently used go first),
+    since every registration has to be hashed into all of them. When the
+    target would need more than `max_tables` tables, or the tables would
+    let through so many unrelated beings that nothing is pruned,
+    resonant() returns None and the caller should search exactly.
+    """
+
+    # Above this expected share of candidates, an exact search is cheaper
+    MAX_CANDIDATE_FRACTION = 0.05
+    # Random pairs sampled per group to estimate how many beings a query lets through
+    BACKGROUND_SAMPLES = 64
+
+    def __init__(self, bits=16, max_tables=32, max_families=8, seed=0):
+        if bits < 1 or max_tables < 1 or max_families < 1:
+            raise ValueError("bits, max_tables and max_families must be at least 1.")
+        self.bits = bits
+        self.max_tables = max_tables
+        self.max_families = max_families
+        self._rng = random.Random(seed)
+        self._depths = {}                 # depth -> {being: harmonics as hashed}
+        self._families = OrderedDict()    # (depth, length) -> [(samples, buckets)], least recent first
+        self._background = {}             # (depth, length) -> agreements of sampled pairs
+        self._order = {}                  # being -> (registration order, depth)
+
+    def add(self, being, order):
+        """Hash a being into every table built for its depth."""
+        harmonics = tuple(being.frequency.harmonics)
+        depth = len(harmonics)
+        self._depths.setdefault(depth, {})[being] = harmonics
+        self._order[being] = (order, depth)
+        for (family_depth, _), tables in self._families.items():
+            if family_depth == depth:
+                for samples, buckets in tables:
+                    buckets.setdefault(self._key(samples, harmonics), set()).add(being)
+
+    def remove(self, being):
+        """Drop a being from every table."""
+        _, depth = self._order.pop(being)
+        harmonics = self._depths[depth].pop(being)
+        for (family_depth, _), tables in self._families.items():
+            if family_depth == depth:
+                for samples, buckets in tables:
+                    key = self._key(samples, harmonics)
+                    buckets[key].discard(being)
+                    if not buckets[key]:
+                        del buckets[key]
+
+    def update(self, being):
+        """Re-hash a being after its frequency changed."""
+        order, _ = self._order[being]
+        self.remove(being)
+        self.add(being, order)
+
+    @staticmethod
+    def _key(samples, harmonics):
+        return tuple(harmonics[i] > cut for i, cut in samples)
+
+    def _tables_needed(self, agreement, recall):
+        """Tables so a being at `agreement` is found with probability >= recall, or None."""
+        if agreement >= 1.0:
+            return 1  # only identical prefixes qualify, and they always collide
+        hit = agreement ** self.bits
+        if hit <= 0.0:
+            return None
+        tables = math.ceil(math.log(1.0 - recall) / math.log(1.0 - hit))
+        return tables if tables <= self.max_tables else None
+
+    def _candidate_share(self, depth, length, count):
+        """Expected share of a group that `count` tables make candidates for a query."""
+        agreements = self._background.get((depth, length))
+        if agreements is None:
+            members = list(self._depths[depth].values())
+            agreements = self._background[(depth, length)] = [
+                1.0 - _l1(a[:length], b[:length]) / length
+                for a, b in (
+                    (self._rng.choice(members), self._rng.choice(members))
+                    for _ in range(self.BACKGROUND_SAMPLES)
+                )
+            ]
+        # Per pair, since a few near neighbours collide far more than the rest
+        return sum(1.0 - (1.0 - agreement ** self.bits) ** count for agreement in agreements) / len(agreements)
+
+    def _tables(self, depth, length, count):
+        key = (depth, length)
+        tables = self._families.get(key)
+        if tables is None:
+            tables = self._families[key] = []
+            if len(self._families) > self.max_families:
+                evicted, _ = self._families.popitem(last=False)
+                self._background.pop(evicted, None)
+        self._families.move_to_end(key)
+        while len(tables) < count:
+            samples = [(self._rng.randrange(length), self._rng.random()) for _ in range(self.bits)]
+            buckets = {}
+            for being, harmonics in self._depths[depth].items():
+                buckets.setdefault(self._key(samples, harmonics), set()).add(being)
+            tables.append((samples, buckets))
+        return tables[:count]
+
+    def resonant(self, frequency, threshold, recall=0.95):
+        """
+        Indexed beings whose compatibility with `frequency` is >= threshold,
+        in registration order — each found with probability >= recall —
+        or None when hashing cannot beat an exact search.
+        """
+        if not 0.0 < recall < 1.0:
+            raise ValueError("recall must be between 0 and 1 (exclusive).")
+        query = frequency.harmonics
+        floor = threshold - _ROUNDING_BAND
+        if floor <= 0:
+            return None  # every being qualifies
+        plans = []
+        expected = 0.0
+        for depth, members in self._depths.items():
+            if not members:
+                continue
+            aligned, longest = min(depth, len(query)), max(depth, len(query))
+            if aligned / longest < floor:
+                continue  # the length factor alone caps compatibility below the threshold
+            count = self._tables_needed(min(1.0, floor * longest / aligned), recall)
+            if count is None:
+                return None
+            expected += len(members) * self._candidate_share(depth, aligned, count)
+            plans.append((depth, aligned, count))
+        if expected > self.MAX_CANDIDATE_FRACTION * len(self._order):
+            return None
+        candidates = set()
+        for depth, aligned, count in plans:
+            prefix = query[:aligned]
+            for samples, buckets in self._tables(depth, aligned, count):
+                candidates.update(buckets.get(self._key(samples, prefix), ()))
+        found = [being for being in candidates if frequency.compatibility(being.frequency) >= threshold]
+        found.sort(key=self._order.__getitem__)
+        return found
+
+    def __len__(self):
+        return len(self._order)
+
+    def __repr__(self):
+        return (
+            f"ResonanceLSH(beings={len(self._order)}, bits={self.bits}, "
+            f"max_tables={self.max_tables}, families={len(self._families)})"
+        )
+
+
 # =============================================================================
 #                           CONGO NETWORK
 # =============================================================================
@@ -394,21 +1329,27 @@ class CongoNetwork:
     "Distance is an illusion. Resonance is the only address."
     """
 
-    def __init__(self):
+    def __init__(self, max_messages=None, max_age=None, max_bytes=None):
+        # Retention for the network's message log and every dimension's
+        self.retention = {"max_messages": max_messages, "max_age": max_age, "max_bytes": max_bytes}
         self.dimensions = {}
         self.beings = {}
         self.fields = []
-        self.message_log = []
+        self.message_log = MessageLog(**self.retention)
+        self._matrix = HarmonicMatrix() if np is not None else None
+        self._index = ResonanceIndex()
+        self._lsh = None  # built by the first approximate search
+        self._registered = 0
         self._setup_default_dimensions()
 
     def _setup_default_dimensions(self):
         """Initialize the five fundamental dimensions of the omniverse."""
         defaults = [
-            Dimension("HOME", 0.0, "The ground state. Pure stillness. Pure potential."),
-            Dimension("Physical", 1.0, "The material plane. Bodies, matter, sensory experience."),
-            Dimension("Astral", 2.718, "The dream plane. Consciousness untethered from form."),
-            Dimension("Causal", 3.14159, "The plane of cause and effect. Karma's domain."),
-            Dimension("Akashic", 7.0, "The universal record. All information, all time."),
+            Dimension("HOME", 0.0, "The ground state. Pure stillness. Pure potential.", self.retention),
+            Dimension("Physical", 1.0, "The material plane. Bodies, matter, sensory experience.", self.retention),
+            Dimension("Astral", 2.718, "The dream plane. Consciousness untethered from form.", self.retention),
+            Dimension("Causal", 3.14159, "The plane of cause and effect. Karma's domain.", self.retention),
+            Dimension("Akashic", 7.0, "The universal record. All information, all time.", self.retention),
         ]
         for dim in defaults:
             self.dimensions[dim.name] = dim
@@ -417,7 +1358,7 @@ class CongoNetwork:
         """Add a new dimension to the network."""
         if name in self.dimensions:
             return f"Dimension '{name}' already exists."
-        dim = Dimension(name, base_frequency, description)
+        dim = Dimension(name, base_frequency, description, self.retention)
         self.dimensions[name] = dim
         return f"Dimension '{name}' (freq={base_frequency}) added to the Congo network."
 
@@ -437,8 +1378,59 @@ class CongoNetwork:
         being = CongoBeing(name, harmonics)
         self.dimensions[dimension_name].enter(being)
         self.beings[name] = being
+        being._network = self
+        if self._matrix is not None:
+            self._matrix.add(being, self._registered)
+        self._index.add(being, self._registered)
+        if self._lsh is not None:
+            self._lsh.add(being, self._registered)
+        self._registered += 1
         return being
 
+    def _frequency_changed(self, being):
+        """Keep the resonance index current when a being's frequency is replaced."""
+        if self._matrix is not None:
+            self._matrix.update(being)
+        self._index.update(being)
+        if self._lsh is not None:
+            self._lsh.update(being)
+
+    def _resonant_beings(self, being, threshold):
+        """Every other being resonating with `being` at >= threshold, in registration order."""
+        if threshold >= (_INDEX_FROM_WITH_NUMPY if self._matrix is not None else _INDEX_FROM):
+            return [b for b in self._index.resonant(being.frequency, threshold) if b is not being]
+        if self._matrix is not None:
+            return [b for b in self._matrix.resonant(being.frequency, threshold) if b is not being]
+        frequency = being.frequency
+        floor = threshold - _ROUNDING_BAND
+        found = []
+        others = iter(self.beings.values())
+        prune = True
+        while True:
+            chunk = list(itertools.islice(others, _SCAN_CHUNK))
+            if not chunk:
+                return found
+            probed = chunk if prune else chunk[:_SCAN_PROBE]
+            kept = [other for other in probed if frequency.upper_bound(other.frequency) >= floor]
+            prune = len(probed) - len(kept) >= _PRUNE_BREAKEVEN * len(probed)
+            if probed is not chunk:
+                kept += chunk[_SCAN_PROBE:]
+            found.extend(
+                other for other in kept
+                if other is not being and frequency.compatibility(other.frequency) >= threshold
+            )
+
+    def _approximate_resonant(self, being, threshold, recall):
+        """_resonant_beings() through ResonanceLSH, or exactly when hashing would not prune."""
+        if self._lsh is None:
+            self._lsh = ResonanceLSH()
+            for order, other in enumerate(self.beings.values()):
+                self._lsh.add(other, order)
+        found = self._lsh.resonant(being.frequency, threshold, recall)
+        if found is None:
+            return self._resonant_beings(being, threshold)
+        return [b for b in found if b is not being]
+
     def send(self, sender_name, recipient_name, content):
         """
         Send a direct message through resonance.
@@ -510,10 +1502,7 @@ class CongoNetwork:
                 recipients = [b for b in sender.dimension.beings if b.name != sender_name]
 
         elif scope == "resonant":
-            for name, being in self.beings.items():
-                if name != sender_name:
-                    if sender.frequency.compatibility(being.frequency) >= 0.3:
-                        recipients.append(being)
+            recipients = self._resonant_beings(sender, 0.3)
 
         elif scope == "omniverse":
             recipients = [b for name, b in self.beings.items() if name != sender_name]
@@ -533,31 +1522,157 @@ class CongoNetwork:
             "recipients": [r.name for r in recipients],
         }
 
-    def find_resonant(self, being_name, threshold=0.3):
+    def find_resonant(self, being_name, threshold=0.3, approximate=False, recall=0.95):
         """
         Find all beings that resonate with the given being above a threshold.
 
         This is how you discover who you can connect with in the omniverse.
         No search. No directory. Just resonance.
+
+        With approximate=True the search goes through locality-sensitive
+        hashing instead: far faster on large networks, every result is
+        genuine, but each resonant being is only found with probability
+        `recall` (see measure_recall()).
         """
         if being_name not in self.beings:
             raise ValueError(f"Being '{being_name}' not registered.")
 
         being = self.beings[being_name]
-        resonant = []
-
-        for name, other in self.beings.items():
-            if name != being_name:
-                compat = being.frequency.compatibility(other.frequency)
-                if compat >= threshold:
-                    resonant.append({
-                        "name": other.name,
-                        "compatibility": compat,
-                        "dimension": other.dimension.name if other.dimension else None,
-                    })
+        if approximate:
+            others = self._approximate_resonant(being, threshold, recall)
+        else:
+            others = self._resonant_beings(being, threshold)
+        resonant = [
+            {
+                "name": other.name,
+                "compatibility": being.frequency.compatibility(other.frequency),
+                "dimension": other.dimension.name if other.dimension else None,
+            }
+            for other in others
+        ]
 
         return sorted(resonant, key=lambda x: x["compatibility"], reverse=True)
 
+    def measure_recall(self, threshold=0.3, recall=0.95, samples=100, seed=0):
+        """
+        Compare approximate find_resonant() against the exact search.
+
+        Runs both for `samples` randomly chosen beings and reports the
+        fraction of exact matches the approximate search found, along
+        with the time each took.
+        """
+        names = list(self.beings)
+        chosen = random.Random(seed).sample(names, min(samples, len(names)))
+        exact = approximate = found = 0
+        exact_seconds = approximate_seconds = 0.0
+        for name in chosen:
+            start = time.perf_counter()
+            truth = {r["name"] for r in self.find_resonant(name, threshold)}
+            exact_seconds += time.perf_counter() - start
+            start = time.perf_counter()
+            guess = {r["name"] for r in self.find_resonant(name, threshold, approximate=True, recall=recall)}
+            approximate_seconds += time.perf_counter() - start
+            exact += len(truth)
+            approximate += len(guess)
+            found += len(truth & guess)
+        return {
+            "target": recall,
+            "recall": found / exact if exact else 1.0,
+            "queries": len(chosen),
+            "exact_matches": exact,
+            "approximate_matches": approximate,
+            "exact_seconds": round(exact_seconds, 4),
+            "approximate_seconds": round(approximate_seconds, 4),
+        }
+
+    def nearest_resonant(self, being_name, k=10):
+        """
+        Find the k beings that resonate most strongly with the given being.
+
+        Sorted by compatibility, strongest first; ties keep registration order.
+        """
+        if being_name not in self.beings:
+            raise ValueError(f"Being '{being_name}' not registered.")
+
+        being = self.beings[being_name]
+        return [
+            {
+                "name": other.name,
+                "compatibility": compat,
+                "dimension": other.dimension.name if other.dimension else None,
+            }
+            for other, compat in self._index.nearest(being.frequency, k, exclude=being)
+        ]
+
+    def compatibility_matrix(self, block_size=1024, threshold=None, path=None):
+        """
+        Pairwise compatibility of every registered being, computed in
+        block_size x block_size tiles so that, beyond the beings'
+        harmonics, peak memory stays O(block_size²).
+
+        - With a threshold: a sparse edge list of (name, name, compatibility)
+          for every pair at or above it, each pair once, in registration order.
+        - With a path: the full matrix written to a memory-mapped .npy file
+          (rows and columns in registration order), returned as a memmap.
+        - Otherwise: the full matrix as an in-memory array.
+
+        Scores equal compatibility(). Without NumPy only the edge list is
+        available, computed by plain pairwise calls.
+        """
+        if block_size < 1:
+            raise ValueError("block_size must be at least 1.")
+        beings = list(self.beings.values())
+        n = len(beings)
+
+        if np is None:
+            if threshold is None:
+                raise RuntimeError("A dense compatibility matrix requires NumPy.")
+            edges = []
+            for i, a in enumerate(beings):
+                for b in beings[i + 1:]:
+                    compat = a.frequency.compatibility(b.frequency)
+                    if compat >= threshold:
+                        edges.append((a.name, b.name, compat))
+            return edges
+
+        depths = np.array([b.frequency.depth for b in beings], dtype=np.int64)
+        padded = np.zeros((n, int(depths.max()) if n else 0))
+        for row, being in enumerate(beings):
+            padded[row, :depths[row]] = being.frequency.harmonics
+
+        if threshold is not None:
+            edges = []
+        elif path is not None:
+            matrix = np.lib.format.open_memmap(path, mode="w+", dtype=np.float64, shape=(n, n))
+        else:
+            matrix = np.empty((n, n))
+
+        for start in range(0, n, block_size):
+            rows = slice(start, min(start + block_size, n))
+            for col_start in range(start, n, block_size):
+                cols = slice(col_start, min(col_start + block_size, n))
+                tile = _round_scores(
+                    _pair_scores(padded[rows], depths[rows], padded[cols], depths[cols]),
+                    lambda i, j: beings[start + i].frequency.compatibility(
+                        beings[col_start + j].frequency),
+                )
+                if threshold is None:
+                    matrix[rows, cols] = tile
+                    matrix[cols, rows] = tile.T
+                    continue
+                keep = tile >= threshold
+                if col_start == start:
+                    keep &= np.triu(np.ones(keep.shape, dtype=bool), k=1)
+                for i, j in zip(*np.nonzero(keep)):
+                    edges.append((start + int(i), col_start + int(j), float(tile[i, j])))
+
+        if threshold is None:
+            if path is not None:
+                matrix.flush()
+            return matrix
+        edges.sort()
+        return [(beings[i].name, beings[j].name, compat) for i, j, compat in edges]
+
     def form_field(self, being_names, threshold=0.3):
         """
         Attempt to form a resonance field between multiple beings.
@@ -600,13 +1715,15 @@ class CongoNetwork:
                 name: {
                     "frequency": dim.base_frequency,
                     "population": dim.population,
-                    "messages": len(dim.message_log),
+                    "messages": dim.message_log.total,
+                    "retained": len(dim.message_log),
                 }
                 for name, dim in self.dimensions.items()
             },
             "total_beings": len(self.beings),
             "active_fields": len([f for f in self.fields if f.active]),
-            "total_messages": len(self.message_log),
+            "total_messages": self.message_log.total,
+            "retained_messages": len(self.message_log),
             "motto": "Distance is an illusion. Resonance is the only address.",
         }
 
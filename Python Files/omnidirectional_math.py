@@ -46,7 +46,26 @@ The 12 Fundamental Operators:
 ---
 """
 
+import argparse
+import asyncio
+import bisect
+import csv
+import json
+import hashlib
+import heapq
+import math
+import mmap
+import operator
+import os
+import struct
+import sys
+import threading
+import time
+import weakref
+from array import array
+from collections import Counter, OrderedDict
 from dataclasses import dataclass, field
+from functools import lru_cache, partial
 from typing import List, Optional
 
 
@@ -71,6 +90,13 @@ OPERATORS = {
 
 FLOW = '⟿'
 
+# Compact integer codes for each operator, used by the binary formats
+OPCODES = {name: code for code, name in enumerate(OPERATORS.values())}
+
+# Version of the operator semantics. Bump it whenever an operator's effect
+# changes: persisted RouteCache files built by another version are discarded.
+ENGINE_VERSION = "1.0"
+
 INVERSES = {
     'ascend': ('⊖', 'descend'),
     'descend': ('⊕', 'ascend'),
@@ -87,6 +113,112 @@ INVERSES = {
 }
 
 
+# =============================================================================
+#                          EXACT ANGLE ARITHMETIC
+# =============================================================================
+
+# Angles are accumulated as integer micro-degrees, never as raw floats.
+# A million ⟲[0.1] steps land exactly where they should, and two positions
+# that are the same point compare equal. The public API still speaks degrees.
+ANGLE_UNITS = 1_000_000
+FULL_TURN = 360 * ANGLE_UNITS
+
+
+def _angle_units(degrees):
+    """Convert degrees to exact integer angle units (micro-degrees)."""
+    return round(degrees * ANGLE_UNITS)
+
+
+def _units_angle(units):
+    """Convert integer angle units to canonical degrees in [0, 360)."""
+    return (units % FULL_TURN) / ANGLE_UNITS
+
+
+# =============================================================================
+#                             REALM REGISTRY
+# =============================================================================
+
+class RealmRegistry:
+    """
+    Maps realm names to small integer IDs, assigned in first-seen order.
+
+    The module-wide REALMS registry backs Position and
+    TransformationSequence: they keep realms as IDs internally, so
+    snapshots compare and hash integers, while the public API still takes
+    and returns names. REALMS holds at most REALM_LIMIT names; once it is
+    full, further realms are kept as plain strings instead of growing it.
+
+    A structure that stores many realms as arrays of integers (such as
+    JourneyTable) owns a registry of its own, so its codes live and die
+    with it. IDs only mean something within their registry: anything
+    persisted or sent elsewhere uses names. Registering is thread-safe.
+    """
+
+    def __init__(self, names=(), limit=None):
+        self.limit = limit
+        self._ids = {}
+        self._names = []
+        self._lock = threading.Lock()
+        for name in names:
+            self.id(name)
+
+    def intern(self, name):
+        """The ID for `name`, registering it if there is room; a string name that does not fit is returned as is."""
+        realm_id = self._ids.get(name)
+        if realm_id is None:
+            with self._lock:
+                realm_id = self._ids.get(name)
+                if realm_id is None:
+                    if self.limit is not None and len(self._names) >= self.limit:
+                        if isinstance(name, str):
+                            return name
+                        raise ValueError(f"Realm registry is full ({self.limit} realms).")
+                    realm_id = len(self._names)
+                    self._names.append(name)
+                    self._ids[name] = realm_id
+        return realm_id
+
+    def id(self, name):
+        """The ID for `name`, registering it on first use."""
+        realm_id = self.intern(name)
+        if realm_id is name:
+            raise ValueError(f"Realm registry is full ({self.limit} realms).")
+        return realm_id
+
+    def get(self, name, default=None):
+        """The ID for `name` without registering it."""
+        return self._ids.get(name, default)
+
+    def name(self, realm_id):
+        """The name registered under `realm_id`."""
+        return self._names[realm_id]
+
+    def names(self):
+        """Every registered name, in ID order."""
+        return list(self._names)
+
+    def __contains__(self, name):
+        return name in self._ids
+
+    def __len__(self):
+        return len(self._names)
+
+    def __repr__(self):
+        return f"RealmRegistry(realms={len(self._names)})"
+
+
+# Realms seen by positions and sequences; bounded, so that streams of
+# unique realm names cannot grow it without limit
+REALM_LIMIT = 65536
+REALMS = RealmRegistry(["Origin", "Void"], limit=REALM_LIMIT)
+_VOID = REALMS.id("Void")
+
+
+def _realm_name(code):
+    """The realm name for a REALMS ID, or a name that did not fit."""
+    return REALMS._names[code] if code.__class__ is int else code
+
+
 # =============================================================================
 #                              POSITION
 # =============================================================================
@@ -100,7 +232,7 @@ class Position:
     a transformation sequence. It tracks:
     - realm: the named location (e.g., "Earth", "Celestial_Realm")
     - dimension: the dimensional level (integer)
-    - angle: rotational position in degrees (0-360)
+    - angle: rotational position in degrees (0-360), on an exact micro-degree grid
     - polarity: directional orientation (+1 or -1)
     - wave_state: "expanded" or "collapsed"
     - crossings: how many boundaries have been crossed
@@ -118,17 +250,40 @@ class Position:
 
     def copy(self):
         """Return an independent copy of this position."""
-        return Position(
-            realm=self.realm,
-            dimension=self.dimension,
-            angle=self.angle,
-            polarity=self.polarity,
-            wave_state=self.wave_state,
-            crossings=self.crossings,
-            intersections=list(self.intersections),
-            mode=self.mode,
+        p = object.__new__(Position)
+        p.__dict__.update(self.__dict__)
+        p.intersections = list(self.intersections)
+        return p
+
+    def fields(self):
+        """Return the field values as a tuple, in declaration order."""
+        return (
+            self.realm, self.dimension, self.angle, self.polarity,
+            self.wave_state, self.crossings, list(self.intersections), self.mode,
         )
 
+    def state_key(self):
+        """A hashable snapshot of every field, for caches and deduplication."""
+        return (
+            self._realm, self.dimension, self.angle, self.polarity, self.wave_state,
+            self.crossings, tuple(tuple(sorted(i.items())) for i in self.intersections),
+            self.mode,
+        )
+
+    @property
+    def angle_units(self):
+        """The exact angle as integer micro-degrees in [0, FULL_TURN)."""
+        return _angle_units(self.angle) % FULL_TURN
+
+    @property
+    def realm_id(self):
+        """The realm's ID in REALMS, or None for a realm that did not fit."""
+        return self._realm if self._realm.__class__ is int else None
+
+    def __reduce__(self):
+        # Realm IDs are process-local, so pickles carry the name
+        return (Position, self.fields())
+
     def __repr__(self):
         pol = '+' if self.polarity > 0 else '-'
         return (
@@ -138,6 +293,15 @@ class Position:
         )
 
 
+# The realm is stored as a REALMS ID. The property is attached after
+# @dataclass so the field keeps its "Origin" default in __init__.
+Position.realm = property(
+    lambda self: _realm_name(self._realm),
+    lambda self, name: setattr(self, "_realm", REALMS.intern(name)),
+    doc="The realm's name.",
+)
+
+
 # =============================================================================
 #                              OPERATION
 # =============================================================================
@@ -170,11 +334,11 @@ class Operation:
 
         elif self.name == 'rotate_cw':
             deg = self.parameter if self.parameter is not None else 90.0
-            p.angle = (p.angle + deg) % 360
+            p.angle = _units_angle(p.angle_units + _angle_units(deg))
 
         elif self.name == 'rotate_ccw':
             deg = self.parameter if self.parameter is not None else 90.0
-            p.angle = (p.angle - deg) % 360
+            p.angle = _units_angle(p.angle_units - _angle_units(deg))
 
         elif self.name == 'polarity':
             p.polarity *= -1
@@ -207,7 +371,7 @@ class Operation:
             p.wave_state = "expanded"
             p.polarity = 1
             p.crossings += 1
-            p.realm = "Void"
+            p._realm = _VOID
 
         return p
 
@@ -218,10 +382,7 @@ class Operation:
 
     def notation(self):
         """Return the symbolic notation string for this operation."""
-        if self.parameter is not None:
-            p = int(self.parameter) if self.parameter == int(self.parameter) else self.parameter
-            return f"{self.symbol}[{p}]"
-        return self.symbol
+        return _notation_fragment(self.symbol, self.parameter)
 
     def __repr__(self):
         if self.parameter is not None:
@@ -229,6 +390,160 @@ class Operation:
         return f"Op({self.symbol})"
 
 
+# =============================================================================
+#                              REPETITION
+# =============================================================================
+
+@dataclass
+class Repetition:
+    """
+    A group of operations travelled `count` times: (⊕[1]⟲[90])^1000
+
+    The group is kept as one compact node -- the 2000 operations above are
+    never materialized. Execution walks the group lazily, and complexity,
+    dimension_delta and compile() work on the group as a whole. Groups
+    can nest.
+    """
+    operations: list
+    count: int = 1
+
+    name = 'repeat'
+
+    def inverse(self):
+        """The group travelled backwards, the same number of times."""
+        return Repetition(
+            operations=[op.inverse() for op in reversed(self.operations)],
+            count=self.count,
+        )
+
+    def notation(self):
+        """Return the symbolic notation string for this group."""
+        inner = "".join(op.notation() for op in self.operations)
+        return f"({inner})^{self.count}"
+
+    def compile(self):
+        """Summarize the whole group as a CompiledSequence."""
+        return _compile_operations(self.operations).power(self.count)
+
+    def expand(self):
+        """Return the fully expanded list of Operations."""
+        return list(_iter_operations([self]))
+
+    def __repr__(self):
+        return f"Rep({self.operations})^{self.count}"
+
+
+def _iter_operations(operations):
+    """Yield the Operations of a list, walking any Repetition lazily."""
+    for op in operations:
+        if isinstance(op, Repetition):
+            for _ in range(op.count):
+                yield from _iter_operations(op.operations)
+        else:
+            yield op
+
+
+def _is_recursive(operations):
+    """Whether an ∞ marker appears anywhere, including inside groups."""
+    return any(
+        _is_recursive(op.operations) if isinstance(op, Repetition) else op.name == 'infinite'
+        for op in operations
+    )
+
+
+def _complexity(operations):
+    """Count transformative operations without expanding groups."""
+    total = 0
+    for op in operations:
+        if isinstance(op, Repetition):
+            total += op.count * _complexity(op.operations)
+        elif op.name not in ('infinite', 'parallel', 'orthogonal'):
+            total += 1
+    return total
+
+
+def _dimension_summary(operations):
+    """
+    Return (reset, delta) without expanding groups: whether a ∅ occurs,
+    and the dimensional change since the last one (or since the start).
+    """
+    reset, delta = False, 0
+    for op in operations:
+        if isinstance(op, Repetition):
+            if not op.count:
+                continue
+            inner_reset, inner_delta = _dimension_summary(op.operations)
+            if inner_reset:
+                reset, delta = True, inner_delta
+            else:
+                delta += inner_delta * op.count
+        elif op.name == 'ascend':
+            delta += int(op.parameter or 1)
+        elif op.name == 'descend':
+            delta -= int(op.parameter or 1)
+        elif op.name == 'void':
+            reset, delta = True, 0  # Void resets to dimension 0
+    return reset, delta
+
+
+# Rendered fragments are cached per distinct (operator, parameter), so
+# rendering a long journey costs one dictionary lookup per operation.
+# typed=True keeps 90 and 90.0 apart -- they render differently.
+
+@lru_cache(maxsize=4096, typed=True)
+def _notation_fragment(symbol, parameter):
+    """Render one operation's notation, e.g. ⊕[3]."""
+    if parameter is not None:
+        p = int(parameter) if parameter == int(parameter) else parameter
+        return f"{symbol}[{p}]"
+    return symbol
+
+
+@lru_cache(maxsize=4096, typed=True)
+def _describe_fragment(name, parameter):
+    """Render one operation's describe() line, with its leading separator."""
+    if name == 'ascend':
+        n = int(parameter or 1)
+        line = f"Ascend {n} dimension{'s' if n != 1 else ''}"
+    elif name == 'descend':
+        n = int(parameter or 1)
+        line = f"Descend {n} dimension{'s' if n != 1 else ''}"
+    elif name == 'rotate_cw':
+        deg = parameter if parameter is not None else 90.0
+        line = f"Rotate {deg} clockwise"
+    elif name == 'rotate_ccw':
+        deg = parameter if parameter is not None else 90.0
+        line = f"Rotate {deg} counterclockwise"
+    elif name == 'polarity':
+        line = "Reverse polarity"
+    elif name == 'wave':
+        line = "Wave function transform"
+    elif name == 'intersection':
+        line = "Mark intersection point"
+    elif name == 'parallel':
+        line = "Enter parallel mode"
+    elif name == 'orthogonal':
+        line = "Enter orthogonal mode"
+    elif name == 'boundary':
+        line = "Cross boundary"
+    elif name == 'infinite':
+        line = "Infinite recursion"
+    elif name == 'void':
+        line = "Traverse the void"
+    else:
+        return ""
+    return " ->\n" + line
+
+
+def _describe_operation(op):
+    """Render an Operation's or a Repetition's describe() line."""
+    if not isinstance(op, Repetition):
+        return _describe_fragment(op.name, op.parameter)
+    inner = [_describe_operation(o)[len(" ->\n"):] for o in op.operations]
+    times = "time" if op.count == 1 else "times"
+    return f" ->\nRepeat {op.count} {times} [{', '.join(line for line in inner if line)}]"
+
+
 # =============================================================================
 #                              STEP
 # =============================================================================
@@ -270,29 +585,82 @@ class TransformationSequence:
         self.origin = origin
         self.operations = list(operations)
         self.destination = destination
-        self.recursive = any(op.name == 'infinite' for op in self.operations)
+        self.recursive = _is_recursive(self.operations)
+
+    @property
+    def destination(self):
+        """The realm of arrival, or None."""
+        return None if self._destination is None else _realm_name(self._destination)
+
+    @destination.setter
+    def destination(self, name):
+        self._destination = None if name is None else REALMS.intern(name)
+
+    def __reduce__(self):
+        # Realm IDs are process-local, so pickles carry the names
+        return (TransformationSequence, (self.origin, self.operations, self.destination))
 
-    def execute(self):
+    def execute(self, trail=None):
         """
         Execute the full transformation sequence.
 
         Returns (final_position, trail) where trail is a list of Steps
-        recording every transformation along the journey.
+        recording every transformation along the journey. Pass `trail` to
+        record into any other container with append() instead, such as a
+        disk-backed ColumnarTrail.
+        """
+        if trail is None:
+            trail = []
+        current = self.origin
+        for step in self.iter_steps():
+            trail.append(step)
+            current = step.after
+        current = current.copy()
+
+        if self.destination:
+            current._realm = self._destination
+
+        return current, trail
+
+    def iter_steps(self):
+        """
+        Yield each Step of the journey as it is computed.
+
+        The destination realm is not applied here -- it is the arrival,
+        not a step.
         """
-        trail = []
         current = self.origin.copy()
 
-        for op in self.operations:
+        for op in _iter_operations(self.operations):
             if op.name == 'infinite':
                 continue
             before = current.copy()
             current = op.apply(current)
-            trail.append(Step(operation=op, before=before, after=current.copy()))
+            yield Step(operation=op, before=before, after=current.copy())
 
-        if self.destination:
-            current.realm = self.destination
+    async def aiter_steps(self, yield_every=1000):
+        """
+        Asynchronously yield each Step, handing control back to the event
+        loop every `yield_every` steps so one long journey cannot starve
+        other tasks.
+        """
+        if yield_every < 1:
+            raise ValueError("yield_every must be at least 1.")
+        for i, step in enumerate(self.iter_steps(), 1):
+            yield step
+            if i % yield_every == 0:
+                await asyncio.sleep(0)
+
+    async def aexecute(self, executor=None):
+        """
+        Run execute() in an executor and await its (final_position, trail).
 
-        return current, trail
+        `executor` is any concurrent.futures executor; None uses the event
+        loop's default thread pool. A ProcessPoolExecutor sidesteps the GIL
+        for very long journeys.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, self.execute)
 
     def reverse(self):
         """
@@ -308,6 +676,24 @@ class TransformationSequence:
             destination=dest_name,
         )
 
+    def optimize(self):
+        """
+        Return an equivalent, shorter sequence.
+
+        Between barriers (⊠ snapshots the state, ∅ resets it, ∞ marks
+        recursion) every operator touches its own field, so the stretch
+        folds to at most one ascend/descend, one rotation, one ⇄, one ∿
+        and one mode setter, plus its boundary crossings. Operations that
+        a following ∅ would erase are dropped. The final position is
+        unchanged for well-formed positions (wave_state "expanded" or
+        "collapsed", angles on the micro-degree grid).
+        """
+        return TransformationSequence(
+            origin=self.origin,
+            operations=_optimize_operations(self.operations),
+            destination=self.destination,
+        )
+
     def describe(self):
         """
         Produce a human-readable description of this journey.
@@ -321,73 +707,90 @@ class TransformationSequence:
             Wave function transform ->
             Arrive at Celestial_Realm
         """
-        lines = []
+        return "".join(self.describe_iter())
+
+    def describe_iter(self):
+        """
+        Yield the description of describe() in chunks, without building the
+        whole string: "".join(seq.describe_iter()) == seq.describe().
+
+        Stream a huge journey straight to a file with:
+            report.writelines(seq.describe_iter())
+        """
         origin = self.origin.realm if isinstance(self.origin, Position) else str(self.origin)
-        lines.append(f"From {origin}")
+        yield f"From {origin}"
 
         for op in self.operations:
-            if op.name == 'ascend':
-                n = int(op.parameter or 1)
-                lines.append(f"Ascend {n} dimension{'s' if n != 1 else ''}")
-            elif op.name == 'descend':
-                n = int(op.parameter or 1)
-                lines.append(f"Descend {n} dimension{'s' if n != 1 else ''}")
-            elif op.name == 'rotate_cw':
-                deg = op.parameter if op.parameter is not None else 90.0
-                lines.append(f"Rotate {deg} clockwise")
-            elif op.name == 'rotate_ccw':
-                deg = op.parameter if op.parameter is not None else 90.0
-                lines.append(f"Rotate {deg} counterclockwise")
-            elif op.name == 'polarity':
-                lines.append("Reverse polarity")
-            elif op.name == 'wave':
-                lines.append("Wave function transform")
-            elif op.name == 'intersection':
-                lines.append("Mark intersection point")
-            elif op.name == 'parallel':
-                lines.append("Enter parallel mode")
-            elif op.name == 'orthogonal':
-                lines.append("Enter orthogonal mode")
-            elif op.name == 'boundary':
-                lines.append("Cross boundary")
-            elif op.name == 'infinite':
-                lines.append("Infinite recursion")
-            elif op.name == 'void':
-                lines.append("Traverse the void")
+            fragment = _describe_operation(op)
+            if fragment:
+                yield fragment
 
         if self.destination:
-            lines.append(f"Arrive at {self.destination}")
-
-        return " ->\n".join(lines)
+            yield f" ->\nArrive at {self.destination}"
 
     def notation(self):
         """Return the full symbolic notation string."""
-        ops_str = "".join(op.notation() for op in self.operations)
+        return "".join(self.notation_iter())
+
+    def notation_iter(self):
+        """
+        Yield the notation of notation() in chunks, without building the
+        whole string: "".join(seq.notation_iter()) == seq.notation().
+        """
         origin = self.origin.realm if isinstance(self.origin, Position) else str(self.origin)
+        yield f"{origin} {FLOW} "
+        for op in self.operations:
+            yield op.notation()
         if self.destination:
-            return f"{origin} {FLOW} {ops_str} {FLOW} {self.destination}"
-        return f"{origin} {FLOW} {ops_str}"
+            yield f" {FLOW} {self.destination}"
 
     @property
     def complexity(self):
         """Number of transformative operations (excluding markers and mode setters)."""
-        return sum(
-            1 for op in self.operations
-            if op.name not in ('infinite', 'parallel', 'orthogonal')
-        )
+        return _complexity(self.operations)
 
     @property
     def dimension_delta(self):
         """Net dimensional change across the entire sequence."""
-        delta = 0
-        for op in self.operations:
-            if op.name == 'ascend':
-                delta += int(op.parameter or 1)
-            elif op.name == 'descend':
-                delta -= int(op.parameter or 1)
-            elif op.name == 'void':
-                delta = 0  # Void resets to dimension 0
-        return delta
+        return _dimension_summary(self.operations)[1]
+
+    def compile(self):
+        """
+        Summarize the whole sequence as a single CompiledSequence.
+
+        Raises ValueError if the sequence marks intersections: each ⊠
+        records the state at that moment, which no summary can capture.
+        """
+        return _compile_operations(self.operations).arriving_at(self.destination)
+
+    def power(self, n):
+        """
+        The effect of travelling this route n times in a row, computed by
+        repeated squaring in O(log n). Apply it with .apply(position):
+
+            seq.power(10**9).apply(seq.origin)
+        """
+        return self.compile().power(n)
+
+    def to_function(self):
+        """
+        Compile this sequence into a specialized straight-line Python function.
+
+        The function takes the origin's fields in Position order and returns
+        the final fields in the same order, so that
+        Position(*seq.to_function()(*origin.fields())) equals the final
+        position from execute(). Runs of operations are folded into constants
+        at compile time: there is no dispatch and no Position is created.
+        Compiled functions are cached by notation.
+        """
+        key = self.notation()
+        fn = _ROUTE_FUNCTIONS.get(key)
+        if fn is None:
+            fn = _compile_route(self.operations, self.destination, key)
+            if len(_ROUTE_FUNCTIONS) >= ROUTE_CACHE_SIZE:
+                del _ROUTE_FUNCTIONS[next(iter(_ROUTE_FUNCTIONS))]
+            _ROUTE_FUNCTIONS[key] = fn
+        return fn
 
     def __repr__(self):
         return f"Sequence({self.notation()})"
@@ -431,10 +834,28 @@ def parse(notation_string):
     )
 
 
+# Groups are walked recursively everywhere (parsing, expansion, summaries),
+# so nesting is capped well inside Python's recursion limit.
+MAX_GROUP_DEPTH = 100
+
+
 def _tokenize(ops_string):
-    """Tokenize an operations string into a list of Operations."""
+    """
+    Tokenize an operations string into a list of Operations.
+
+    Parenthesized groups with an optional repeat count, such as
+    (⊕[1]⟲[90])^1000, become compact Repetition nodes; groups can nest
+    up to MAX_GROUP_DEPTH deep.
+    """
+    operations, _ = _tokenize_group(ops_string, 0, opened_at=None)
+    return operations
+
+
+def _tokenize_group(ops_string, i, opened_at, depth=0):
+    """Tokenize from position i up to the ')' closing a group opened at `opened_at`."""
+    if depth > MAX_GROUP_DEPTH:
+        raise ValueError(f"Groups nested too deeply at position {opened_at} (limit {MAX_GROUP_DEPTH})")
     operations = []
-    i = 0
 
     while i < len(ops_string):
         char = ops_string[i]
@@ -452,13 +873,43 @@ def _tokenize(ops_string):
                     raise ValueError(f"Unclosed bracket in notation at position {i}")
                 param_str = ops_string[i + 1:end].replace('°', '').strip()
                 parameter = float(param_str)
+                if not math.isfinite(parameter * ANGLE_UNITS):
+                    raise ValueError(f"Parameter '{param_str}' at position {i} is not a finite number in range")
                 i = end + 1
 
             operations.append(Operation(symbol=char, name=name, parameter=parameter))
+        elif char == '(':
+            group, i = _tokenize_group(ops_string, i + 1, opened_at=i, depth=depth + 1)
+            count, i = _repeat_count(ops_string, i)
+            operations.append(Repetition(operations=group, count=count))
+        elif char == ')':
+            if opened_at is None:
+                raise ValueError(f"Unmatched ')' in notation at position {i}")
+            return operations, i + 1
         else:
             i += 1  # Skip whitespace and unknown characters
 
-    return operations
+    if opened_at is not None:
+        raise ValueError(f"Unclosed group in notation at position {opened_at}")
+    return operations, i
+
+
+def _repeat_count(ops_string, i):
+    """Read an optional ^N after a group, returning (count, next position)."""
+    j = i
+    while j < len(ops_string) and ops_string[j] == ' ':
+        j += 1
+    if j >= len(ops_string) or ops_string[j] != '^':
+        return 1, i
+    j += 1
+    while j < len(ops_string) and ops_string[j] == ' ':
+        j += 1
+    start = j
+    while j < len(ops_string) and ops_string[j].isdigit():
+        j += 1
+    if start == j:
+        raise ValueError(f"Expected a repeat count after '^' at position {start}")
+    return int(ops_string[start:j]), j
 
 
 # =============================================================================
@@ -487,11 +938,2086 @@ def compose(*sequences):
     )
 
 
+def _optimize_operations(operations):
+    """The body of TransformationSequence.optimize(), applied inside groups too."""
+    optimized = []
+    run = []
+    for op in operations:
+        if isinstance(op, Repetition):
+            optimized.extend(_fold_run(run))
+            run = []
+            inner = _optimize_operations(op.operations)
+            if inner:
+                optimized.append(Repetition(operations=inner, count=op.count))
+        elif op.name in ('intersection', 'void', 'infinite'):
+            if op.name == 'void':
+                run = [o for o in run if o.name in ('boundary', 'parallel', 'orthogonal')]
+            optimized.extend(_fold_run(run))
+            run = []
+            if op.name == 'infinite' and optimized and optimized[-1].name == 'infinite':
+                continue
+            optimized.append(op)
+        else:
+            run.append(op)
+    optimized.extend(_fold_run(run))
+    return optimized
+
+
+def _fold_run(run):
+    """Fold a stretch of commuting operations into its shortest equivalent."""
+    dimension = 0
+    units = 0
+    flips = 0
+    toggles = 0
+    boundaries = []
+    mode = None
+
+    for op in run:
+        if op.name == 'ascend':
+            dimension += int(op.parameter or 1)
+        elif op.name == 'descend':
+            dimension -= int(op.parameter or 1)
+        elif op.name == 'rotate_cw':
+            units += _angle_units(op.parameter if op.parameter is not None else 90.0)
+        elif op.name == 'rotate_ccw':
+            units -= _angle_units(op.parameter if op.parameter is not None else 90.0)
+        elif op.name == 'polarity':
+            flips += 1
+        elif op.name == 'wave':
+            toggles += 1
+        elif op.name == 'boundary':
+            boundaries.append(op)
+        elif op.name in ('parallel', 'orthogonal'):
+            mode = op
+
+    folded = []
+    if dimension > 0:
+        folded.append(Operation(symbol='⊕', name='ascend', parameter=float(dimension)))
+    elif dimension < 0:
+        folded.append(Operation(symbol='⊖', name='descend', parameter=float(-dimension)))
+    units %= FULL_TURN
+    if units and units <= FULL_TURN // 2:
+        folded.append(Operation(symbol='⟲', name='rotate_cw', parameter=_units_angle(units)))
+    elif units:
+        folded.append(Operation(symbol='⟳', name='rotate_ccw', parameter=_units_angle(FULL_TURN - units)))
+    if flips % 2:
+        folded.append(Operation(symbol='⇄', name='polarity'))
+    if toggles % 2:
+        folded.append(Operation(symbol='∿', name='wave'))
+    folded.extend(boundaries)
+    if mode is not None:
+        folded.append(mode)
+    return folded
+
+
+# =============================================================================
+#                          COMPILED SEQUENCES
+# =============================================================================
+
+@dataclass(frozen=True)
+class CompiledSequence:
+    """
+    The net effect of a sequence, independent of its length.
+
+    Without ∅, the operators act on independent fields as a simple group:
+    dimension and crossings add, angle adds modulo a full turn, polarity
+    multiplies, the wave toggles, and the last mode setter wins. ∅ resets
+    dimension, angle, polarity, wave and realm, so a summary either keeps
+    the traveller's own values (voided=False) or starts from the void
+    ground state (voided=True). Summaries compose with then(), which is
+    associative -- the basis for power() by repeated squaring.
+
+    Fields:
+    - voided: whether a ∅ occurs (fields are then absolute, not relative)
+    - dimension: dimensional change (or level, if voided)
+    - angle: rotation in exact angle units (or absolute angle, if voided)
+    - rotated: whether any rotation occurs (rotation snaps the angle to the grid)
+    - polarity: +1 or -1 multiplier
+    - wave: 0 untouched, 1 toggled an odd number of times, 2 an even number
+    - crossings: boundary crossings added
+    - mode: the last mode set, or None
+    - destination: realm of arrival, or None
+    """
+    voided: bool = False
+    dimension: int = 0
+    angle: int = 0
+    rotated: bool = False
+    polarity: int = 1
+    wave: int = 0
+    crossings: int = 0
+    mode: Optional[str] = None
+    destination: Optional[str] = None
+
+    @classmethod
+    def from_operation(cls, op):
+        """Summarize a single Operation or Repetition."""
+        if isinstance(op, Repetition):
+            return op.compile()
+        if op.name == 'ascend':
+            return cls(dimension=int(op.parameter or 1))
+        if op.name == 'descend':
+            return cls(dimension=-int(op.parameter or 1))
+        if op.name in ('rotate_cw', 'rotate_ccw'):
+            units = _angle_units(op.parameter if op.parameter is not None else 90.0)
+            if op.name == 'rotate_ccw':
+                units = -units
+            return cls(angle=units % FULL_TURN, rotated=True)
+        if op.name == 'polarity':
+            return cls(polarity=-1)
+        if op.name == 'wave':
+            return cls(wave=1)
+        if op.name == 'intersection':
+            raise ValueError("Intersections record the state mid-journey and cannot be compiled.")
+        if op.name in ('parallel', 'orthogonal'):
+            return cls(mode=op.name)
+        if op.name == 'boundary':
+            return cls(crossings=1)
+        if op.name == 'void':
+            return cls(voided=True, rotated=True, crossings=1)
+        return cls()
+
+    def then(self, other):
+        """The summary of travelling self, then other."""
+        if other.voided:
+            return CompiledSequence(
+                voided=True,
+                dimension=other.dimension,
+                angle=other.angle,
+                rotated=True,
+                polarity=other.polarity,
+                wave=other.wave,
+                crossings=self.crossings + other.crossings,
+                mode=other.mode or self.mode,
+                destination=other.destination,
+            )
+        if not self.wave or not other.wave:
+            wave = self.wave or other.wave
+        else:
+            wave = 1 if (self.wave + other.wave) % 2 else 2
+        return CompiledSequence(
+            voided=self.voided,
+            dimension=self.dimension + other.dimension,
+            angle=(self.angle + other.angle) % FULL_TURN,
+            rotated=self.rotated or other.rotated,
+            polarity=self.polarity * other.polarity,
+            wave=wave,
+            crossings=self.crossings + other.crossings,
+            mode=other.mode or self.mode,
+            destination=other.destination,
+        )
+
+    def arriving_at(self, destination):
+        """The same summary with a different destination."""
+        return CompiledSequence(
+            self.voided, self.dimension, self.angle, self.rotated, self.polarity,
+            self.wave, self.crossings, self.mode, destination,
+        )
+
+    def power(self, n):
+        """Travel this summary n times in a row, in O(log n) compositions."""
+        if n < 0:
+            raise ValueError("A route can only be repeated a non-negative number of times.")
+        result = CompiledSequence()
+        base = self
+        while n:
+            if n & 1:
+                result = result.then(base)
+            base = base.then(base)
+            n >>= 1
+        return result
+
+    def apply(self, position):
+        """Return the Position reached by travelling this summary from `position`."""
+        p = position.copy()
+        if self.voided:
+            p._realm = _VOID
+            p.dimension = self.dimension
+            p.angle = _units_angle(self.angle)
+            p.polarity = self.polarity
+            p.wave_state = "expanded"
+        else:
+            p.dimension += self.dimension
+            if self.rotated:
+                p.angle = _units_angle(p.angle_units + self.angle)
+            p.polarity *= self.polarity
+        if self.wave == 1:
+            p.wave_state = "collapsed" if p.wave_state == "expanded" else "expanded"
+        elif self.wave == 2:
+            p.wave_state = "expanded" if p.wave_state == "expanded" else "collapsed"
+        p.crossings += self.crossings
+        if self.mode:
+            p.mode = self.mode
+        if self.destination:
+            p.realm = self.destination
+        return p
+
+
+def _compile_operations(operations):
+    """Fold a list of operations into one CompiledSequence."""
+    compiled = CompiledSequence()
+    for op in operations:
+        compiled = compiled.then(CompiledSequence.from_operation(op))
+    return compiled
+
+
+# =============================================================================
+#                            ROUTE COMPILER
+# =============================================================================
+
+ROUTE_CACHE_SIZE = 1024
+_ROUTE_FUNCTIONS = {}
+
+
+def _route_items(operations):
+    """
+    Yield Operations, replacing each group that needs no intersection
+    snapshots with its CompiledSequence so it folds in one step.
+    """
+    for op in operations:
+        if isinstance(op, Repetition):
+            try:
+                yield op.compile()
+            except ValueError:
+                for _ in range(op.count):
+                    yield from _route_items(op.operations)
+        else:
+            yield op
+
+
+def _compile_route(operations, destination, notation=""):
+    """
+    Generate the straight-line function behind TransformationSequence.to_function().
+
+    Each field is tracked symbolically as "origin value plus a folded
+    constant" (or a pure constant once ∅ has reset it), so only
+    intersections, which must snapshot the state mid-journey, emit code.
+    """
+    dim_base, dim_off = "dimension", 0
+    rotated, angle_from_origin, angle_off = False, True, 0
+    pol_base, pol_sign = "polarity", 1
+    wave_base, wave_toggles = "wave_state", 0
+    cross_off = 0
+    mode = "mode"
+    realm = "realm"
+    body = []
+    uses_origin_angle = []
+
+    def dim_expr():
+        if dim_base is None:
+            return repr(dim_off)
+        return f"{dim_base} + {dim_off}" if dim_off else dim_base
+
+    def angle_expr():
+        if not rotated:
+            return "angle"
+        if not angle_from_origin:
+            return repr(_units_angle(angle_off))
+        uses_origin_angle.append(True)
+        if angle_off:
+            return f"(a + {angle_off}) % {FULL_TURN} / {ANGLE_UNITS}"
+        return f"a / {ANGLE_UNITS}"
+
+    def cross_expr():
+        return f"crossings + {cross_off}" if cross_off else "crossings"
+
+    for op in _route_items(operations):
+        if isinstance(op, CompiledSequence):
+            if op.voided:
+                dim_base, dim_off = None, op.dimension
+                rotated, angle_from_origin, angle_off = True, False, op.angle
+                pol_base, pol_sign = None, op.polarity
+                wave_base, wave_toggles = None, 0
+                realm = repr("Void")
+            else:
+                dim_off += op.dimension
+                if op.rotated:
+                    rotated = True
+                    angle_off = (angle_off + op.angle) % FULL_TURN
+                pol_sign *= op.polarity
+            wave_toggles += op.wave
+            cross_off += op.crossings
+            if op.mode:
+                mode = repr(op.mode)
+            continue
+
+        kind = op.name
+        if kind == 'ascend':
+            dim_off += int(op.parameter or 1)
+        elif kind == 'descend':
+            dim_off -= int(op.parameter or 1)
+        elif kind in ('rotate_cw', 'rotate_ccw'):
+            deg = op.parameter if op.parameter is not None else 90.0
+            units = _angle_units(deg)
+            angle_off = (angle_off + (units if kind == 'rotate_cw' else -units)) % FULL_TURN
+            rotated = True
+        elif kind == 'polarity':
+            pol_sign = -pol_sign
+        elif kind == 'wave':
+            wave_toggles += 1
+        elif kind == 'intersection':
+            body.append(
+                f"    append({{'dimension': {dim_expr()}, 'angle': {angle_expr()}, "
+                f"'crossings': {cross_expr()}}})"
+            )
+        elif kind == 'parallel':
+            mode = repr("parallel")
+        elif kind == 'orthogonal':
+            mode = repr("orthogonal")
+        elif kind == 'boundary':
+            cross_off += 1
+        elif kind == 'void':
+            dim_base, dim_off = None, 0
+            rotated, angle_from_origin, angle_off = True, False, 0
+            pol_base, pol_sign = None, 1
+            wave_base, wave_toggles = None, 0
+            cross_off += 1
+            realm = repr("Void")
+
+    if pol_base is None:
+        pol = repr(pol_sign)
+    else:
+        pol = "polarity" if pol_sign > 0 else "-polarity"
+
+    if wave_base is None:
+        wave = repr("expanded" if wave_toggles % 2 == 0 else "collapsed")
+    elif wave_toggles == 0:
+        wave = "wave_state"
+    elif wave_toggles % 2:
+        wave = "('collapsed' if wave_state == 'expanded' else 'expanded')"
+    else:
+        wave = "('expanded' if wave_state == 'expanded' else 'collapsed')"
+
+    if destination:
+        realm = repr(destination)
+
+    result = (
+        f"    return ({realm}, {dim_expr()}, {angle_expr()}, {pol}, {wave}, "
+        f"{cross_expr()}, intersections, {mode})"
+    )
+
+    lines = ["def route(realm, dimension, angle, polarity, wave_state, crossings, intersections, mode):"]
+    if uses_origin_angle:
+        lines.append(f"    a = round(angle * {ANGLE_UNITS}) % {FULL_TURN}")
+    lines.append("    intersections = list(intersections)")
+    if body:
+        lines.append("    append = intersections.append")
+        lines.extend(body)
+    lines.append(result)
+
+    namespace = {}
+    exec(compile("\n".join(lines), f"<route {notation}>", "exec"), namespace)
+    route = namespace["route"]
+    route.__doc__ = notation
+    return route
+
+
+# =============================================================================
+#                         COLUMNAR TRAIL STORAGE
+# =============================================================================
+
+@dataclass
+class TrailRecord:
+    """One row of a ColumnarTrail: the operation and the position it produced."""
+    operation: str
+    parameter: Optional[float]
+    dimension: int
+    angle: float
+    polarity: int
+    wave_state: str
+    crossings: int
+
+
+class ColumnarTrail:
+    """
+    A journey trail stored in a memory-mapped file, one fixed-width column
+    per field.
+
+    Pass one to execute(trail=...) and each Step is written straight to
+    disk instead of being kept in memory. Reopening the file later gives
+    random access to any row without reading the rest:
+
+        with ColumnarTrail.create("journey.trail") as trail:
+            seq.execute(trail=trail)
+        with ColumnarTrail.open("journey.trail") as trail:
+            trail[1_000_000].dimension
+
+    Angles are stored as exact micro-degree units, parameters as float64
+    (NaN meaning "no parameter"). The file is written in native byte order.
+
+    Views from column() share the mapping: the trail cannot grow past its
+    capacity while one is in use, and close() leaves the mapping to them.
+    """
+
+    MAGIC = b"OMTRAIL1"
+    HEADER = struct.Struct("<8sBQQ")
+    HEADER_SIZE = 64
+
+    # Eight-byte columns first so every column stays naturally aligned
+    COLUMNS = (
+        ("parameter", "d"),
+        ("dimension", "q"),
+        ("angle", "q"),
+        ("crossings", "q"),
+        ("operation", "B"),
+        ("polarity", "b"),
+        ("wave_state", "B"),
+    )
+
+    _OP_NAMES = list(OPERATORS.values())
+    _WAVES = ("expanded", "collapsed")
+
+    def __init__(self, path, writable, capacity=None):
+        self.path = path
+        self.writable = writable
+        self._exports = []  # weak references to the views column() handed out
+        self._file = open(path, "r+b" if writable else "rb")
+        if capacity is not None:
+            self._length = 0
+            self._resize(capacity)
+        else:
+            magic, byteorder, capacity, length = self.HEADER.unpack_from(
+                self._file.read(self.HEADER.size)
+            )
+            if magic != self.MAGIC:
+                self._file.close()
+                raise ValueError(f"'{path}' is not a columnar trail file.")
+            if byteorder != (sys.byteorder == "little"):
+                self._file.close()
+                raise ValueError(f"'{path}' was written with a different byte order.")
+            self._length = length
+            self._map(capacity)
+
+    @classmethod
+    def create(cls, path, capacity=1024):
+        """Create (or truncate) a trail file with room for `capacity` rows."""
+        with open(path, "wb"):
+            pass
+        return cls(path, writable=True, capacity=max(1, capacity))
+
+    @classmethod
+    def open(cls, path, writable=False):
+        """Reopen an existing trail file, read-only unless `writable`."""
+        return cls(path, writable=writable)
+
+    def _layout(self, capacity):
+        offsets = {}
+        offset = self.HEADER_SIZE
+        for name, fmt in self.COLUMNS:
+            offsets[name] = offset
+            offset += capacity * struct.calcsize(fmt)
+        return offsets, offset
+
+    def _map(self, capacity):
+        self.capacity = capacity
+        access = mmap.ACCESS_WRITE if self.writable else mmap.ACCESS_READ
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=access)
+        offsets, _ = self._layout(capacity)
+        view = memoryview(self._mmap)
+        self._columns = {
+            name: view[offsets[name]:offsets[name] + capacity * struct.calcsize(fmt)].cast(fmt)
+            for name, fmt in self.COLUMNS
+        }
+        view.release()
+
+    def _unmap(self):
+        for column in self._columns.values():
+            column.release()
+        self._columns = {}
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass  # a view derived from column() still uses it; unmapped once that is gone
+        self._mmap = None
+
+    def _exported(self):
+        """Whether a view from column() is still in use."""
+        live = []
+        for ref in self._exports:
+            view = ref()
+            if view is None:
+                continue
+            try:
+                view.nbytes
+            except ValueError:  # released
+                continue
+            live.append(ref)
+        self._exports = live
+        return bool(live)
+
+    def _resize(self, capacity):
+        """Grow the file to `capacity` rows, moving columns to their new offsets."""
+        if self._exported():
+            raise BufferError(
+                "Cannot grow the trail while views from column() are in use; release them first."
+            )
+        old_capacity = getattr(self, "capacity", 0)
+        old_offsets, _ = self._layout(old_capacity)
+        new_offsets, size = self._layout(capacity)
+        if old_capacity:
+            self._unmap()
+        self._file.truncate(size)
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_WRITE)
+        # Walk backwards: new offsets are never smaller, so nothing unread is overwritten
+        for name, fmt in reversed(self.COLUMNS):
+            nbytes = self._length * struct.calcsize(fmt)
+            if nbytes and old_offsets[name] != new_offsets[name]:
+                self._mmap.move(new_offsets[name], old_offsets[name], nbytes)
+        self._mmap.close()
+        self._map(capacity)
+        self._write_header()
+
+    def _write_header(self):
+        self.HEADER.pack_into(
+            self._mmap, 0, self.MAGIC, sys.byteorder == "little", self.capacity, self._length
+        )
+
+    def append(self, step):
+        """Record one Step as a new row."""
+        if not self.writable:
+            raise ValueError("Trail was opened read-only.")
+        if self._length == self.capacity:
+            self._resize(self.capacity * 2)
+        i = self._length
+        op, after = step.operation, step.after
+        cols = self._columns
+        cols["operation"][i] = OPCODES[op.name]
+        cols["parameter"][i] = math.nan if op.parameter is None else op.parameter
+        cols["dimension"][i] = after.dimension
+        cols["angle"][i] = after.angle_units
+        cols["polarity"][i] = after.polarity
+        cols["wave_state"][i] = after.wave_state == "collapsed"
+        cols["crossings"][i] = after.crossings
+        self._length = i + 1
+        self._write_header()
+
+    def column(self, name):
+        """
+        Zero-copy view of one raw column, covering the recorded rows.
+
+        Release it (or let it go) before appending past the capacity.
+        """
+        view = self._columns[name][:self._length]
+        self._exported()  # drop references to views already gone
+        self._exports.append(weakref.ref(view))
+        return view
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("trail index out of range")
+        cols = self._columns
+        parameter = cols["parameter"][index]
+        return TrailRecord(
+            operation=self._OP_NAMES[cols["operation"][index]],
+            parameter=None if math.isnan(parameter) else parameter,
+            dimension=cols["dimension"][index],
+            angle=_units_angle(cols["angle"][index]),
+            polarity=cols["polarity"][index],
+            wave_state=self._WAVES[cols["wave_state"][index]],
+            crossings=cols["crossings"][index],
+        )
+
+    def __iter__(self):
+        for i in range(self._length):
+            yield self[i]
+
+    def flush(self):
+        """Push written rows to disk."""
+        if self.writable:
+            self._mmap.flush()
+
+    def close(self):
+        """Flush and release the mapping and file handle."""
+        if self._file.closed:
+            return
+        self.flush()
+        self._unmap()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __repr__(self):
+        return f"ColumnarTrail('{self.path}', rows={self._length})"
+
+
+# =============================================================================
+#                            INTERNED TRAILS
+# =============================================================================
+
+class InternedTrail:
+    """
+    A trail that stores each distinct Position state only once.
+
+    Rotation cycles, wave toggles and void resets revisit the same states
+    over and over; here every state is hashed by its state_key() and kept
+    once, and each step keeps only the index of the state it reached (plus
+    the index of its operation, also interned). A step's `before` is the
+    previous step's `after`, so it costs nothing unless the trail was fed
+    disconnected steps.
+
+        trail = InternedTrail()
+        seq.execute(trail=trail)
+        trail.stats()["dedup_ratio"]
+
+    Reading a step rebuilds it with fresh copies of its states, so the
+    interned states can never be changed through the trail.
+    """
+
+    def __init__(self, steps=()):
+        self.states = []
+        self.operations = []
+        self._state_index = {}
+        self._op_index = {}
+        self._after = array("L")
+        self._ops = array("L")
+        self._before = {}  # step index -> state index, where it is not the previous after
+        for step in steps:
+            self.append(step)
+
+    def _intern_state(self, position):
+        key = position.state_key()
+        index = self._state_index.get(key)
+        if index is None:
+            index = self._state_index[key] = len(self.states)
+            self.states.append(position.copy())
+        return index
+
+    def _intern_operation(self, op):
+        key = (op.symbol, op.name, op.parameter)
+        index = self._op_index.get(key)
+        if index is None:
+            index = self._op_index[key] = len(self.operations)
+            self.operations.append(op)
+        return index
+
+    def append(self, step):
+        """Record a Step."""
+        n = len(self._after)
+        before = self._intern_state(step.before)
+        if not n or self._after[n - 1] != before:
+            self._before[n] = before
+        self._after.append(self._intern_state(step.after))
+        self._ops.append(self._intern_operation(step.operation))
+
+    def __len__(self):
+        return len(self._after)
+
+    def __getitem__(self, index):
+        n = len(self._after)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("trail index out of range")
+        before = self._before.get(index)
+        if before is None:
+            before = self._after[index - 1]
+        return Step(
+            operation=self.operations[self._ops[index]],
+            before=self.states[before].copy(),
+            after=self.states[self._after[index]].copy(),
+        )
+
+    def __iter__(self):
+        for i in range(len(self._after)):
+            yield self[i]
+
+    def stats(self):
+        """
+        Deduplication statistics. `dedup_ratio` is the number of Position
+        references the steps make (two per step) per state actually stored.
+        """
+        references = 2 * len(self._after)
+        return {
+            "steps": len(self._after),
+            "distinct_states": len(self.states),
+            "distinct_operations": len(self.operations),
+            "dedup_ratio": round(references / len(self.states), 2) if self.states else 0.0,
+        }
+
+    def __repr__(self):
+        return f"InternedTrail(steps={len(self._after)}, states={len(self.states)})"
+
+
+# =============================================================================
+#                          DELTA-ENCODED TRAILS
+# =============================================================================
+
+def _position_delta(before, after):
+    """
+    The changes from `before` to `after` as a hashable tuple of
+    (field, value) pairs. Dimension, crossings and angle are stored as
+    differences so repeated operations produce identical deltas;
+    intersections as the entries appended.
+    """
+    delta = []
+    if after._realm != before._realm:
+        delta.append(("realm", after.realm))
+    if after.dimension != before.dimension:
+        delta.append(("dimension", after.dimension - before.dimension))
+    if after.angle != before.angle:
+        turn = (after.angle_units - before.angle_units) % FULL_TURN
+        if _units_angle(before.angle_units + turn) == after.angle:
+            delta.append(("angle", turn))
+        else:
+            delta.append(("angle=", after.angle))
+    if after.polarity != before.polarity:
+        delta.append(("polarity", after.polarity))
+    if after.wave_state != before.wave_state:
+        delta.append(("wave_state", after.wave_state))
+    if after.crossings != before.crossings:
+        delta.append(("crossings", after.crossings - before.crossings))
+    if after.intersections != before.intersections:
+        n = len(before.intersections)
+        if after.intersections[:n] == before.intersections:
+            delta.append(("intersections+", _freeze_intersections(after.intersections[n:])))
+        else:
+            delta.append(("intersections=", _freeze_intersections(after.intersections)))
+    if after.mode != before.mode:
+        delta.append(("mode", after.mode))
+    return tuple(delta)
+
+
+def _freeze_intersections(intersections):
+    return tuple(tuple(entry.items()) for entry in intersections)
+
+
+def _apply_delta(position, delta):
+    """Return a new Position: `position` with a _position_delta() applied."""
+    p = position.copy()
+    for name, value in delta:
+        if name == "dimension":
+            p.dimension += value
+        elif name == "crossings":
+            p.crossings += value
+        elif name == "angle":
+            p.angle = _units_angle(p.angle_units + value)
+        elif name == "angle=":
+            p.angle = value
+        elif name == "intersections+":
+            p.intersections.extend(dict(entry) for entry in value)
+        elif name == "intersections=":
+            p.intersections = [dict(entry) for entry in value]
+        else:
+            setattr(p, name, value)
+    return p
+
+
+class DeltaTrail:
+    """
+    A trail that stores each Step as its operation plus only the fields
+    that operation changed.
+
+    Most operators touch one or two fields, so a step costs two small
+    integers: an interned operation and an interned delta (a ⊕ always has
+    the same delta). Full positions are rebuilt on access. Iterating
+    replays the deltas in order; random access starts from the nearest
+    full checkpoint, kept every `checkpoint_every` steps.
+
+        trail = DeltaTrail()
+        seq.execute(trail=trail)
+        for step in trail:
+            ...
+
+    It reads like the list of Steps that execute() returns.
+    """
+
+    def __init__(self, steps=(), checkpoint_every=1024):
+        if checkpoint_every < 1:
+            raise ValueError("checkpoint_every must be at least 1.")
+        self.checkpoint_every = checkpoint_every
+        self.operations = []
+        self.deltas = []
+        self._op_index = {}
+        self._delta_index = {}
+        self._ops = array("L")
+        self._delta_ids = array("L")
+        self._checkpoints = {}  # step index -> full `before` Position
+        self._last = None
+        for step in steps:
+            self.append(step)
+
+    def append(self, step):
+        """Record a Step."""
+        n = len(self._ops)
+        if n % self.checkpoint_every == 0 or step.before != self._last:
+            self._checkpoints[n] = step.before.copy()
+
+        op = step.operation
+        key = (op.symbol, op.name, op.parameter)
+        op_id = self._op_index.get(key)
+        if op_id is None:
+            op_id = self._op_index[key] = len(self.operations)
+            self.operations.append(op)
+
+        delta = _position_delta(step.before, step.after)
+        delta_id = self._delta_index.get(delta)
+        if delta_id is None:
+            delta_id = self._delta_index[delta] = len(self.deltas)
+            self.deltas.append(delta)
+
+        self._ops.append(op_id)
+        self._delta_ids.append(delta_id)
+        self._last = step.after.copy()
+
+    def _replay(self, start, stop):
+        """Yield (index, before, after) for steps start..stop-1; start must be a checkpoint."""
+        current = self._checkpoints[start]
+        for i in range(start, stop):
+            current = self._checkpoints.get(i, current)
+            after = _apply_delta(current, self.deltas[self._delta_ids[i]])
+            yield i, current, after
+            current = after
+
+    def _step(self, index, before, after):
+        return Step(operation=self.operations[self._ops[index]],
+                    before=before.copy(), after=after.copy())
+
+    def __len__(self):
+        return len(self._ops)
+
+    def __getitem__(self, index):
+        n = len(self._ops)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("trail index out of range")
+        start = index
+        while start not in self._checkpoints:
+            start -= 1
+        for i, before, after in self._replay(start, index + 1):
+            pass
+        return self._step(i, before, after)
+
+    def __iter__(self):
+        if self._ops:
+            for i, before, after in self._replay(0, len(self._ops)):
+                yield self._step(i, before, after)
+
+    def stats(self):
+        """Steps stored, distinct deltas and operations, and full checkpoints kept."""
+        return {
+            "steps": len(self._ops),
+            "distinct_deltas": len(self.deltas),
+            "distinct_operations": len(self.operations),
+            "checkpoints": len(self._checkpoints),
+        }
+
+    def __repr__(self):
+        return f"DeltaTrail(steps={len(self._ops)}, deltas={len(self.deltas)})"
+
+
+# =============================================================================
+#                           PREFIX STATE CACHE
+# =============================================================================
+
+class _TrieNode:
+    """One operation prefix and the Position it leads to."""
+    __slots__ = ("key", "parent", "children", "position")
+
+    def __init__(self, key, parent, position):
+        self.key = key
+        self.parent = parent
+        self.children = {}
+        self.position = position
+
+
+class PrefixCache:
+    """
+    A trie over operation prefixes that remembers the Position reached
+    after each one.
+
+    Routes that share a long common start -- everything leaving
+    "Earth ⟿ ⊕[3]◬..." -- only pay for that start once. execute() walks
+    the trie as far as the sequence matches, resumes from the deepest
+    cached Position, and caches the new suffix on the way.
+
+    Memory is bounded by `max_nodes`, evicting the least recently used
+    nodes. Every walk refreshes a node's ancestors after the node itself,
+    so the eviction victim is always a leaf and the trie stays connected.
+    """
+
+    def __init__(self, max_nodes=100_000):
+        if max_nodes < 1:
+            raise ValueError("max_nodes must be at least 1.")
+        self.max_nodes = max_nodes
+        self._roots = {}
+        self._lru = OrderedDict()
+        self.lookups = 0
+        self.hits = 0
+        self.evictions = 0
+        self._depth_total = 0
+        self._max_depth = 0
+        self._depth_buckets = Counter()
+
+    def execute(self, sequence):
+        """Return the final Position of `sequence`, reusing any cached prefix."""
+        ops = [op for op in _iter_operations(sequence.operations) if op.name != 'infinite']
+
+        origin_key = sequence.origin.state_key()
+        node = self._roots.get(origin_key)
+        if node is None:
+            node = _TrieNode(origin_key, None, sequence.origin.copy())
+            self._roots[origin_key] = node
+        path = [node]
+
+        depth = 0
+        for op in ops:
+            child = node.children.get((op.name, op.parameter))
+            if child is None:
+                break
+            node = child
+            path.append(node)
+            depth += 1
+        self._record(depth)
+
+        current = node.position
+        for op in ops[depth:]:
+            current = op.apply(current)
+            key = (op.name, op.parameter)
+            child = _TrieNode(key, node, current)
+            node.children[key] = child
+            node = child
+            path.append(node)
+
+        for visited in reversed(path):
+            self._lru[visited] = None
+            self._lru.move_to_end(visited)
+        while len(self._lru) > self.max_nodes:
+            self._evict()
+
+        final = current.copy()
+        if sequence.destination:
+            final._realm = sequence._destination
+        return final
+
+    def _record(self, depth):
+        self.lookups += 1
+        if depth:
+            self.hits += 1
+            self._depth_total += depth
+            self._max_depth = max(self._max_depth, depth)
+            self._depth_buckets[1 << (depth - 1).bit_length()] += 1
+
+    def _evict(self):
+        node, _ = self._lru.popitem(last=False)
+        if node.parent is None:
+            del self._roots[node.key]
+        else:
+            del node.parent.children[node.key]
+        self.evictions += 1
+
+    def stats(self):
+        """
+        Hit statistics. `depth_histogram` buckets hit depths by powers of
+        two: key 8 counts hits that resumed 5-8 operations deep.
+        """
+        return {
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "misses": self.lookups - self.hits,
+            "hit_rate": round(self.hits / self.lookups, 4) if self.lookups else 0.0,
+            "mean_hit_depth": round(self._depth_total / self.hits, 2) if self.hits else 0.0,
+            "max_hit_depth": self._max_depth,
+            "depth_histogram": dict(sorted(self._depth_buckets.items())),
+            "nodes": len(self._lru),
+            "evictions": self.evictions,
+        }
+
+    def clear(self):
+        """Drop every cached node (statistics are kept)."""
+        self._roots.clear()
+        self._lru.clear()
+
+    def __len__(self):
+        return len(self._lru)
+
+    def __repr__(self):
+        return f"PrefixCache(nodes={len(self._lru)}, max_nodes={self.max_nodes})"
+
+
+# =============================================================================
+#                              ROUTE CACHE
+# =============================================================================
+
+_GROUP_CODE = 255
+_NO_STRING = 0xFFFFFFFF
+_NO_MODE = 255
+_COUNT = struct.Struct("<I")
+_OPERATION = struct.Struct("<Bd")
+_GROUP = struct.Struct("<BQ")
+_COMPILED = struct.Struct("<?qq?bBqB")
+_SYMBOLS = list(OPERATORS)
+_MODES = ("direct", "parallel", "orthogonal")
+
+
+def _encode_string(out, value):
+    if value is None:
+        out += _COUNT.pack(_NO_STRING)
+    else:
+        data = value.encode("utf-8")
+        out += _COUNT.pack(len(data))
+        out += data
+
+
+def _decode_string(buffer, offset):
+    (length,), offset = _COUNT.unpack_from(buffer, offset), offset + _COUNT.size
+    if length == _NO_STRING:
+        return None, offset
+    return bytes(buffer[offset:offset + length]).decode("utf-8"), offset + length
+
+
+def _encode_operations(out, operations):
+    out += _COUNT.pack(len(operations))
+    for op in operations:
+        if isinstance(op, Repetition):
+            out += _GROUP.pack(_GROUP_CODE, op.count)
+            _encode_operations(out, op.operations)
+        else:
+            parameter = math.nan if op.parameter is None else op.parameter
+            out += _OPERATION.pack(OPCODES[op.name], parameter)
+
+
+def _decode_operations(buffer, offset):
+    (n,), offset = _COUNT.unpack_from(buffer, offset), offset + _COUNT.size
+    operations = []
+    for _ in range(n):
+        if buffer[offset] == _GROUP_CODE:
+            _, count = _GROUP.unpack_from(buffer, offset)
+            inner, offset = _decode_operations(buffer, offset + _GROUP.size)
+            operations.append(Repetition(operations=inner, count=count))
+        else:
+            code, parameter = _OPERATION.unpack_from(buffer, offset)
+            offset += _OPERATION.size
+            symbol = _SYMBOLS[code]
+            operations.append(Operation(
+                symbol=symbol, name=OPERATORS[symbol],
+                parameter=None if math.isnan(parameter) else parameter,
+            ))
+    return operations, offset
+
+
+def _encode_route(notation, sequence, compiled):
+    """
+    One RouteCache record: the notation, the parsed route and its summary,
+    or None for a route whose repeat counts do not fit 64 bits.
+    """
+    out = bytearray()
+    _encode_string(out, notation)
+    _encode_string(out, sequence.origin.realm)
+    _encode_string(out, sequence.destination)
+    try:
+        _encode_operations(out, sequence.operations)
+    except struct.error:
+        return None
+    summary = None
+    if compiled is not None:
+        try:
+            summary = _COMPILED.pack(
+                compiled.voided, compiled.dimension, compiled.angle, compiled.rotated,
+                compiled.polarity, compiled.wave, compiled.crossings,
+                _NO_MODE if compiled.mode is None else _MODES.index(compiled.mode),
+            )
+        except struct.error:  # too large for 64 bits: stored as "no summary"
+            pass
+    if summary is not None:
+        out.append(1)
+        out += summary
+        _encode_string(out, compiled.destination)
+    else:
+        out.append(0)
+    return bytes(out)
+
+
+def _decode_route(buffer, offset):
+    """Return (notation, sequence, compiled) from the record at `offset`."""
+    notation, offset = _decode_string(buffer, offset)
+    origin, offset = _decode_string(buffer, offset)
+    destination, offset = _decode_string(buffer, offset)
+    operations, offset = _decode_operations(buffer, offset)
+    sequence = TransformationSequence(origin, operations, destination)
+    compiled = None
+    if buffer[offset]:
+        voided, dimension, angle, rotated, polarity, wave, crossings, mode = (
+            _COMPILED.unpack_from(buffer, offset + 1)
+        )
+        compiled_destination, _ = _decode_string(buffer, offset + 1 + _COMPILED.size)
+        compiled = CompiledSequence(
+            voided=voided, dimension=dimension, angle=angle, rotated=rotated,
+            polarity=polarity, wave=wave, crossings=crossings,
+            mode=None if mode == _NO_MODE else _MODES[mode],
+            destination=compiled_destination,
+        )
+    return notation, sequence, compiled
+
+
+def _notation_hash(notation):
+    return int.from_bytes(hashlib.blake2b(notation.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class RouteCache:
+    """
+    A persistent cache of parsed and compiled routes, so a service can
+    warm-start a large route library without reparsing it.
+
+    The file holds one binary record per notation (the parsed operations,
+    groups included, and the CompiledSequence summary) followed by an
+    index sorted by a 64-bit notation hash. Opening only maps the file;
+    each lookup binary-searches the index and decodes a single record.
+    No pickle is involved, so a cache file cannot run code.
+
+        with RouteCache("routes.cache") as cache:
+            sequence, compiled = cache.load(notation)  # parsed on a miss
+            cache.save()                                # persist new routes
+
+    A file written by a different format or ENGINE_VERSION, or one that is
+    truncated or corrupt, is ignored (`invalidated` is set) and replaced by
+    the next save(). Routes with a repeat count of 2**64 or more cannot be
+    stored; save() keeps them in memory only.
+    """
+
+    MAGIC = b"OMROUTES"
+    FORMAT = 1
+    HEADER = struct.Struct("<8sH32sQQ")
+    HEADER_SIZE = 64
+    INDEX_ENTRY = struct.Struct("<QQQ")  # hash, record offset, record length
+
+    def __init__(self, path):
+        self.path = path
+        self.invalidated = False
+        self.hits = 0
+        self.misses = 0
+        self._pending = {}
+        self._file = None
+        self._mmap = None
+        self._count = 0
+        self._index_offset = 0
+        if os.path.exists(path) and os.path.getsize(path) >= self.HEADER_SIZE:
+            self._map()
+        elif os.path.exists(path):
+            self.invalidated = True
+
+    def _map(self):
+        self._file = open(self.path, "rb")
+        magic, fmt, version, count, index_offset = self.HEADER.unpack(
+            self._file.read(self.HEADER.size)
+        )
+        if (magic, fmt, version.rstrip(b"\0")) != (self.MAGIC, self.FORMAT, ENGINE_VERSION.encode()):
+            self.invalidated = True
+            self._file.close()
+            self._file = None
+            return
+        size = os.fstat(self._file.fileno()).st_size
+        if not self.HEADER_SIZE <= index_offset <= size or count * self.INDEX_ENTRY.size != size - index_offset:
+            self.invalidated = True  # truncated, or the header does not describe this file
+            self._file.close()
+            self._file = None
+            return
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._count = count
+        self._index_offset = index_offset
+
+    def _entry(self, i):
+        return self.INDEX_ENTRY.unpack_from(self._mmap, self._index_offset + i * self.INDEX_ENTRY.size)
+
+    def _find(self, notation):
+        """Decode the stored record for `notation`, or return None."""
+        if not self._count:
+            return None
+        key = _notation_hash(notation)
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._entry(mid)[0] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        while lo < self._count:
+            entry_hash, offset, _ = self._entry(lo)
+            if entry_hash != key:
+                break
+            try:
+                stored, sequence, compiled = _decode_route(self._mmap, offset)
+            except (struct.error, IndexError, ValueError):  # corrupt record
+                self._unmap()
+                self.invalidated = True
+                return None
+            if stored == notation:
+                return sequence, compiled
+            lo += 1  # hash collision
+        return None
+
+    def get(self, notation):
+        """Return (sequence, compiled) for a cached notation, or None."""
+        found = self._pending.get(notation)
+        if found is None:
+            found = self._find(notation)
+        if found is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return found
+
+    def load(self, notation):
+        """
+        Return (sequence, compiled), parsing and compiling on a miss.
+        `compiled` is None for routes with ⊠, which have no summary.
+        """
+        found = self.get(notation)
+        if found is None:
+            sequence = parse(notation)
+            try:
+                compiled = sequence.compile()
+            except ValueError:
+                compiled = None
+            found = self._pending[notation] = (sequence, compiled)
+        return found
+
+    def __contains__(self, notation):
+        return notation in self._pending or self._find(notation) is not None
+
+    def __len__(self):
+        return self._count + len(self._pending)
+
+    def save(self):
+        """Write stored and newly loaded routes to the file, atomically."""
+        records = []  # (hash, record bytes)
+        for i in range(self._count):
+            entry_hash, offset, length = self._entry(i)
+            records.append((entry_hash, self._mmap[offset:offset + length]))
+        unstorable = {}
+        for notation, (sequence, compiled) in self._pending.items():
+            record = _encode_route(notation, sequence, compiled)
+            if record is None:
+                unstorable[notation] = (sequence, compiled)
+            else:
+                records.append((_notation_hash(notation), record))
+        records.sort(key=lambda record: record[0])
+
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "wb") as out:
+            out.write(bytes(self.HEADER_SIZE))
+            index = bytearray()
+            offset = self.HEADER_SIZE
+            for entry_hash, record in records:
+                out.write(record)
+                index += self.INDEX_ENTRY.pack(entry_hash, offset, len(record))
+                offset += len(record)
+            out.write(index)
+            out.seek(0)
+            out.write(self.HEADER.pack(
+                self.MAGIC, self.FORMAT, ENGINE_VERSION.encode(), len(records), offset,
+            ))
+        self._unmap()
+        os.replace(temporary, self.path)
+        self._pending = unstorable
+        self.invalidated = False
+        self._map()
+
+    def _unmap(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._count = 0
+
+    def close(self):
+        """Release the mapping; unsaved routes are dropped."""
+        self._unmap()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __repr__(self):
+        return f"RouteCache('{self.path}', routes={len(self)})"
+
+
+# =============================================================================
+#                             JOURNEY TABLE
+# =============================================================================
+
+@dataclass
+class JourneyRow:
+    """One row of a JourneyTable: the summary of one route."""
+    origin: str
+    destination: Optional[str]
+    complexity: int
+    dimension_delta: int
+    final_angle: float
+    crossings: int
+    intersections: int
+    recursive: bool
+
+
+class RowMask:
+    """
+    Which rows of a JourneyTable match a filter, one byte per row.
+
+    Combine masks with & | ~ -- each combination is a single big-integer
+    operation over all rows, not a Python loop.
+    """
+
+    __slots__ = ("_bits",)
+
+    def __init__(self, bits):
+        self._bits = bytes(bits)
+
+    def _combine(self, other, op):
+        if len(self._bits) != len(other._bits):
+            raise ValueError("Masks cover different numbers of rows.")
+        n = len(self._bits)
+        value = op(int.from_bytes(self._bits, "little"), int.from_bytes(other._bits, "little"))
+        return RowMask(value.to_bytes(n, "little"))
+
+    def __and__(self, other):
+        return self._combine(other, operator.and_)
+
+    def __or__(self, other):
+        return self._combine(other, operator.or_)
+
+    def __invert__(self):
+        return self._combine(RowMask(b"\x01" * len(self._bits)), operator.xor)
+
+    def rows(self):
+        """Indices of the matching rows, in row order."""
+        rows = []
+        i = self._bits.find(1)
+        while i != -1:
+            rows.append(i)
+            i = self._bits.find(1, i + 1)
+        return rows
+
+    def count(self):
+        """Number of matching rows."""
+        return self._bits.count(1)
+
+    def __len__(self):
+        return len(self._bits)
+
+    def __repr__(self):
+        return f"RowMask({self.count()} of {len(self._bits)} rows)"
+
+
+class _TableColumn:
+    """A column of a JourneyTable; comparing it with a value gives a RowMask."""
+
+    def __init__(self, table, name):
+        self.table = table
+        self.name = name
+
+    def _mask(self, op, value):
+        values = self.table._columns[self.name]
+        if self.name in JourneyTable.REALM_COLUMNS:
+            if op not in (operator.eq, operator.ne):
+                raise TypeError(f"Realm column '{self.name}' only supports == and !=.")
+            value = self.table._realms.get(value, -2) if value is not None else -1
+        # op(x, value) for every row x, evaluated by map() in C
+        return RowMask(map(partial(_SWAPPED[op], value), values))
+
+    def __eq__(self, value):
+        return self._mask(operator.eq, value)
+
+    def __ne__(self, value):
+        return self._mask(operator.ne, value)
+
+    def __lt__(self, value):
+        return self._mask(operator.lt, value)
+
+    def __le__(self, value):
+        return self._mask(operator.le, value)
+
+    def __gt__(self, value):
+        return self._mask(operator.gt, value)
+
+    def __ge__(self, value):
+        return self._mask(operator.ge, value)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"<JourneyTable column {self.name}>"
+
+
+# Each comparison with its arguments swapped: op(x, v) == _SWAPPED[op](v, x)
+_SWAPPED = {
+    operator.eq: operator.eq, operator.ne: operator.ne,
+    operator.lt: operator.gt, operator.le: operator.ge,
+    operator.gt: operator.lt, operator.ge: operator.le,
+}
+
+
+class JourneyTable:
+    """
+    A columnar summary of a library of routes, one row per sequence.
+
+    Each route is executed once when it is added; afterwards questions
+    like "which routes climb five dimensions and cross twice" are
+    answered from typed arrays without re-parsing or re-executing:
+
+        table = JourneyTable.from_sequences(library)
+        table.query("dimension_delta >= 5 & crossings > 2")
+        table.where((table.dimension_delta >= 5) & (table.origin == "Earth"))
+        table.range("final_angle", 90, 180)
+
+    Realm names are stored as small integer codes into `table.realms`.
+    """
+
+    COLUMNS = (
+        ("origin", "l"),
+        ("destination", "l"),
+        ("complexity", "q"),
+        ("dimension_delta", "q"),
+        ("final_angle", "d"),
+        ("crossings", "q"),
+        ("intersections", "q"),
+        ("recursive", "B"),
+    )
+    REALM_COLUMNS = ("origin", "destination")
+
+    _QUERY_OPERATORS = (
+        (">=", operator.ge), ("<=", operator.le), ("==", operator.eq),
+        ("!=", operator.ne), (">", operator.gt), ("<", operator.lt),
+    )
+
+    def __init__(self):
+        self._realms = RealmRegistry()
+        self._columns = {name: array(typecode) for name, typecode in self.COLUMNS}
+        self._indexes = {}
+
+    @classmethod
+    def from_sequences(cls, sequences):
+        """Build a table from TransformationSequences or notation strings."""
+        table = cls()
+        for sequence in sequences:
+            table.append(sequence)
+        return table
+
+    def _realm_code(self, realm):
+        return -1 if realm is None else self._realms.id(realm)
+
+    @property
+    def realms(self):
+        """Realm names in code order."""
+        return self._realms.names()
+
+    def append(self, sequence):
+        """Summarize one route into a new row and return its index."""
+        if isinstance(sequence, str):
+            sequence = parse(sequence)
+        try:
+            final = sequence.compile().apply(sequence.origin)
+        except ValueError:  # ⊠ needs the real walk
+            final = sequence.origin
+            for step in sequence.iter_steps():
+                final = step.after
+
+        row = (
+            self._realm_code(sequence.origin.realm),
+            self._realm_code(sequence.destination),
+            sequence.complexity,
+            sequence.dimension_delta,
+            final.angle,
+            final.crossings,
+            len(final.intersections),
+            sequence.recursive,
+        )
+        for (name, _), value in zip(self.COLUMNS, row):
+            self._columns[name].append(value)
+        self._indexes.clear()
+        return len(self) - 1
+
+    def column(self, name):
+        """A column to compare against a value, producing a RowMask."""
+        if name not in self._columns:
+            raise KeyError(f"Unknown column '{name}'.")
+        return _TableColumn(self, name)
+
+    def __getattr__(self, name):
+        if name in dict(self.COLUMNS):
+            return _TableColumn(self, name)
+        raise AttributeError(name)
+
+    def values(self, name):
+        """The raw typed array behind a column."""
+        return self._columns[name]
+
+    def where(self, mask):
+        """Indices of the rows selected by a RowMask."""
+        if len(mask) != len(self):
+            raise ValueError("Mask does not cover this table.")
+        return mask.rows()
+
+    def query(self, expression):
+        """
+        Indices of the rows matching a filter such as
+        "dimension_delta >= 5 & crossings > 2 | origin == Earth".
+
+        Clauses are `column op value` with op one of >= <= == != > <;
+        & binds tighter than |, as in Python.
+        """
+        mask = None
+        for alternative in expression.split("|"):
+            both = None
+            for clause in alternative.split("&"):
+                clause_mask = self._clause(clause.strip())
+                both = clause_mask if both is None else both & clause_mask
+            mask = both if mask is None else mask | both
+        return self.where(mask)
+
+    def _clause(self, clause):
+        for symbol, op in self._QUERY_OPERATORS:
+            name, found, value = clause.partition(symbol)
+            if found:
+                break
+        else:
+            raise ValueError(f"Cannot parse filter clause '{clause}'.")
+        column = self.column(name.strip())
+        value = value.strip()
+        if column.name not in self.REALM_COLUMNS:
+            value = {"true": 1, "false": 0}.get(value.lower(), value)
+            value = float(value) if isinstance(value, str) else value
+        return column._mask(op, value)
+
+    def _sorted_index(self, name):
+        index = self._indexes.get(name)
+        if index is None:
+            values = self._columns[name]
+            order = array("q", sorted(range(len(values)), key=values.__getitem__))
+            index = (order, array(values.typecode, map(values.__getitem__, order)))
+            self._indexes[name] = index
+        return index
+
+    def range(self, name, low=None, high=None):
+        """
+        Indices of the rows with low <= value <= high (either bound may be
+        None), in ascending value order, by binary search over a sorted
+        index built on first use.
+        """
+        if name in self.REALM_COLUMNS:
+            raise TypeError(f"Realm column '{name}' has no meaningful order.")
+        order, values = self._sorted_index(name)
+        start = 0 if low is None else bisect.bisect_left(values, low)
+        stop = len(values) if high is None else bisect.bisect_right(values, high)
+        return order[start:stop].tolist()
+
+    def row(self, index):
+        """The full JourneyRow at `index`."""
+        fields = {name: self._columns[name][index] for name, _ in self.COLUMNS}
+        for name in self.REALM_COLUMNS:
+            code = fields[name]
+            fields[name] = self._realms.name(code) if code >= 0 else None
+        fields["recursive"] = bool(fields["recursive"])
+        return JourneyRow(**fields)
+
+    def __len__(self):
+        return len(self._columns["origin"])
+
+    def __repr__(self):
+        return f"JourneyTable(rows={len(self)}, realms={len(self._realms)})"
+
+
+# =============================================================================
+#                           CORPUS STATISTICS
+# =============================================================================
+
+class _TDigest:
+    """
+    A merging t-digest: approximate quantiles of a stream in bounded memory.
+
+    Values are buffered, then merged into about compression / 2
+    centroids whose size limit shrinks towards the tails, so extreme
+    quantiles stay accurate.
+    """
+
+    def __init__(self, compression=200):
+        self.compression = compression
+        self.centroids = []  # [mean, weight], sorted by mean
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self._buffer = []
+
+    def add(self, value, weight=1):
+        self._buffer.append([value, weight])
+        self.count += weight
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if len(self._buffer) >= 8 * self.compression:
+            self._compress()
+
+    def _compress(self):
+        if not self._buffer:
+            return
+        points = sorted(self.centroids + self._buffer)
+        self._buffer = []
+        merged = [points[0]]
+        seen = 0
+        q_limit = self._next_limit(0.0)
+        for mean, weight in points[1:]:
+            last = merged[-1]
+            if (seen + last[1] + weight) / self.count <= q_limit:
+                last[0] += (mean - last[0]) * weight / (last[1] + weight)
+                last[1] += weight
+            else:
+                seen += last[1]
+                q_limit = self._next_limit(seen / self.count)
+                merged.append([mean, weight])
+        self.centroids = merged
+
+    def _next_limit(self, q):
+        """
+        The largest quantile a centroid starting at q may reach: one unit
+        further along the k1 scale, k(q) = compression/2pi * asin(2q - 1).
+        """
+        scale = self.compression / (2 * math.pi)
+        k = min(scale * math.asin(2 * q - 1) + 1, self.compression / 4)
+        return (math.sin(k / scale) + 1) / 2
+
+    def merge(self, other):
+        other._compress()
+        for mean, weight in other.centroids:
+            self.add(mean, weight)
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q):
+        """The approximate q-quantile (0 <= q <= 1), or None when empty."""
+        self._compress()
+        if not self.centroids:
+            return None
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+        target = q * self.count
+        cumulative = 0
+        previous_mean, previous_mid = self.min, 0
+        for mean, weight in self.centroids:
+            mid = cumulative + weight / 2
+            if target < mid:
+                if mid == previous_mid:
+                    return mean
+                fraction = (target - previous_mid) / (mid - previous_mid)
+                return previous_mean + fraction * (mean - previous_mean)
+            cumulative += weight
+            previous_mean, previous_mid = mean, mid
+        if cumulative == previous_mid:
+            return self.max
+        fraction = (target - previous_mid) / (cumulative - previous_mid)
+        return previous_mean + fraction * (self.max - previous_mean)
+
+
+class _SpaceSaving:
+    """
+    Space-Saving heavy hitters: the most frequent keys of a stream using
+    `capacity` counters. A key's count overestimates its true count by at
+    most its recorded error.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+        self._heap = []  # (count, key); stale entries are skipped
+
+    def add(self, key, weight=1):
+        counts = self.counts
+        if key in counts:
+            counts[key] += weight
+        elif len(counts) < self.capacity:
+            counts[key] = weight
+            self.errors[key] = 0
+        else:
+            while True:
+                count, victim = heapq.heappop(self._heap)
+                if counts.get(victim) == count:
+                    break
+                if victim in counts:  # refresh a stale entry
+                    heapq.heappush(self._heap, (counts[victim], victim))
+            del counts[victim]
+            del self.errors[victim]
+            counts[key] = count + weight
+            self.errors[key] = count
+        heapq.heappush(self._heap, (counts[key], key))
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(count, k) for k, count in counts.items()]
+            heapq.heapify(self._heap)
+
+    def top(self, n):
+        return sorted(self.counts.items(), key=lambda item: (-item[1], item[0]))[:n]
+
+
+def _operator_counts(operations, counter, times=1):
+    """Add every operator's use to `counter`, multiplying through groups."""
+    for op in operations:
+        if isinstance(op, Repetition):
+            if op.count:
+                _operator_counts(op.operations, counter, times * op.count)
+        else:
+            counter[op.name] += times
+
+
+class CorpusStats:
+    """
+    Statistics over a corpus of journeys, gathered in one streaming pass
+    and in bounded memory, however many journeys go by:
+
+    - how often each operator is used (groups counted without expansion)
+    - approximate quantiles of complexity and dimension delta (t-digest)
+    - the top-N most common routes (Space-Saving heavy hitters)
+    - the share of journeys that touch the void or recurse
+
+        stats = CorpusStats()
+        with open("journeys.txt") as lines:
+            stats.update(lines)
+        stats.summary()
+
+    Statistics gathered on separate workers combine with merge().
+    """
+
+    QUANTILES = (0.5, 0.9, 0.99)
+
+    def __init__(self, top_n=10, compression=200, capacity=None):
+        if top_n < 1:
+            raise ValueError("top_n must be at least 1.")
+        self.top_n = top_n
+        self.journeys = 0
+        self.errors = 0
+        self.voids = 0
+        self.recursive = 0
+        self.operators = Counter()
+        self.complexity = _TDigest(compression)
+        self.dimension_delta = _TDigest(compression)
+        self._routes = _SpaceSaving(capacity or 10 * top_n)
+
+    def add(self, journey):
+        """Count one journey: a TransformationSequence or a notation string."""
+        if isinstance(journey, str):
+            journey = journey.strip()
+            if not journey or journey.startswith("#"):
+                return
+            try:
+                journey = parse(journey)
+            except ValueError:
+                self.errors += 1
+                return
+
+        operators = Counter()
+        _operator_counts(journey.operations, operators)
+        self.operators.update(operators)
+        self.journeys += 1
+        self.voids += operators['void'] > 0
+        self.recursive += journey.recursive
+        self.complexity.add(journey.complexity)
+        self.dimension_delta.add(journey.dimension_delta)
+        self._routes.add(journey.notation())
+
+    def update(self, journeys):
+        """Count every journey from an iterable, such as an open file."""
+        for journey in journeys:
+            self.add(journey)
+        return self
+
+    def merge(self, other):
+        """Fold in statistics gathered elsewhere (heavy hitters stay approximate)."""
+        self.journeys += other.journeys
+        self.errors += other.errors
+        self.voids += other.voids
+        self.recursive += other.recursive
+        self.operators.update(other.operators)
+        self.complexity.merge(other.complexity)
+        self.dimension_delta.merge(other.dimension_delta)
+        for route, count in other._routes.counts.items():
+            self._routes.add(route, count)
+        return self
+
+    def top_routes(self, n=None):
+        """The most common routes as (notation, approximate count) pairs."""
+        return self._routes.top(n or self.top_n)
+
+    def summary(self):
+        """Every statistic as a plain dictionary."""
+        def distribution(digest):
+            result = {"min": digest.min if digest.count else None,
+                      "max": digest.max if digest.count else None}
+            for q in self.QUANTILES:
+                value = digest.quantile(q)
+                result[f"p{round(q * 100)}"] = None if value is None else round(value, 2)
+            return result
+
+        return {
+            "journeys": self.journeys,
+            "errors": self.errors,
+            "operators": dict(self.operators.most_common()),
+            "complexity": distribution(self.complexity),
+            "dimension_delta": distribution(self.dimension_delta),
+            "void_rate": round(self.voids / self.journeys, 4) if self.journeys else 0.0,
+            "recursion_rate": round(self.recursive / self.journeys, 4) if self.journeys else 0.0,
+            "top_routes": self.top_routes(),
+        }
+
+    def __repr__(self):
+        return f"CorpusStats(journeys={self.journeys})"
+
+
+# =============================================================================
+#                            COMMAND LINE
+# =============================================================================
+
+ACTIONS = ('execute', 'reverse', 'optimize', 'describe')
+
+CSV_FIELDS = {
+    'execute': ['line', 'realm', 'dimension', 'angle', 'polarity', 'wave_state',
+                'crossings', 'intersections', 'mode', 'steps', 'error'],
+    'reverse': ['line', 'notation', 'error'],
+    'optimize': ['line', 'notation', 'error'],
+    'describe': ['line', 'description', 'error'],
+}
+
+# Binary records: header (line number, status, payload length), then the payload.
+# execute payloads are EXECUTE_RECORD followed by the UTF-8 realm; every other
+# payload -- including error messages (status 1) -- is UTF-8 text.
+BINARY_HEADER = struct.Struct("<QBI")
+EXECUTE_RECORD = struct.Struct("<qdbBqQQB")
+_MODE_CODES = {"direct": 0, "parallel": 1, "orthogonal": 2}
+
+
+class _StepCounter:
+    """A trail that only counts its steps."""
+
+    def __init__(self):
+        self.count = 0
+
+    def append(self, step):
+        self.count += 1
+
+
+def _process_line(action, line):
+    """Parse one notation line and run `action` on it, returning a result dict."""
+    try:
+        seq = parse(line)
+        if action == 'execute':
+            final, trail = seq.execute(trail=_StepCounter())
+            return {
+                "realm": final.realm,
+                "dimension": final.dimension,
+                "angle": final.angle,
+                "polarity": final.polarity,
+                "wave_state": final.wave_state,
+                "crossings": final.crossings,
+                "intersections": len(final.intersections),
+                "mode": final.mode,
+                "steps": trail.count,
+            }
+        if action == 'reverse':
+            return {"notation": seq.reverse().notation()}
+        if action == 'optimize':
+            return {"notation": seq.optimize().notation()}
+        return {"description": seq.describe()}
+    except (ValueError, ArithmeticError) as e:
+        return {"error": str(e)}
+
+
+def _timed_batch(job):
+    """Worker entry point: process a batch of (line_number, text) pairs."""
+    action, batch = job
+    results = []
+    for number, text in batch:
+        start = time.perf_counter()
+        result = {"line": number, **_process_line(action, text)}
+        results.append((result, time.perf_counter() - start))
+    return results
+
+
+def _read_journeys(paths):
+    """Yield (line_number, notation) from each file ('-' is stdin), skipping blanks and # comments."""
+    number = 0
+    for path in paths:
+        stream = sys.stdin if path == '-' else open(path, encoding="utf-8")
+        try:
+            for raw in stream:
+                number += 1
+                text = raw.strip()
+                if text and not text.startswith('#'):
+                    yield number, text
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+
+def _batches(journeys, action, size):
+    batch = []
+    for item in journeys:
+        batch.append(item)
+        if len(batch) == size:
+            yield action, batch
+            batch = []
+    if batch:
+        yield action, batch
+
+
+def _binary_record(action, result):
+    """One binary record; a result the fixed-width fields cannot hold becomes an error record."""
+    if "error" in result:
+        payload, status = result["error"].encode("utf-8"), 1
+    elif action == 'execute':
+        try:
+            fields = EXECUTE_RECORD.pack(
+                result["dimension"], result["angle"], result["polarity"],
+                result["wave_state"] == "collapsed", result["crossings"],
+                result["intersections"], result["steps"], _MODE_CODES.get(result["mode"], 255),
+            )
+        except struct.error as e:
+            return _binary_record(action, {
+                "line": result["line"],
+                "error": f"Result does not fit the binary record: {e}",
+            })
+        payload, status = fields + result["realm"].encode("utf-8"), 0
+    else:
+        key = "description" if action == 'describe' else "notation"
+        payload, status = result[key].encode("utf-8"), 0
+    return BINARY_HEADER.pack(result["line"], status, len(payload)) + payload
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def _peak_rss_mb():
+    """Peak resident memory of this process and its workers, or None where unsupported."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    # ru_maxrss is bytes on macOS, kilobytes elsewhere
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _imap_windowed(pool, jobs, window):
+    """Like pool.imap, but never reads more than `window` batches ahead of the output."""
+    pending = []
+    for job in jobs:
+        pending.append(pool.apply_async(_timed_batch, (job,)))
+        if len(pending) >= window:
+            yield pending.pop(0).get()
+    for result in pending:
+        yield result.get()
+
+
+def main(argv=None):
+    """
+    Batch engine: python -m omnidirectional_math [options] FILE [FILE ...]
+
+    Reads one notation per line from each FILE ('-' for stdin), runs the
+    chosen action on every journey and writes one record per line. A
+    throughput report (lines/s, p50/p99 latency, peak RSS) goes to stderr.
+    Returns the exit status: 1 if any line failed to parse.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m omnidirectional_math",
+        description="Run omnidirectional notation files through the engine.",
+    )
+    parser.add_argument("files", nargs="+", help="Notation files, one journey per line ('-' for stdin).")
+    parser.add_argument("--action", choices=ACTIONS, default='execute')
+    parser.add_argument("--format", choices=('json', 'csv', 'binary'), default='json')
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes (default: 1).")
+    parser.add_argument("--batch-size", type=int, default=256, help="Journeys handed to a worker at a time.")
+    parser.add_argument("--output", "-o", help="Write records here instead of stdout.")
+    parser.add_argument("--quiet", action="store_true", help="Skip the throughput report.")
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.batch_size < 1:
+        parser.error("--batch-size must be at least 1")
+
+    binary = args.format == 'binary'
+    if args.output:
+        out = open(args.output, "wb") if binary else open(args.output, "w", encoding="utf-8", newline="")
+    else:
+        out = sys.stdout.buffer if binary else sys.stdout
+    writer = None
+    if args.format == 'csv':
+        writer = csv.DictWriter(out, fieldnames=CSV_FIELDS[args.action], restval="")
+        writer.writeheader()
+
+    latencies = array('d')
+    errors = 0
+    start = time.perf_counter()
+    jobs = _batches(_read_journeys(args.files), args.action, args.batch_size)
+
+    pool = None
+    if args.workers > 1:
+        import multiprocessing
+        pool = multiprocessing.Pool(args.workers)
+        batches = _imap_windowed(pool, jobs, window=args.workers * 2)
+    else:
+        batches = map(_timed_batch, jobs)
+
+    try:
+        for batch in batches:
+            for result, seconds in batch:
+                latencies.append(seconds)
+                if binary:
+                    record = _binary_record(args.action, result)
+                    errors += BINARY_HEADER.unpack_from(record)[1]
+                    out.write(record)
+                    continue
+                if "error" in result:
+                    errors += 1
+                if writer:
+                    writer.writerow(result)
+                else:
+                    out.write(json.dumps(result, ensure_ascii=False) + "\n")
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+        if args.output:
+            out.close()
+        else:
+            out.flush()
+
+    elapsed = time.perf_counter() - start
+    if not args.quiet:
+        ordered = sorted(latencies)
+        rss = _peak_rss_mb()
+        print(
+            f"{len(latencies)} journeys ({errors} errors) in {elapsed:.3f}s -- "
+            f"{len(latencies) / elapsed if elapsed else 0:.0f} lines/s, "
+            f"p50 {_percentile(ordered, 0.50) * 1e3:.3f} ms, "
+            f"p99 {_percentile(ordered, 0.99) * 1e3:.3f} ms, "
+            f"peak RSS {f'{rss} MB' if rss is not None else 'n/a'}",
+            file=sys.stderr,
+        )
+    return 1 if errors else 0
+
+
 # =============================================================================
 #                           DEMONSTRATION
 # =============================================================================
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(main())
+
     print()
     print("+" + "=" * 68 + "+")
     print("|" + " " * 68 + "|")
@@ -0,0 +1,222 @@
+"""
+Benchmark harness for omnidirectional_math.py.
+
+Times parse, _tokenize, execute, reverse, compose, describe and notation
+across sequence lengths from 10 to 10^6 operators, on seeded random
+workloads, and compares the results against a stored JSON baseline.
+
+Workloads:
+- mixed: every operator except ⊠, weighted toward the movement operators
+- intersection: one operator in four is ⊠, which makes each step copy a
+  growing intersection list -- kept to smaller sizes by default
+
+Usage:
+    python benchmarks/bench_omnidirectional_math.py
+    python benchmarks/bench_omnidirectional_math.py --max-size 10000 --only execute,parse
+    python benchmarks/bench_omnidirectional_math.py --save benchmarks/baselines/omnidirectional_math.json
+    python benchmarks/bench_omnidirectional_math.py --compare benchmarks/baselines/omnidirectional_math.json --threshold 0.25
+
+Exit status is 1 when --compare finds a regression beyond the threshold.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "Python Files"))
+
+from omnidirectional_math import OPERATORS, _tokenize, compose, parse  # noqa: E402
+
+
+DEFAULT_SIZES = [10, 100, 1_000, 10_000, 100_000, 1_000_000]
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baselines", "omnidirectional_math.json")
+DEFAULT_THRESHOLD = 0.25
+
+WORKLOADS = {
+    "mixed": {
+        '⊕': 6, '⊖': 4, '⟲': 5, '⟳': 5, '⇄': 3, '∿': 3,
+        '∥': 2, '⊥': 2, '◬': 4, '∞': 1, '∅': 1,
+    },
+    "intersection": {
+        '⊠': 4, '⊕': 3, '⟲': 3, '◬': 2, '∿': 2, '⊖': 2,
+    },
+}
+
+# Per-workload size ceilings: intersection-heavy execution is quadratic
+WORKLOAD_MAX_SIZE = {
+    "mixed": 1_000_000,
+    "intersection": 10_000,
+}
+
+BENCHMARKS = ("parse", "_tokenize", "execute", "reverse", "compose", "describe", "notation")
+
+PARAMETERIZED = {'⊕', '⊖', '⟲', '⟳'}
+
+
+def generate_operations(n, rng, weights):
+    """Return a random operations string of n operators drawn from `weights`."""
+    symbols = list(weights)
+    picks = rng.choices(symbols, weights=[weights[s] for s in symbols], k=n)
+    parts = []
+    for symbol in picks:
+        if symbol in PARAMETERIZED and rng.random() < 0.7:
+            if symbol in ('⟲', '⟳'):
+                parts.append(f"{symbol}[{rng.choice((15, 30, 45, 90, 12.5, 0.1))}]")
+            else:
+                parts.append(f"{symbol}[{rng.randint(1, 5)}]")
+        else:
+            parts.append(symbol)
+    return "".join(parts)
+
+
+def generate_notation(n, seed, workload):
+    """Return a full, reproducible notation string for one benchmark case."""
+    rng = random.Random(f"{seed}:{workload}:{n}")
+    ops = generate_operations(n, rng, WORKLOADS[workload])
+    return f"Origin ⟿ {ops} ⟿ Destination"
+
+
+def _time(fn, repeat):
+    """Best-of-`repeat` wall time of fn(), in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _cases(notation):
+    ops_string = notation.split("⟿")[1]
+    seq = parse(notation)
+    half = len(seq.operations) // 2
+    legs = (
+        parse(f"Origin ⟿ {''.join(op.notation() for op in seq.operations[:half])} ⟿ Mid"),
+        parse(f"Mid ⟿ {''.join(op.notation() for op in seq.operations[half:])} ⟿ Destination"),
+    )
+    return {
+        "parse": lambda: parse(notation),
+        "_tokenize": lambda: _tokenize(ops_string),
+        "execute": seq.execute,
+        "reverse": seq.reverse,
+        "compose": lambda: compose(*legs),
+        "describe": seq.describe,
+        "notation": seq.notation,
+    }
+
+
+def run_benchmarks(sizes=None, workloads=None, only=None, seed=0, repeat=None, log=None):
+    """
+    Run the benchmark matrix and return a results dict keyed by
+    "benchmark/workload/size", each holding total seconds and ns per operator.
+    """
+    sizes = sizes or DEFAULT_SIZES
+    workloads = workloads or list(WORKLOADS)
+    only = only or BENCHMARKS
+    results = {}
+
+    for workload in workloads:
+        for n in sizes:
+            if n > WORKLOAD_MAX_SIZE[workload]:
+                continue
+            cases = _cases(generate_notation(n, seed, workload))
+            reps = repeat or max(1, min(20, 100_000 // n))
+            for name in only:
+                seconds = _time(cases[name], reps)
+                key = f"{name}/{workload}/{n}"
+                results[key] = {
+                    "seconds": round(seconds, 9),
+                    "ns_per_op": round(seconds * 1e9 / n, 2),
+                }
+                if log:
+                    log(f"  {key:<32} {seconds * 1e3:>12.3f} ms  {seconds * 1e9 / n:>10.1f} ns/op")
+    return results
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compare results against a baseline's results.
+
+    Returns a list of (key, baseline_seconds, current_seconds, ratio) for
+    every case that got slower by more than `threshold` (0.25 = 25%).
+    Cases missing from either side are ignored.
+    """
+    regressions = []
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if not previous or not previous["seconds"]:
+            continue
+        ratio = current["seconds"] / previous["seconds"]
+        if ratio > 1.0 + threshold:
+            regressions.append((key, previous["seconds"], current["seconds"], round(ratio, 3)))
+    return regressions
+
+
+def metadata(seed):
+    """Environment details stored alongside a baseline."""
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+        "seed": seed,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark omnidirectional_math.py.")
+    parser.add_argument("--sizes", help="Comma-separated sequence lengths (default: 10..10^6).")
+    parser.add_argument("--max-size", type=int, help="Skip sizes above this length.")
+    parser.add_argument("--only", help=f"Comma-separated benchmarks from: {', '.join(BENCHMARKS)}.")
+    parser.add_argument("--workloads", help=f"Comma-separated workloads from: {', '.join(WORKLOADS)}.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, help="Repetitions per case (default scales with size).")
+    parser.add_argument("--save", metavar="PATH", help="Write results as a JSON baseline.")
+    parser.add_argument("--compare", metavar="PATH", nargs="?", const=DEFAULT_BASELINE,
+                        help="Compare against a JSON baseline (default: the stored one).")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown before a case counts as a regression.")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",")] if args.sizes else DEFAULT_SIZES
+    if args.max_size:
+        sizes = [s for s in sizes if s <= args.max_size]
+    only = args.only.split(",") if args.only else None
+    workloads = args.workloads.split(",") if args.workloads else None
+    for name in only or ():
+        if name not in BENCHMARKS:
+            parser.error(f"unknown benchmark '{name}'")
+    for name in workloads or ():
+        if name not in WORKLOADS:
+            parser.error(f"unknown workload '{name}'")
+
+    print(f"omnidirectional_math benchmarks (seed={args.seed})")
+    results = run_benchmarks(sizes, workloads, only, args.seed, args.repeat, log=print)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({"meta": metadata(args.seed), "results": results}, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        print(f"Baseline written to {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline["results"], args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+            for key, before, after, ratio in regressions:
+                print(f"  {key:<32} {before * 1e3:.3f} ms -> {after * 1e3:.3f} ms  (x{ratio})")
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%} against {args.compare}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""
+Tests for benchmarks/bench_omnidirectional_math.py — the performance harness.
+
+Covers:
+- Workload generation: determinism, length, operator distributions
+- run_benchmarks(): result keys, size ceilings, benchmark selection
+- compare(): regression detection against a baseline
+- main(): saving and comparing JSON baselines
+"""
+
+import sys
+import os
+import json
+
+# Add the benchmarks directory so we can import the harness
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+
+import random
+import pytest
+from bench_omnidirectional_math import (
+    BENCHMARKS,
+    WORKLOADS,
+    generate_operations,
+    generate_notation,
+    run_benchmarks,
+    compare,
+    main,
+)
+from omnidirectional_math import parse
+
+
+# =============================================================================
+#                           WORKLOAD GENERATION
+# =============================================================================
+
+class TestWorkloads:
+    """Tests for seeded workload generation."""
+
+    def test_same_seed_same_notation(self):
+        assert generate_notation(500, 7, "mixed") == generate_notation(500, 7, "mixed")
+
+    def test_different_seed_different_notation(self):
+        assert generate_notation(500, 7, "mixed") != generate_notation(500, 8, "mixed")
+
+    def test_generates_requested_length(self):
+        seq = parse(generate_notation(1000, 0, "mixed"))
+        assert len(seq.operations) == 1000
+
+    def test_mixed_workload_has_no_intersections(self):
+        ops = generate_operations(2000, random.Random(1), WORKLOADS["mixed"])
+        assert '⊠' not in ops
+
+    def test_intersection_workload_is_intersection_heavy(self):
+        seq = parse(generate_notation(2000, 0, "intersection"))
+        marks = sum(1 for op in seq.operations if op.name == 'intersection')
+        assert marks > 2000 * 0.15
+
+
+# =============================================================================
+#                            RUN AND COMPARE
+# =============================================================================
+
+class TestRunBenchmarks:
+    """Tests for run_benchmarks() and compare()."""
+
+    def test_all_benchmarks_reported(self):
+        results = run_benchmarks(sizes=[10], workloads=["mixed"], repeat=1)
+        assert set(results) == {f"{name}/mixed/10" for name in BENCHMARKS}
+
+    def test_result_fields(self):
+        results = run_benchmarks(sizes=[10], workloads=["mixed"], only=["parse"], repeat=1)
+        entry = results["parse/mixed/10"]
+        assert entry["seconds"] >= 0
+        assert entry["ns_per_op"] >= 0
+
+    def test_workload_size_ceiling(self):
+        results = run_benchmarks(sizes=[100_000], workloads=["intersection"], only=["parse"], repeat=1)
+        assert results == {}
+
+    def test_compare_flags_regression(self):
+        baseline = {"parse/mixed/10": {"seconds": 1.0, "ns_per_op": 1.0}}
+        current = {"parse/mixed/10": {"seconds": 1.5, "ns_per_op": 1.5}}
+        assert compare(current, baseline, threshold=0.25) == [("parse/mixed/10", 1.0, 1.5, 1.5)]
+
+    def test_compare_within_threshold(self):
+        baseline = {"parse/mixed/10": {"seconds": 1.0, "ns_per_op": 1.0}}
+        current = {"parse/mixed/10": {"seconds": 1.2, "ns_per_op": 1.2}}
+        assert compare(current, baseline, threshold=0.25) == []
+
+    def test_compare_ignores_missing_cases(self):
+        current = {"parse/mixed/10": {"seconds": 1.0, "ns_per_op": 1.0}}
+        assert compare(current, {}, threshold=0.0) == []
+
+    def test_main_save_then_compare(self, tmp_path, capsys):
+        path = tmp_path / "baseline.json"
+        args = ["--sizes", "10", "--workloads", "mixed", "--only", "notation", "--repeat", "1"]
+        assert main(args + ["--save", str(path)]) == 0
+        saved = json.loads(path.read_text(encoding="utf-8"))
+        assert "notation/mixed/10" in saved["results"]
+        assert saved["meta"]["seed"] == 0
+        assert main(args + ["--compare", str(path), "--threshold", "1000"]) == 0
+
+    def test_main_reports_regression(self, tmp_path, capsys):
+        path = tmp_path / "baseline.json"
+        path.write_text(json.dumps({
+            "meta": {},
+            "results": {"notation/mixed/10": {"seconds": 1e-12, "ns_per_op": 0.0}},
+        }), encoding="utf-8")
+        args = ["--sizes", "10", "--workloads", "mixed", "--only", "notation", "--repeat", "1"]
+        assert main(args + ["--compare", str(path)]) == 1
+        assert "regression" in capsys.readouterr().out
@@ -6,14 +6,20 @@ Covers:
 - Dimension: creation, enter/leave, population
 - ResonanceField: creation, harmony, add/remove beings, activation
 - Message: creation, encoding, metadata
-- CongoBeing: creation, resonation, inbox, connections
+- CongoBeing: creation, resonation, inbox, cursor paging and acknowledgement, connections
 - CongoNetwork: dimensions, registration, messaging, broadcasting,
   resonance discovery, field formation, dimensional travel, status
 - Integration: full conversation flows across dimensions
+- HarmonicMatrix: vectorized one-vs-all resonance, index upkeep, pure-Python fallback
+- compatibility_matrix: tiled all-pairs scores, sparse edges, memory-mapped output
+- ResonanceIndex: VP-tree range queries, nearest_resonant(k), index upkeep
+- ResonanceLSH: approximate find_resonant(), recall against the exact search
+- MessageLog: retention by count, age and bytes, counters exact after eviction
 """
 
 import sys
 import os
+import random
 
 # Add the parent directory so we can import congo
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "Python Files"))
@@ -27,7 +33,12 @@ from congo import (
     CongoBeing,
     CongoNetwork,
     CONGO,
+    HarmonicMatrix,
+    ResonanceIndex,
+    ResonanceLSH,
+    MessageLog,
 )
+import congo
 
 
 # =============================================================================
@@ -127,6 +138,35 @@ class TestResonanceFrequency:
         freq = ResonanceFrequency((0.1, 0.2))
         assert isinstance(freq.harmonics, list)
 
+    def test_harmonics_edits_are_validated(self):
+        freq = ResonanceFrequency([0.1, 0.2])
+        freq.harmonics.append(0.3)
+        freq.harmonics[0] = 0.4
+        assert freq.harmonics == [0.4, 0.2, 0.3]
+        assert freq.upper_bound(ResonanceFrequency([0.4, 0.2, 0.3])) == pytest.approx(1.0)
+        with pytest.raises(ValueError):
+            freq.harmonics.append(2.0)
+        with pytest.raises(ValueError):
+            freq.harmonics.clear()
+        with pytest.raises(ValueError):
+            freq.harmonics = []
+        assert freq.harmonics == [0.4, 0.2, 0.3]  # rejected edits change nothing
+
+    def test_upper_bound_never_below_compatibility(self):
+        rng = random.Random(11)
+        for _ in range(500):
+            a = ResonanceFrequency([rng.random() for _ in range(rng.randint(1, 6))])
+            b = ResonanceFrequency([rng.random() for _ in range(rng.randint(1, 6))])
+            assert a.upper_bound(b) >= a.compatibility(b) - 0.5e-4
+
+    def test_upper_bound_length_factor_and_sums(self):
+        short = ResonanceFrequency([0.5, 0.5])
+        long = ResonanceFrequency([0.5, 0.5, 0.5, 0.5])
+        assert short.upper_bound(long) == 0.5
+        low = ResonanceFrequency([0.1, 0.2])
+        high = ResonanceFrequency([0.9, 0.8])
+        assert low.upper_bound(high) == pytest.approx(low.compatibility(high))
+
 
 # =============================================================================
 #                            DIMENSION TESTS
@@ -191,6 +231,26 @@ class TestDimension:
         assert "Test" in repr(dim)
         assert "freq=1.0" in repr(dim)
 
+    def test_members_keep_arrival_order(self):
+        dim = Dimension("Test", 1.0)
+        a, b, c = CongoBeing("A", [0.5]), CongoBeing("B", [0.5]), CongoBeing("C", [0.5])
+        for being in (a, b, c):
+            dim.enter(being)
+        dim.leave(b)
+        dim.enter(b)
+        assert list(dim.beings) == [a, c, b]
+
+    def test_mass_migration(self):
+        network = CongoNetwork()
+        for i in range(3000):
+            network.register(f"B{i}", [0.5])
+        for i in range(0, 3000, 2):
+            network.move_being(f"B{i}", "Astral")
+        assert network.dimensions["Physical"].population == 1500
+        assert [b.name for b in network.dimensions["Astral"].beings] == [f"B{i}" for i in range(0, 3000, 2)]
+        result = network.broadcast("B1", "Hi")
+        assert result["recipients"] == [f"B{i}" for i in range(3, 3000, 2)]
+
 
 # =============================================================================
 #                         RESONANCE FIELD TESTS
@@ -286,6 +346,59 @@ class TestResonanceField:
         assert "Alpha" in r
         assert "Beta" in r
 
+    @staticmethod
+    def _full_harmony(beings):
+        """The all-pairs average add_being() and remove_being() used to recompute."""
+        scores = [
+            a.frequency.compatibility(b.frequency)
+            for i, a in enumerate(beings) for b in beings[i + 1:]
+        ]
+        return sum(scores) / len(scores)
+
+    def test_incremental_harmony_matches_recount(self):
+        rng = random.Random(3)
+        pool = [CongoBeing(f"B{i}", [round(rng.random(), 2) for _ in range(rng.choice([1, 3, 4]))]) for i in range(40)]
+        field = ResonanceField(pool[:5])
+        for being in pool[5:25]:
+            field.add_being(being)
+            assert field.harmony == pytest.approx(self._full_harmony(field.beings), abs=1e-4)
+        for being in pool[:18]:
+            field.remove_being(being)
+            assert field.harmony == pytest.approx(self._full_harmony(field.beings), abs=1e-4)
+
+    def test_frequency_change_counted_on_next_join(self):
+        a = CongoBeing("A", [0.5])
+        b = CongoBeing("B", [0.5])
+        field = ResonanceField([a, b])
+        a.frequency = ResonanceFrequency([0.1])
+        field.add_being(CongoBeing("C", [0.5]))
+        assert field.harmony == pytest.approx(self._full_harmony(field.beings), abs=1e-4)
+        assert field.harmony == 0.7333
+
+    def test_in_place_edits_counted_on_next_join(self):
+        a = CongoBeing("A", [0.5])
+        b = CongoBeing("B", [0.5])
+        field = ResonanceField([a, b])
+        a.frequency.harmonics[0] = 0.1
+        b.frequency.harmonics[0] = 0.3
+        field.add_being(CongoBeing("C", [0.5]))
+        assert field.harmony == pytest.approx(self._full_harmony(field.beings), abs=1e-4)
+        b.frequency.harmonics[0] = 0.5
+        field.remove_being(a)
+        assert field.harmony == 1.0
+
+    def test_refill_after_emptying(self):
+        a = CongoBeing("A", [0.5])
+        b = CongoBeing("B", [0.7])
+        field = ResonanceField([a, b])
+        field.remove_being(a)
+        field.remove_being(b)
+        field.add_being(a)
+        assert field.harmony == 0.0
+        field.add_being(b)
+        assert field.harmony == 0.8
+        assert field.active is True
+
 
 # =============================================================================
 #                             MESSAGE TESTS
@@ -430,6 +543,87 @@ class TestCongoBeing:
         being.clear_inbox()
         assert being.unread_count == 0
 
+    @staticmethod
+    def _filled(count):
+        being = CongoBeing("Tester", [0.5])
+        sender = CongoBeing("Sender", [0.5])
+        for i in range(count):
+            being.receive(Message(sender, f"msg{i}"))
+        return being
+
+    def test_read_since_pages(self):
+        being = self._filled(5)
+        page = being.read_since(0, limit=2)
+        assert [m.content for m in page["messages"]] == ["msg0", "msg1"]
+        page = being.read_since(page["cursor"], limit=2)
+        assert [m.content for m in page["messages"]] == ["msg2", "msg3"]
+        page = being.read_since(page["cursor"])
+        assert [m.content for m in page["messages"]] == ["msg4"]
+        assert page["cursor"] == 5
+        assert being.read_since(5)["messages"] == []
+        assert being.unread_count == 5  # reading does not acknowledge
+
+    def test_ack_moves_watermark(self):
+        being = self._filled(4)
+        assert being.ack(3) == 1
+        assert being.read_cursor == 3
+        assert [m.content for m in being.read_inbox()] == ["msg3"]
+        assert [m.content for m in being.read_since()["messages"]] == ["msg3"]
+        assert [m.content for m in being.read_since(0)["messages"]] == ["msg3"]
+        being.ack(1)  # never moves backwards
+        assert being.read_cursor == 3
+
+    def test_invalid_cursor_raises(self):
+        being = self._filled(2)
+        for cursor in [-1, 3]:
+            with pytest.raises(ValueError, match="outside the inbox"):
+                being.read_since(cursor)
+            with pytest.raises(ValueError, match="outside the inbox"):
+                being.ack(cursor)
+
+    def test_cursors_survive_compaction(self):
+        being = self._filled(3000)
+        being.ack(2500)
+        assert len(being._inbox) == 500
+        page = being.read_since(2998)
+        assert [m.content for m in page["messages"]] == ["msg2998", "msg2999"]
+        assert page["cursor"] == 3000
+        assert being.unread_count == 500
+
+    def test_inbox_is_live_view(self):
+        being = self._filled(3)
+        inbox = being.inbox
+        being.ack(1)
+        being.receive(Message(CongoBeing("Late", [0.5]), "late"))
+        assert [m.content for m in inbox] == ["msg1", "msg2", "late"]
+        assert inbox[-1].content == "late"
+        assert [m.content for m in inbox[:2]] == ["msg1", "msg2"]
+        assert len(inbox) == being.unread_count == 3
+
+    def test_inbox_list_mutations_reach_the_being(self):
+        being = self._filled(2)
+        being.inbox.append(Message(CongoBeing("X", [0.5]), "appended"))
+        assert being.unread_count == 3
+        assert being.read_since(2)["messages"][0].content == "appended"
+        being.inbox.clear()
+        assert being.unread_count == 0 and being.read_cursor == 3
+
+    def test_read_inbox_repeats_until_acknowledged(self):
+        being = self._filled(2)
+        assert len(being.read_inbox()) == 2
+        assert len(being.read_inbox()) == 2
+        being.ack(1)
+        assert [m.content for m in being.read_inbox()] == ["msg1"]
+
+    def test_clear_inbox_keeps_cursor_numbering(self):
+        being = self._filled(3)
+        being.clear_inbox()
+        assert being.read_cursor == 3
+        being.receive(Message(CongoBeing("Late", [0.5]), "late"))
+        page = being.read_since()
+        assert [m.content for m in page["messages"]] == ["late"]
+        assert page["cursor"] == 4
+
     def test_repr_unanchored(self):
         being = CongoBeing("Tester", [0.5])
         assert "unanchored" in repr(being)
@@ -871,3 +1065,502 @@ class TestIntegration:
 
         status = network.network_status()
         assert status["total_beings"] == 10
+
+
+# =============================================================================
+#                          HARMONIC MATRIX TESTS
+# =============================================================================
+
+def _random_network(count, seed=7):
+    """A network of beings with mixed harmonic depths and precisions."""
+    rng = random.Random(seed)
+    network = CongoNetwork()
+    for i in range(count):
+        depth = rng.choice([1, 2, 3, 4, 4, 6])
+        harmonics = [round(rng.random(), rng.choice([1, 2, 4])) for _ in range(depth)]
+        network.register(f"Being_{i}", harmonics, rng.choice(["HOME", "Physical", "Astral"]))
+    return network
+
+
+def _banded_network(count, levels=(0.05, 0.85, 0.9, 0.95), seed=5):
+    """A network whose beings sit near a few harmonic levels, so most fail a query from another band."""
+    rng = random.Random(seed)
+    network = CongoNetwork()
+    for i in range(count):
+        level = rng.choice(levels)
+        harmonics = [round(min(1.0, max(0.0, level + rng.gauss(0, 0.04))), 4) for _ in range(rng.randint(2, 6))]
+        network.register(f"Being_{i}", harmonics, "HOME")
+    network.register("Query", [0.05] * 4, "HOME")
+    return network
+
+
+def _scan(network, name, threshold):
+    """The plain Python scan find_resonant used to run."""
+    being = network.beings[name]
+    found = [
+        {"name": other.name,
+         "compatibility": being.frequency.compatibility(other.frequency),
+         "dimension": other.dimension.name if other.dimension else None}
+        for other in network.beings.values() if other is not being
+    ]
+    found = [r for r in found if r["compatibility"] >= threshold]
+    return sorted(found, key=lambda r: r["compatibility"], reverse=True)
+
+
+class TestHarmonicMatrix:
+    """Tests for the NumPy harmonic matrix behind resonance scans."""
+
+    THRESHOLDS = [0.0, 0.3, 0.6, 0.75, 0.8, 0.9, 1.0]
+
+    @pytest.fixture(autouse=True)
+    def needs_numpy(self):
+        pytest.importorskip("numpy")
+
+    def test_network_uses_matrix(self):
+        network = _random_network(10)
+        assert isinstance(network._matrix, HarmonicMatrix)
+        assert len(network._matrix) == 10
+
+    def test_find_resonant_matches_scan(self):
+        network = _random_network(400)
+        for name in ["Being_0", "Being_17", "Being_250"]:
+            for threshold in self.THRESHOLDS:
+                assert network.find_resonant(name, threshold) == _scan(network, name, threshold)
+
+    def test_broadcast_resonant_matches_scan(self):
+        network = _random_network(300)
+        expected = [r["name"] for r in _scan(network, "Being_3", 0.3)]
+        result = network.broadcast("Being_3", "Hello", scope="resonant")
+        assert sorted(result["recipients"]) == sorted(expected)
+        order = list(network.beings)
+        assert result["recipients"] == sorted(result["recipients"], key=order.index)
+
+    def test_length_factor_applied(self):
+        network = CongoNetwork()
+        network.register("Short", [0.5, 0.5])
+        network.register("Long", [0.5, 0.5, 0.5, 0.5])
+        result = network.find_resonant("Short", threshold=0.0)
+        assert result[0]["compatibility"] == 0.5
+
+    def test_ties_keep_registration_order(self):
+        network = CongoNetwork()
+        network.register("Seeker", [0.5, 0.5])
+        for name, harmonics in [("C", [0.5, 0.5, 0.5]), ("A", [0.6, 0.6]), ("B", [0.4, 0.4])]:
+            network.register(name, harmonics)
+        names = [r["name"] for r in network.find_resonant("Seeker", 0.0)]
+        assert names == ["A", "B", "C"]
+
+    def test_frequency_change_updates_index(self):
+        network = _random_network(50)
+        network.beings["Being_5"].frequency = ResonanceFrequency([0.42] * 9)
+        network.beings["Being_6"].frequency = ResonanceFrequency([0.42] * 9)
+        assert [r["name"] for r in network.find_resonant("Being_5", 0.99)] == ["Being_6"]
+        assert network.find_resonant("Being_0", 0.5) == _scan(network, "Being_0", 0.5)
+
+    def test_remove_keeps_rows_consistent(self):
+        matrix = HarmonicMatrix()
+        beings = [CongoBeing(f"B{i}", [0.1 * i, 0.5]) for i in range(5)]
+        for order, being in enumerate(beings):
+            matrix.add(being, order)
+        matrix.remove(beings[1])
+        assert len(matrix) == 4
+        query = ResonanceFrequency([0.0, 0.5])
+        assert matrix.resonant(query, 0.0) == [beings[0], beings[2], beings[3], beings[4]]
+
+    def test_grows_past_initial_capacity(self):
+        network = _random_network(100)
+        assert network.find_resonant("Being_99", 0.5) == _scan(network, "Being_99", 0.5)
+
+    def test_pure_python_fallback(self, monkeypatch):
+        monkeypatch.setattr(congo, "np", None)
+        network = _random_network(120)
+        assert network._matrix is None
+        assert network.find_resonant("Being_1", 0.6) == _scan(network, "Being_1", 0.6)
+        result = network.broadcast("Being_1", "Hi", scope="resonant")
+        assert sorted(result["recipients"]) == sorted(r["name"] for r in _scan(network, "Being_1", 0.3))
+
+    def test_pruned_scan_matches_scan(self, monkeypatch):
+        monkeypatch.setattr(congo, "np", None)
+        for network, names in [(_random_network(300), ["Being_0", "Being_42"]), (_banded_network(1500), ["Query"])]:
+            for name in names:
+                for threshold in [0.3, 0.5, 0.6, 0.7, 0.75]:
+                    assert network.find_resonant(name, threshold) == _scan(network, name, threshold)
+
+    def test_matrix_bound_pruning_matches_scan(self):
+        network = _banded_network(2000)
+        network.register("Deep", [0.05] * 9, "HOME")  # longer than every group: prefix sums
+        for name in ["Query", "Deep", "Being_3"]:
+            for threshold in [0.3, 0.5, 0.7]:
+                assert network.find_resonant(name, threshold) == _scan(network, name, threshold)
+        result = network.broadcast("Query", "Hi", scope="resonant")
+        assert sorted(result["recipients"]) == sorted(r["name"] for r in _scan(network, "Query", 0.3))
+
+    def test_default_threshold_prunes_when_most_fail(self, monkeypatch):
+        monkeypatch.setattr(congo, "np", None)
+        network = _banded_network(3000)
+        calls = []
+        original = ResonanceFrequency.compatibility
+        monkeypatch.setattr(ResonanceFrequency, "compatibility", lambda a, b: calls.append(1) or original(a, b))
+        found = network._resonant_beings(network.beings["Query"], 0.3)
+        assert len(found) < 1000
+        assert len(calls) < 1500  # beings in the far bands never reach compatibility()
+
+
+# =============================================================================
+#                        COMPATIBILITY MATRIX TESTS
+# =============================================================================
+
+class TestCompatibilityMatrix:
+    """Tests for CongoNetwork.compatibility_matrix()."""
+
+    @pytest.fixture
+    def network(self):
+        return _random_network(90, seed=11)
+
+    @staticmethod
+    def _exact_edges(network, threshold):
+        beings = list(network.beings.values())
+        return [
+            (a.name, b.name, a.frequency.compatibility(b.frequency))
+            for i, a in enumerate(beings) for b in beings[i + 1:]
+            if a.frequency.compatibility(b.frequency) >= threshold
+        ]
+
+    def test_dense_matches_compatibility(self, network):
+        np = pytest.importorskip("numpy")
+        beings = list(network.beings.values())
+        matrix = network.compatibility_matrix(block_size=16)
+        expected = np.array([[a.frequency.compatibility(b.frequency) for b in beings] for a in beings])
+        assert matrix.shape == (90, 90)
+        assert (matrix == expected).all()
+
+    def test_block_size_does_not_change_result(self, network):
+        np = pytest.importorskip("numpy")
+        small = network.compatibility_matrix(block_size=7)
+        large = network.compatibility_matrix(block_size=1000)
+        assert np.array_equal(small, large)
+
+    def test_edge_list(self, network):
+        pytest.importorskip("numpy")
+        edges = network.compatibility_matrix(block_size=20, threshold=0.8)
+        assert edges == self._exact_edges(network, 0.8)
+        assert all(a != b for a, b, _ in edges)
+
+    def test_memory_mapped_output(self, network, tmp_path):
+        np = pytest.importorskip("numpy")
+        path = str(tmp_path / "pairs.npy")
+        matrix = network.compatibility_matrix(block_size=32, path=path)
+        stored = np.load(path, mmap_mode="r")
+        assert np.array_equal(stored, matrix)
+        assert np.array_equal(stored, stored.T)
+
+    def test_edge_list_without_numpy(self, network, monkeypatch):
+        monkeypatch.setattr(congo, "np", None)
+        assert network.compatibility_matrix(threshold=0.8) == self._exact_edges(network, 0.8)
+        with pytest.raises(RuntimeError):
+            network.compatibility_matrix()
+
+    def test_block_size_validation(self, network):
+        with pytest.raises(ValueError):
+            network.compatibility_matrix(block_size=0)
+
+
+# =============================================================================
+#                          RESONANCE INDEX TESTS
+# =============================================================================
+
+class TestResonanceIndex:
+    """Tests for the VP-tree resonance index and nearest_resonant()."""
+
+    THRESHOLDS = [0.8, 0.85, 0.9, 0.95, 1.0]
+
+    def test_network_keeps_index(self):
+        network = _random_network(10)
+        assert isinstance(network._index, ResonanceIndex)
+        assert len(network._index) == 10
+
+    def test_range_query_matches_scan(self):
+        network = _random_network(400)
+        for name in ["Being_0", "Being_17", "Being_250"]:
+            being = network.beings[name]
+            for threshold in [0.0, 0.5] + self.THRESHOLDS:
+                expected = [
+                    other for other in network.beings.values()
+                    if being.frequency.compatibility(other.frequency) >= threshold
+                ]
+                assert network._index.resonant(being.frequency, threshold) == expected
+
+    def test_find_resonant_matches_scan(self, monkeypatch):
+        monkeypatch.setattr(congo, "np", None)
+        network = _random_network(400)
+        for name in ["Being_2", "Being_99"]:
+            for threshold in self.THRESHOLDS:
+                assert network.find_resonant(name, threshold) == _scan(network, name, threshold)
+
+    def test_nearest_matches_brute_force(self):
+        network = _random_network(400)
+        for name in ["Being_0", "Being_31", "Being_399"]:
+            for k in [1, 5, 25]:
+                expected = _scan(network, name, -1.0)[:k]
+                assert network.nearest_resonant(name, k) == expected
+
+    def test_nearest_ties_keep_registration_order(self):
+        network = CongoNetwork()
+        network.register("Seeker", [0.5, 0.5])
+        for name in ["C", "A", "B", "D"]:
+            network.register(name, [0.6, 0.6])
+        names = [r["name"] for r in network.nearest_resonant("Seeker", 3)]
+        assert names == ["C", "A", "B"]
+
+    def test_nearest_small_network(self):
+        network = CongoNetwork()
+        network.register("Alone", [0.5])
+        assert network.nearest_resonant("Alone", 5) == []
+        network.register("Other", [0.4])
+        assert [r["name"] for r in network.nearest_resonant("Alone", 5)] == ["Other"]
+        assert network.nearest_resonant("Alone", 0) == []
+
+    def test_nearest_unknown_being(self):
+        network = CongoNetwork()
+        with pytest.raises(ValueError):
+            network.nearest_resonant("Nobody")
+
+    def test_frequency_change_updates_index(self):
+        network = _random_network(300)
+        network.find_resonant("Being_0", 0.9)  # build the trees first
+        for i in range(60):
+            network.beings[f"Being_{i}"].frequency = ResonanceFrequency([0.42] * 4)
+        assert network._index.resonant(ResonanceFrequency([0.42] * 4), 1.0) == [
+            network.beings[f"Being_{i}"] for i in range(60)
+        ]
+        assert network.nearest_resonant("Being_100", 10) == _scan(network, "Being_100", -1.0)[:10]
+
+    @pytest.mark.parametrize("numpy", [True, False])
+    def test_in_place_edits_update_indexes(self, monkeypatch, numpy):
+        if numpy:
+            pytest.importorskip("numpy")
+        else:
+            monkeypatch.setattr(congo, "np", None)
+        network = _random_network(200)
+        network.register("A", [0.8, 0.8])
+        b = network.register("B", [0.1, 0.1])
+        for threshold in [0.6, 0.9]:
+            network.find_resonant("A", threshold, approximate=threshold >= 0.9)  # build every index
+        b.frequency.harmonics[:] = [0.8, 0.8]
+        for threshold in [0.3, 0.6, 0.9, 1.0]:
+            assert network.find_resonant("A", threshold) == _scan(network, "A", threshold)
+            assert "B" in [r["name"] for r in network.find_resonant("A", threshold)]
+        assert "B" in [r["name"] for r in network.find_resonant("A", 1.0, approximate=True)]
+        b.frequency.harmonics.append(0.5)
+        assert network.find_resonant("A", 0.6) == _scan(network, "A", 0.6)
+        assert network.nearest_resonant("A", 5) == _scan(network, "A", -1.0)[:5]
+
+    def test_pure_python_nearest(self, monkeypatch):
+        monkeypatch.setattr(congo, "np", None)
+        network = _random_network(150)
+        assert network._matrix is None
+        assert network.nearest_resonant("Being_8", 7) == _scan(network, "Being_8", -1.0)[:7]
+
+
+# =============================================================================
+#                           RESONANCE LSH TESTS
+# =============================================================================
+
+class TestResonanceLSH:
+    """Tests for approximate find_resonant() through ResonanceLSH."""
+
+    def test_lsh_built_on_first_approximate_search(self):
+        network = _random_network(10)
+        assert network._lsh is None
+        network.find_resonant("Being_0", 0.9)
+        assert network._lsh is None
+        network.find_resonant("Being_0", 0.9, approximate=True)
+        assert isinstance(network._lsh, ResonanceLSH)
+        assert len(network._lsh) == 10
+        network.register("Late", [0.5, 0.5])
+        assert len(network._lsh) == 11
+
+    def test_falls_back_when_hashing_cannot_prune(self):
+        network = _random_network(300)
+        network.find_resonant("Being_0", 0.9, approximate=True)
+        frequency = network.beings["Being_0"].frequency
+        assert network._lsh.resonant(frequency, 0.3) is None
+        assert network._lsh.resonant(frequency, 0.0) is None
+        assert network.find_resonant("Being_0", 0.3, approximate=True) == _scan(network, "Being_0", 0.3)
+
+    def test_table_families_are_capped(self):
+        rng = random.Random(5)
+        lsh = ResonanceLSH(max_families=2)
+        beings = [CongoBeing(f"B{i}", [rng.random() for _ in range(2 + i % 3)]) for i in range(900)]
+        for order, being in enumerate(beings):
+            lsh.add(being, order)
+        for being in beings[:3]:
+            found = lsh.resonant(being.frequency, 0.98)
+            assert being in found
+            assert all(being.frequency.compatibility(b.frequency) >= 0.98 for b in found)
+        assert len(lsh._families) == 2
+
+    def test_results_are_genuine(self):
+        network = _random_network(400)
+        for threshold in [0.5, 0.8, 0.9]:
+            exact = {r["name"]: r for r in network.find_resonant("Being_4", threshold)}
+            approximate = network.find_resonant("Being_4", threshold, approximate=True)
+            assert all(exact[r["name"]] == r for r in approximate)
+            assert approximate == sorted(approximate, key=lambda r: r["compatibility"], reverse=True)
+
+    def test_recall_meets_target(self):
+        network = _random_network(600)
+        for threshold in [0.7, 0.9]:
+            report = network.measure_recall(threshold, recall=0.9, samples=40)
+            assert report["recall"] >= 0.85
+            assert report["approximate_matches"] <= report["exact_matches"]
+
+    def test_non_positive_threshold_is_exact(self):
+        network = _random_network(100)
+        assert network.find_resonant("Being_9", 0.0, approximate=True) == _scan(network, "Being_9", 0.0)
+
+    def test_identical_frequencies_always_found(self):
+        network = _random_network(200)
+        network.register("Twin_A", [0.31, 0.62, 0.93])
+        network.register("Twin_B", [0.31, 0.62, 0.93])
+        result = network.find_resonant("Twin_A", 1.0, approximate=True)
+        assert [r["name"] for r in result] == ["Twin_B"]
+
+    def test_frequency_change_rehashes(self):
+        network = _random_network(200)
+        network.find_resonant("Being_0", 0.9, approximate=True)  # build the tables first
+        network.beings["Being_5"].frequency = ResonanceFrequency([0.77] * 5)
+        network.beings["Being_6"].frequency = ResonanceFrequency([0.77] * 5)
+        result = network.find_resonant("Being_5", 1.0, approximate=True)
+        assert [r["name"] for r in result] == ["Being_6"]
+
+    def test_measure_recall_report(self):
+        network = _random_network(50)
+        report = network.measure_recall(0.8, recall=0.9, samples=500)
+        assert report["queries"] == 50
+        assert report["target"] == 0.9
+        assert 0.0 <= report["recall"] <= 1.0
+        assert report["exact_seconds"] >= 0 and report["approximate_seconds"] >= 0
+
+    def test_recall_validation(self):
+        network = _random_network(10)
+        for recall in [0.0, 1.0, 1.5]:
+            with pytest.raises(ValueError):
+                network.find_resonant("Being_0", 0.8, approximate=True, recall=recall)
+
+
+# =============================================================================
+#                            MESSAGE LOG TESTS
+# =============================================================================
+
+class TestMessageLog:
+    """Tests for MessageLog retention and the counters network_status() reads."""
+
+    @staticmethod
+    def _messages(count, content="x"):
+        sender = CongoBeing("Sender", [0.5])
+        return [Message(sender, f"{content}{i}") for i in range(count)]
+
+    def test_unbounded_log_behaves_like_list(self):
+        log = MessageLog()
+        assert log == []
+        messages = self._messages(3)
+        for message in messages:
+            log.append(message)
+        assert log == messages
+        assert len(log) == 3 and log.total == 3 and log.evicted == 0
+        assert log[0] is messages[0] and log[-1] is messages[2]
+        assert log[1:] == messages[1:]
+
+    def test_count_cap_keeps_newest(self):
+        log = MessageLog(max_messages=3)
+        messages = self._messages(10)
+        for message in messages:
+            log.append(message)
+        assert list(log) == messages[-3:]
+        assert log.total == 10
+        assert log.evicted == 7
+
+    def test_byte_cap(self):
+        log = MessageLog(max_bytes=10)
+        for message in self._messages(4, content="abcd"):  # 5 bytes each
+            log.append(message)
+        assert [m.content for m in log] == ["abcd2", "abcd3"]
+        log.append(Message(CongoBeing("Loud", [0.5]), "x" * 50))
+        assert [m.content for m in log] == ["x" * 50]  # the newest is always kept
+        assert log.total == 5
+
+    def test_age_cap(self, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr(congo.time, "monotonic", lambda: now[0])
+        log = MessageLog(max_age=60)
+        old, new = self._messages(2)
+        log.append(old)
+        now[0] = 130.0
+        log.append(new)
+        now[0] = 170.0
+        log.compact()
+        assert list(log) == [new]
+        assert log.total == 2
+
+    def test_quiet_log_expires_on_read(self, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr(congo.time, "monotonic", lambda: now[0])
+        network = CongoNetwork(max_age=60)
+        network.register("Alice", [0.5, 0.5])
+        network.register("Bob", [0.5, 0.5])
+        network.send("Alice", "Bob", "Hello")
+        log = network.message_log
+        assert len(log) == 1
+        now[0] = 200.0  # nothing appended since
+        assert len(log) == 0 and list(log) == [] and log == []
+        assert log.evicted == 1 and log.total == 1
+        status = network.network_status()
+        assert status["total_messages"] == 1
+        assert status["retained_messages"] == 0
+        assert status["dimensions"]["Physical"]["retained"] == 0
+
+    def test_sizes_skipped_without_byte_cap(self):
+        log = MessageLog(max_messages=2)
+        for message in self._messages(3, content="abcd"):
+            log.append(message)
+        assert log._bytes == 0
+        assert all(size == 0 for _, size, _ in log._entries)
+
+    def test_status_counters_exact_after_eviction(self):
+        network = CongoNetwork(max_messages=2)
+        network.register("Alice", [0.5, 0.5])
+        network.register("Bob", [0.5, 0.5])
+        for i in range(5):
+            network.send("Alice", "Bob", f"Hello {i}")
+        network.broadcast("Alice", "All", scope="omniverse")
+        status = network.network_status()
+        assert status["total_messages"] == 6
+        assert status["dimensions"]["Physical"]["messages"] == 5
+        assert len(network.message_log) == 2
+        assert len(network.dimensions["Physical"].message_log) == 2
+        assert status["retained_messages"] == 2
+        assert status["dimensions"]["Physical"]["retained"] == 2
+
+    def test_added_dimensions_share_retention(self):
+        network = CongoNetwork(max_messages=1)
+        network.add_dimension("Ether", 4.0)
+        network.register("A", [0.5], "Ether")
+        network.register("B", [0.5], "Ether")
+        network.send("A", "B", "one")
+        network.send("A", "B", "two")
+        log = network.dimensions["Ether"].message_log
+        assert [m.content for m in log] == ["two"]
+        assert network.network_status()["dimensions"]["Ether"]["messages"] == 2
+
+    def test_limits_must_be_positive(self):
+        for limits in [{"max_messages": 0}, {"max_age": -1}, {"max_bytes": 0}]:
+            with pytest.raises(ValueError, match="must be positive"):
+                MessageLog(**limits)
+
+    def test_max_messages_must_be_an_int(self):
+        for value in [2.5, "10", True]:
+            with pytest.raises(TypeError, match="max_messages must be an int"):
+                MessageLog(max_messages=value)
+        with pytest.raises(TypeError, match="max_messages"):
+            CongoNetwork(max_messages=2.5)
@@ -12,10 +12,32 @@ Covers:
 - parse(): notation parsing, tokenization, error handling
 - compose(): multi-sequence composition
 - Integration: full journeys, round-trip reversals, void traversals
+- Exact angles: integer micro-degree accumulation, drift-free equality
+- Route compiler: to_function() code generation, caching, constant folding
+- Step streaming: iter_steps(), aiter_steps() cooperative yielding, aexecute()
+- Columnar trails: memory-mapped trail files, execute(trail=...), reopening
+- Prefix cache: trie resumption, LRU bounds, hit-depth statistics
+- Streaming render: describe_iter(), notation_iter(), cached fragments
+- Optimize: run folding, dead operations before void, barriers
+- Command line: batch engine actions, output formats, workers, report
+- Compiled sequences: compile(), power() by repeated squaring, composition
+- Repetition: (...)^N grouping, nesting, lazy evaluation without expansion
+- Journey table: columnar route summaries, mask filters, queries, range index
+- Interned trails: one stored copy per distinct state, deduplication stats
+- Delta trails: steps stored as changed fields, rebuilt on access
+- Route cache: persistent parsed/compiled routes, lazy lookups, version invalidation
+- Realm registry: integer realm IDs behind name-based Position and sequence APIs
+- Corpus statistics: streaming histograms, quantile digests, heavy hitters, rates
 """
 
 import sys
 import os
+import asyncio
+import io
+import csv
+import json
+import pickle
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 # Add the parent directory so we can import omnidirectional_math
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "Python Files"))
@@ -25,12 +47,30 @@ from omnidirectional_math import (
     OPERATORS,
     INVERSES,
     FLOW,
+    ANGLE_UNITS,
+    FULL_TURN,
+    OPCODES,
     Position,
     Operation,
     Step,
     TransformationSequence,
     parse,
     compose,
+    ColumnarTrail,
+    PrefixCache,
+    BINARY_HEADER,
+    EXECUTE_RECORD,
+    main,
+    CompiledSequence,
+    Repetition,
+    JourneyTable,
+    InternedTrail,
+    DeltaTrail,
+    RouteCache,
+    RealmRegistry,
+    REALMS,
+    CorpusStats,
+    MAX_GROUP_DEPTH,
 )
 
 
@@ -800,6 +840,18 @@ class TestParser:
         with pytest.raises(ValueError, match="Unclosed bracket"):
             parse("A ⟿ ⊕[3")
 
+    def test_parse_error_non_finite_parameter(self):
+        for notation in ["A ⟿ ⊕[inf]", "A ⟿ ⟲[nan]", "A ⟿ ⟲[-inf°]", "A ⟿ ⟳[1e308]"]:
+            with pytest.raises(ValueError, match="not a finite number"):
+                parse(notation)
+
+    def test_parse_error_groups_nested_too_deeply(self):
+        deepest = "(" * MAX_GROUP_DEPTH + "⊕[1]" + ")" * MAX_GROUP_DEPTH
+        assert parse(f"A ⟿ {deepest}").complexity == 1
+        for depth in [MAX_GROUP_DEPTH + 1, 5000]:
+            with pytest.raises(ValueError, match="nested too deeply"):
+                parse("A ⟿ " + "(" * depth + "⊕" + ")" * depth)
+
     def test_parse_whitespace_in_operators(self):
         seq = parse("A ⟿ ⊕ ⟲ ◬")
         assert len(seq.operations) == 3
@@ -989,3 +1041,1237 @@ class TestIntegration:
         assert trail[1].after.mode == "parallel"
         # After orthogonal + ascend, mode is orthogonal
         assert trail[3].after.mode == "orthogonal"
+
+
+# =============================================================================
+#                          EXACT ANGLE ARITHMETIC
+# =============================================================================
+
+class TestExactAngles:
+    """Angles accumulate on an exact integer grid, so long chains never drift."""
+
+    def test_angle_units_of_default_position(self):
+        assert Position().angle_units == 0
+
+    def test_angle_units_matches_degrees(self):
+        assert Position(angle=90.5).angle_units == 90_500_000
+
+    def test_full_turn_constant(self):
+        assert FULL_TURN == 360 * ANGLE_UNITS
+
+    def test_tenth_degree_steps_close_the_circle(self):
+        seq = TransformationSequence("A", [Operation('⟲', 'rotate_cw', 0.1)] * 3600)
+        final, _ = seq.execute()
+        assert final.angle == 0.0
+
+    def test_tenth_degree_steps_land_exactly(self):
+        seq = TransformationSequence("A", [Operation('⟲', 'rotate_cw', 0.1)] * 3)
+        final, _ = seq.execute()
+        assert final.angle == 0.3
+
+    def test_cw_then_ccw_returns_exactly(self):
+        ops = [Operation('⟲', 'rotate_cw', 33.3)] * 1000 + [Operation('⟳', 'rotate_ccw', 33.3)] * 1000
+        final, _ = TransformationSequence("A", ops).execute()
+        assert final.angle == 0.0
+
+    def test_equal_routes_give_equal_positions(self):
+        a, _ = parse("A ⟿ ⟲[0.1]⟲[0.2]").execute()
+        b, _ = parse("A ⟿ ⟲[0.3]").execute()
+        assert a == b
+
+    def test_angle_stays_a_float(self):
+        final, _ = parse("A ⟿ ⟲[90]").execute()
+        assert isinstance(final.angle, float)
+
+    def test_negative_parameter_wraps(self):
+        p = Operation('⟲', 'rotate_cw', -0.5).apply(Position())
+        assert p.angle == 359.5
+
+
+# =============================================================================
+#                            ROUTE COMPILER
+# =============================================================================
+
+class TestRouteCompiler:
+    """Tests for TransformationSequence.to_function()."""
+
+    ROUTES = [
+        "Earth ⟿ ⊕[3]⟲[90]◬⊠∿ ⟿ Celestial_Realm",
+        "Physical ⟿ ⊕[5]∅⊕[2] ⟿ Beyond",
+        "HOME ⟿ ⊕[1]◬⟲[45]∿⊕[2]◬⟲[45]⊠⊕[1]◬⇄ ⟿ Akashic",
+        "A ⟿ ∥⊕[1]⊥⊖[4]⟳[33.3]∿∿∿⊠∅⊠⟲[0.1]∞",
+        "A ⟿ ",
+    ]
+
+    def _run(self, seq, origin=None):
+        origin = origin or seq.origin
+        return Position(*seq.to_function()(*origin.fields()))
+
+    def test_matches_execute(self):
+        for notation in self.ROUTES:
+            seq = parse(notation)
+            final, _ = seq.execute()
+            assert self._run(seq) == final
+
+    def test_matches_execute_from_custom_origin(self):
+        origin = Position(realm="X", dimension=2, angle=10.25, polarity=-1,
+                          wave_state="collapsed", crossings=3, mode="parallel")
+        for notation in self.ROUTES:
+            seq = parse(notation)
+            seq.origin = origin
+            final, _ = seq.execute()
+            assert self._run(seq, origin) == final
+
+    def test_returns_tuple_of_fields(self):
+        fn = parse("A ⟿ ⊕[2] ⟿ B").to_function()
+        assert fn("A", 0, 0.0, 1, "expanded", 0, [], "direct") == \
+            ("B", 2, 0.0, 1, "expanded", 0, [], "direct")
+
+    def test_cached_by_notation(self):
+        a = parse("A ⟿ ⊕[2]⟲[90] ⟿ B").to_function()
+        b = parse("A ⟿ ⊕[2]⟲[90] ⟿ B").to_function()
+        assert a is b
+
+    def test_different_routes_compile_separately(self):
+        a = parse("A ⟿ ⊕[2] ⟿ B").to_function()
+        b = parse("A ⟿ ⊕[3] ⟿ B").to_function()
+        assert a is not b
+
+    def test_constants_are_folded(self):
+        fn = parse("A ⟿ " + "⊕[1]" * 500).to_function()
+        assert 500 in fn.__code__.co_consts
+        assert fn("A", 0, 0.0, 1, "expanded", 0, [], "direct")[1] == 500
+
+    def test_void_makes_fields_constant(self):
+        fn = parse("A ⟿ ⊕[9]⟲[45]⇄∅ ⟿ B").to_function()
+        result = fn("A", 4, 12.0, -1, "collapsed", 1, [], "direct")
+        assert result == ("B", 0, 0.0, 1, "expanded", 2, [], "direct")
+
+    def test_does_not_mutate_input_intersections(self):
+        marks = [{"dimension": 0, "angle": 0.0, "crossings": 0}]
+        parse("A ⟿ ⊠⊠").to_function()("A", 0, 0.0, 1, "expanded", 0, marks, "direct")
+        assert len(marks) == 1
+
+    def test_intersections_snapshot_mid_journey(self):
+        fn = parse("A ⟿ ⊕[1]⊠⟲[90]◬⊠").to_function()
+        result = fn("A", 0, 0.0, 1, "expanded", 0, [], "direct")
+        assert result[6] == [
+            {"dimension": 1, "angle": 0.0, "crossings": 0},
+            {"dimension": 1, "angle": 90.0, "crossings": 1},
+        ]
+
+
+# =============================================================================
+#                          STEP STREAMING (SYNC + ASYNC)
+# =============================================================================
+
+class TestStepStreaming:
+    """Tests for iter_steps(), aiter_steps() and aexecute()."""
+
+    ROUTE = "Earth ⟿ ⊕[3]⟲[90]◬⊠∞∿ ⟿ Celestial_Realm"
+
+    def test_iter_steps_matches_trail(self):
+        seq = parse(self.ROUTE)
+        _, trail = seq.execute()
+        assert list(seq.iter_steps()) == trail
+
+    def test_iter_steps_is_lazy(self):
+        seq = parse(self.ROUTE)
+        steps = seq.iter_steps()
+        first = next(steps)
+        assert first.operation.name == 'ascend'
+
+    def test_aiter_steps_matches_trail(self):
+        seq = parse(self.ROUTE)
+        _, trail = seq.execute()
+
+        async def collect():
+            return [step async for step in seq.aiter_steps(yield_every=2)]
+
+        assert asyncio.run(collect()) == trail
+
+    def test_aiter_steps_yields_to_event_loop(self):
+        seq = TransformationSequence("A", [Operation('⊕', 'ascend')] * 10)
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(len(ticks))
+                await asyncio.sleep(0)
+
+        async def main():
+            task = asyncio.create_task(ticker())
+            await asyncio.sleep(0)
+            before = len(ticks)
+            async for _ in seq.aiter_steps(yield_every=2):
+                pass
+            task.cancel()
+            return len(ticks) - before
+
+        assert asyncio.run(main()) >= 4
+
+    def test_aiter_steps_rejects_zero(self):
+        seq = parse(self.ROUTE)
+
+        async def consume():
+            async for _ in seq.aiter_steps(yield_every=0):
+                pass
+
+        with pytest.raises(ValueError):
+            asyncio.run(consume())
+
+    def test_aexecute_default_executor(self):
+        seq = parse(self.ROUTE)
+        final, trail = asyncio.run(seq.aexecute())
+        expected, expected_trail = seq.execute()
+        assert final == expected
+        assert trail == expected_trail
+
+    def test_aexecute_process_pool(self):
+        seq = parse(self.ROUTE)
+
+        async def main():
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                return await seq.aexecute(executor=pool)
+
+        final, trail = asyncio.run(main())
+        assert final == seq.execute()[0]
+        assert len(trail) == 5
+
+
+# =============================================================================
+#                         COLUMNAR TRAIL STORAGE
+# =============================================================================
+
+class TestColumnarTrail:
+    """Tests for the memory-mapped ColumnarTrail and execute(trail=...)."""
+
+    ROUTE = "Earth ⟿ ⊕[3]⟲[90.5]◬⊠∿⇄∅⟳∥⊖[2] ⟿ Celestial_Realm"
+
+    def test_opcodes_cover_all_operators(self):
+        assert sorted(OPCODES.values()) == list(range(12))
+        assert set(OPCODES) == set(OPERATORS.values())
+
+    def test_execute_into_trail_returns_same_final(self, tmp_path):
+        seq = parse(self.ROUTE)
+        with ColumnarTrail.create(tmp_path / "j.trail") as trail:
+            final, returned = seq.execute(trail=trail)
+            assert returned is trail
+            assert final == seq.execute()[0]
+
+    def test_rows_match_steps(self, tmp_path):
+        seq = parse(self.ROUTE)
+        _, steps = seq.execute()
+        with ColumnarTrail.create(tmp_path / "j.trail") as trail:
+            seq.execute(trail=trail)
+            assert len(trail) == len(steps)
+            for record, step in zip(trail, steps):
+                assert record.operation == step.operation.name
+                assert record.parameter == step.operation.parameter
+                assert record.dimension == step.after.dimension
+                assert record.angle == step.after.angle
+                assert record.polarity == step.after.polarity
+                assert record.wave_state == step.after.wave_state
+                assert record.crossings == step.after.crossings
+
+    def test_reopen_with_random_access(self, tmp_path):
+        path = tmp_path / "j.trail"
+        seq = parse(self.ROUTE)
+        with ColumnarTrail.create(path) as trail:
+            seq.execute(trail=trail)
+        with ColumnarTrail.open(path) as trail:
+            assert len(trail) == 10
+            assert trail[0].dimension == 3
+            assert trail[1].angle == 90.5
+            assert trail[-1].operation == 'descend'
+            assert trail[-1].dimension == -2
+
+    def test_grows_past_capacity(self, tmp_path):
+        seq = TransformationSequence("A", [Operation('⊕', 'ascend')] * 100)
+        with ColumnarTrail.create(tmp_path / "j.trail", capacity=3) as trail:
+            seq.execute(trail=trail)
+            assert trail.capacity >= 100
+            assert list(trail.column("dimension")) == list(range(1, 101))
+
+    def test_column_view_is_raw(self, tmp_path):
+        seq = parse("A ⟿ ⟲[0.5]⟲[0.25]")
+        with ColumnarTrail.create(tmp_path / "j.trail") as trail:
+            seq.execute(trail=trail)
+            assert list(trail.column("angle")) == [500_000, 750_000]
+
+    def test_live_column_view_blocks_growth_cleanly(self, tmp_path):
+        step = parse("A ⟿ ⊕").execute()[1][0]
+        with ColumnarTrail.create(tmp_path / "j.trail", capacity=2) as trail:
+            trail.append(step)
+            trail.append(step)
+            view = trail.column("dimension")
+            with pytest.raises(BufferError, match="release them first"):
+                trail.append(step)
+            assert len(trail) == 2 and trail[1].dimension == 1  # still usable
+            view.release()
+            trail.append(step)
+            assert len(trail) == 3
+
+    def test_close_with_live_column_view(self, tmp_path):
+        path = tmp_path / "j.trail"
+        with ColumnarTrail.create(path) as trail:
+            parse(self.ROUTE).execute(trail=trail)
+            view = trail.column("dimension")
+            tail = view[1:]  # derived views are not tracked, and still must not break close()
+        assert view[0] == 3 and tail[-1] == -2
+        with ColumnarTrail.open(path) as trail:
+            assert list(trail.column("dimension")) == list(view)
+
+    def test_read_only_rejects_append(self, tmp_path):
+        path = tmp_path / "j.trail"
+        seq = parse(self.ROUTE)
+        with ColumnarTrail.create(path) as trail:
+            seq.execute(trail=trail)
+        with ColumnarTrail.open(path) as trail:
+            with pytest.raises(ValueError):
+                trail.append(seq.execute()[1][0])
+
+    def test_index_out_of_range(self, tmp_path):
+        with ColumnarTrail.create(tmp_path / "j.trail") as trail:
+            with pytest.raises(IndexError):
+                trail[0]
+
+    def test_rejects_foreign_file(self, tmp_path):
+        path = tmp_path / "not.trail"
+        path.write_bytes(b"x" * 128)
+        with pytest.raises(ValueError):
+            ColumnarTrail.open(path)
+
+
+# =============================================================================
+#                           PREFIX STATE CACHE
+# =============================================================================
+
+class TestPrefixCache:
+    """Tests for the PrefixCache trie of intermediate positions."""
+
+    def test_state_key_is_hashable_and_exact(self):
+        a = Position(realm="A", intersections=[{"dimension": 1, "angle": 0.0, "crossings": 0}])
+        b = a.copy()
+        assert hash(a.state_key()) == hash(b.state_key())
+        b.dimension = 1
+        assert a.state_key() != b.state_key()
+
+    def test_matches_execute(self):
+        cache = PrefixCache()
+        for notation in ["Earth ⟿ ⊕[3]◬⟲[90]⊠ ⟿ Sky",
+                         "Earth ⟿ ⊕[3]◬⟲[45]∿ ⟿ Sea",
+                         "Earth ⟿ ⊕[3]◬ ⟿ Hill",
+                         "Earth ⟿ ⊕[3]◬⟲[90]⊠∅⊕[1]∞"]:
+            seq = parse(notation)
+            assert cache.execute(seq) == seq.execute()[0]
+
+    def test_first_lookup_is_a_miss(self):
+        cache = PrefixCache()
+        cache.execute(parse("Earth ⟿ ⊕[3]◬"))
+        stats = cache.stats()
+        assert stats["lookups"] == 1
+        assert stats["hits"] == 0
+        assert stats["misses"] == 1
+
+    def test_shared_prefix_resumes_deep(self):
+        cache = PrefixCache()
+        cache.execute(parse("Earth ⟿ ⊕[3]◬⟲[90]⊠"))
+        cache.execute(parse("Earth ⟿ ⊕[3]◬⟲[90]∿"))
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["mean_hit_depth"] == 3
+        assert stats["max_hit_depth"] == 3
+        assert stats["depth_histogram"] == {4: 1}
+
+    def test_different_origin_does_not_share(self):
+        cache = PrefixCache()
+        cache.execute(parse("Earth ⟿ ⊕[3]◬"))
+        cache.execute(parse("Mars ⟿ ⊕[3]◬"))
+        assert cache.stats()["hits"] == 0
+
+    def test_nodes_are_bounded(self):
+        cache = PrefixCache(max_nodes=10)
+        for n in range(1, 30):
+            seq = TransformationSequence("A", [Operation('⊕', 'ascend', n)] * 5)
+            assert cache.execute(seq).dimension == 5 * n
+        assert len(cache) <= 10
+        assert cache.stats()["evictions"] > 0
+
+    def test_eviction_drops_least_recent_route(self):
+        cache = PrefixCache(max_nodes=6)
+        hot, cold = parse("A ⟿ ⊕⊕⊕"), parse("B ⟿ ⊕")
+        cache.execute(hot)
+        cache.execute(cold)
+        cache.execute(hot)
+        cache.execute(parse("C ⟿ ⊕"))
+        hits = cache.stats()["hits"]
+        cache.execute(hot)
+        assert cache.stats()["hits"] == hits + 1
+        cache.execute(cold)
+        assert cache.stats()["hits"] == hits + 1
+
+    def test_cached_positions_are_not_shared(self):
+        cache = PrefixCache()
+        seq = parse("A ⟿ ⊠⊕")
+        first = cache.execute(seq)
+        first.intersections.append({"x": 1})
+        assert len(cache.execute(seq).intersections) == 1
+
+    def test_clear(self):
+        cache = PrefixCache()
+        cache.execute(parse("A ⟿ ⊕⊕"))
+        cache.clear()
+        assert len(cache) == 0
+
+    def test_rejects_zero_capacity(self):
+        with pytest.raises(ValueError):
+            PrefixCache(max_nodes=0)
+
+
+# =============================================================================
+#                         CACHED, STREAMING RENDERING
+# =============================================================================
+
+class TestStreamingRender:
+    """Tests for describe_iter(), notation_iter() and cached fragments."""
+
+    ROUTES = [
+        "Earth ⟿ ⊕[3]⟲[90]◬⊠∿ ⟿ Celestial_Realm",
+        "A ⟿ ⊕⊖[1]⟳[12.5]⇄∥⊥∞∅",
+        "A ⟿ ",
+    ]
+
+    def test_describe_iter_joins_to_describe(self):
+        for notation in self.ROUTES:
+            seq = parse(notation)
+            assert "".join(seq.describe_iter()) == seq.describe()
+
+    def test_notation_iter_joins_to_notation(self):
+        for notation in self.ROUTES:
+            seq = parse(notation)
+            assert "".join(seq.notation_iter()) == seq.notation()
+
+    def test_describe_streams_into_sink(self):
+        seq = parse(self.ROUTES[0])
+        sink = io.StringIO()
+        sink.writelines(seq.describe_iter())
+        assert sink.getvalue() == seq.describe()
+
+    def test_describe_iter_one_chunk_per_operation(self):
+        seq = parse(self.ROUTES[0])
+        assert len(list(seq.describe_iter())) == 1 + len(seq.operations) + 1
+
+    def test_describe_iter_is_lazy(self):
+        seq = TransformationSequence("A", [Operation('⊕', 'ascend')] * 10)
+        assert next(seq.describe_iter()) == "From A"
+
+    def test_fragments_distinguish_int_and_float(self):
+        as_int = TransformationSequence("A", [Operation('⟲', 'rotate_cw', 90)])
+        as_float = TransformationSequence("A", [Operation('⟲', 'rotate_cw', 90.0)])
+        assert "Rotate 90 clockwise" in as_int.describe()
+        assert "Rotate 90.0 clockwise" in as_float.describe()
+
+    def test_unknown_operation_renders_nothing(self):
+        seq = TransformationSequence("A", [Operation('?', 'unknown')])
+        assert seq.describe() == "From A"
+
+
+# =============================================================================
+#                               OPTIMIZE
+# =============================================================================
+
+class TestOptimize:
+    """Tests for TransformationSequence.optimize()."""
+
+    ROUTES = [
+        "Earth ⟿ ⊕[3]⟲[90]◬⊠∿ ⟿ Celestial_Realm",
+        "A ⟿ ⊕⊕⊖[5]⟲[90]⟳[45]⟲[270]⇄⇄⇄∿∿∥⊥◬◬ ⟿ B",
+        "A ⟿ ⊕[4]⟲[10]⇄∿∥∅⊕[1]⊠⊕[1]∞∞⊠",
+        "A ⟿ ⟲[0.1]⟲[0.2]⟳[0.3]",
+    ]
+
+    def test_final_position_unchanged(self):
+        for notation in self.ROUTES:
+            seq = parse(notation)
+            assert seq.optimize().execute()[0] == seq.execute()[0]
+
+    def test_folds_runs(self):
+        seq = parse("A ⟿ ⊕⊕⊖[5]⟲[90]⟳[45]⇄⇄⇄∿∿ ⟿ B")
+        assert seq.optimize().notation() == "A ⟿ ⊖[3]⟲[45]⇄ ⟿ B"
+
+    def test_prefers_shorter_rotation(self):
+        assert parse("A ⟿ ⟲[270]").optimize().notation() == "A ⟿ ⟳[90]"
+
+    def test_cancelling_run_disappears(self):
+        assert parse("A ⟿ ⊕⊖⟲⟳⇄⇄").optimize().operations == []
+
+    def test_void_drops_dead_operations(self):
+        seq = parse("A ⟿ ⊕[4]⟲[10]◬⇄∥∅")
+        assert seq.optimize().notation() == "A ⟿ ◬∥∅"
+
+    def test_intersections_are_barriers(self):
+        seq = parse("A ⟿ ⊕⊠⊕")
+        assert seq.optimize().notation() == "A ⟿ ⊕[1]⊠⊕[1]"
+
+    def test_keeps_recursion_marker(self):
+        seq = parse("A ⟿ ⊕∞∞⊕")
+        optimized = seq.optimize()
+        assert optimized.recursive
+        assert optimized.notation() == "A ⟿ ⊕[1]∞⊕[1]"
+
+    def test_keeps_last_mode(self):
+        assert parse("A ⟿ ∥⊥∥").optimize().notation() == "A ⟿ ∥"
+
+
+# =============================================================================
+#                            COMMAND LINE
+# =============================================================================
+
+class TestCommandLine:
+    """Tests for the `python -m omnidirectional_math` batch engine."""
+
+    JOURNEYS = (
+        "Earth ⟿ ⊕[3]⟲[90]◬⊠∿ ⟿ Celestial_Realm\n"
+        "\n"
+        "# a comment\n"
+        "A ⟿ ⊕⊕⊖\n"
+    )
+
+    def _file(self, tmp_path, text=None):
+        path = tmp_path / "journeys.txt"
+        path.write_text(self.JOURNEYS if text is None else text, encoding="utf-8")
+        return str(path)
+
+    def _json_records(self, capsys):
+        return [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+    def test_execute_json(self, tmp_path, capsys):
+        assert main([self._file(tmp_path), "--quiet"]) == 0
+        records = self._json_records(capsys)
+        assert [r["line"] for r in records] == [1, 4]
+        assert records[0]["realm"] == "Celestial_Realm"
+        assert records[0]["dimension"] == 3
+        assert records[0]["intersections"] == 1
+        assert records[0]["steps"] == 5
+
+    def test_reverse_action(self, tmp_path, capsys):
+        main([self._file(tmp_path), "--action", "reverse", "--quiet"])
+        records = self._json_records(capsys)
+        assert records[1]["notation"] == parse("A ⟿ ⊕⊕⊖").reverse().notation()
+
+    def test_optimize_action(self, tmp_path, capsys):
+        main([self._file(tmp_path), "--action", "optimize", "--quiet"])
+        assert self._json_records(capsys)[1]["notation"] == "A ⟿ ⊕[1]"
+
+    def test_describe_action(self, tmp_path, capsys):
+        main([self._file(tmp_path), "--action", "describe", "--quiet"])
+        assert self._json_records(capsys)[0]["description"].startswith("From Earth")
+
+    def test_csv_format(self, tmp_path, capsys):
+        main([self._file(tmp_path), "--format", "csv", "--quiet"])
+        rows = list(csv.DictReader(io.StringIO(capsys.readouterr().out)))
+        assert rows[0]["realm"] == "Celestial_Realm"
+        assert rows[1]["dimension"] == "1"
+
+    def test_binary_format(self, tmp_path):
+        out = tmp_path / "out.bin"
+        main([self._file(tmp_path), "--format", "binary", "--output", str(out), "--quiet"])
+        data = out.read_bytes()
+        line, status, length = BINARY_HEADER.unpack_from(data, 0)
+        assert (line, status) == (1, 0)
+        payload = data[BINARY_HEADER.size:BINARY_HEADER.size + length]
+        fields = EXECUTE_RECORD.unpack_from(payload)
+        assert fields[0] == 3 and fields[1] == 90.0
+        assert payload[EXECUTE_RECORD.size:].decode("utf-8") == "Celestial_Realm"
+
+    def test_binary_unrepresentable_result_is_error_record(self, tmp_path):
+        out = tmp_path / "out.bin"
+        text = "A ⟿ ⊕[1e20]\nA ⟿ ⊕[2]\n"
+        assert main([self._file(tmp_path, text), "--format", "binary", "--output", str(out), "--quiet"]) == 1
+        data = out.read_bytes()
+        records, offset = [], 0
+        while offset < len(data):
+            line, status, length = BINARY_HEADER.unpack_from(data, offset)
+            offset += BINARY_HEADER.size
+            records.append((line, status, data[offset:offset + length]))
+            offset += length
+        assert [(line, status) for line, status, _ in records] == [(1, 1), (2, 0)]
+        assert b"does not fit the binary record" in records[0][2]
+        assert EXECUTE_RECORD.unpack_from(records[1][2])[0] == 2
+
+    def test_batch_size_must_be_positive(self, tmp_path, capsys):
+        for size in ["0", "-3"]:
+            with pytest.raises(SystemExit):
+                main([self._file(tmp_path), "--batch-size", size])
+            assert "--batch-size must be at least 1" in capsys.readouterr().err
+
+    def test_stdin(self, tmp_path, capsys, monkeypatch):
+        monkeypatch.setattr(sys, "stdin", io.StringIO("A ⟿ ⊕[2]\n"))
+        main(["-", "--quiet"])
+        assert self._json_records(capsys)[0]["dimension"] == 2
+
+    def test_workers_preserve_order(self, tmp_path, capsys):
+        text = "".join(f"A ⟿ ⊕[{n}]\n" for n in range(1, 41))
+        main([self._file(tmp_path, text), "--workers", "2", "--batch-size", "3", "--quiet"])
+        assert [r["dimension"] for r in self._json_records(capsys)] == list(range(1, 41))
+
+    def test_errors_reported_and_exit_status(self, tmp_path, capsys):
+        assert main([self._file(tmp_path, "not a journey\n"), "--quiet"]) == 1
+        assert "error" in self._json_records(capsys)[0]
+
+    def test_bad_numbers_fail_only_their_line(self, tmp_path, capsys):
+        text = "A ⟿ ⊕[1]\nA ⟿ ⊕[inf] ⟿ B\nA ⟿ ⟲[nan] ⟿ B\nA ⟿ ⟲[1e308]\nA ⟿ ⊕[2]\n"
+        for extra in ([], ["--workers", "2", "--batch-size", "2"]):
+            assert main([self._file(tmp_path, text), "--quiet", *extra]) == 1
+            records = self._json_records(capsys)
+            assert [r["line"] for r in records] == [1, 2, 3, 4, 5]
+            assert all("error" in r for r in records[1:4])
+            assert [records[0]["dimension"], records[4]["dimension"]] == [1, 2]
+
+    def test_deep_nesting_fails_only_its_line(self, tmp_path, capsys):
+        text = "A ⟿ ⊕[1]\nA ⟿ " + "(" * 1000 + "⊕" + ")" * 1000 + "\nA ⟿ ⊕[2]\n"
+        for extra in ([], ["--workers", "2", "--batch-size", "1"]):
+            assert main([self._file(tmp_path, text), "--quiet", *extra]) == 1
+            records = self._json_records(capsys)
+            assert [r["line"] for r in records] == [1, 2, 3]
+            assert "nested too deeply" in records[1]["error"]
+        stats = CorpusStats()
+        stats.add("A ⟿ " + "(" * 1000 + "⊕" + ")" * 1000)
+        assert stats.errors == 1
+
+    def test_throughput_report(self, tmp_path, capsys):
+        main([self._file(tmp_path)])
+        err = capsys.readouterr().err
+        assert "lines/s" in err
+        assert "p50" in err and "p99" in err
+        assert "peak RSS" in err
+
+
+# =============================================================================
+#                          COMPILED SEQUENCES
+# =============================================================================
+
+class TestCompiledSequence:
+    """Tests for compile(), power() and CompiledSequence."""
+
+    def _repeat(self, notation, n):
+        seq = parse(notation)
+        ops_string = notation.split(FLOW)[1].strip()
+        return seq, parse(f"{seq.origin.realm} {FLOW} {ops_string * n} {FLOW} {seq.destination}")
+
+    def test_compile_matches_execute(self):
+        for notation in ["Earth ⟿ ⊕[3]⟲[90]◬∿ ⟿ Sky",
+                         "A ⟿ ⊕[5]∅⊕[2]⇄∿∥ ⟿ B",
+                         "A ⟿ ⟳[12.5]⊥∞◬◬ ⟿ B"]:
+            seq = parse(notation)
+            assert seq.compile().apply(seq.origin) == seq.execute()[0]
+
+    def test_power_matches_repetition(self):
+        for notation in ["A ⟿ ⊕[1]⟲[33.3]⇄∿◬ ⟿ B",
+                         "A ⟿ ⊖[2]∅⟳[10]∿∥ ⟿ B"]:
+            for n in (1, 2, 3, 7, 10):
+                seq, repeated = self._repeat(notation, n)
+                assert seq.power(n).apply(seq.origin) == repeated.execute()[0]
+
+    def test_power_zero_is_identity(self):
+        seq = parse("A ⟿ ⊕[4]∿ ⟿ B")
+        assert seq.power(0).apply(seq.origin) == seq.origin
+
+    def test_power_of_a_billion(self):
+        seq = parse("A ⟿ ⊕[1]⟲[0.1]⇄◬ ⟿ B")
+        final = seq.power(10**9).apply(seq.origin)
+        assert final.dimension == 10**9
+        assert final.crossings == 10**9
+        assert final.angle == 280.0  # 10^8 degrees mod 360
+        assert final.polarity == 1
+        assert final.realm == "B"
+
+    def test_power_rejects_negative(self):
+        with pytest.raises(ValueError):
+            parse("A ⟿ ⊕").power(-1)
+
+    def test_then_is_associative(self):
+        a, b, c = (parse(n).compile() for n in ("A ⟿ ⊕⟲[10]∿", "A ⟿ ∅⇄∥", "A ⟿ ⊖[3]∿◬⊥"))
+        assert a.then(b).then(c) == a.then(b.then(c))
+
+    def test_void_summary_is_absolute(self):
+        compiled = parse("A ⟿ ⊕[9]∅⊕[2]").compile()
+        assert compiled.voided
+        assert compiled.dimension == 2
+        assert compiled.apply(Position(dimension=50)).dimension == 2
+
+    def test_intersections_cannot_compile(self):
+        with pytest.raises(ValueError):
+            parse("A ⟿ ⊕⊠").compile()
+
+    def test_compiled_is_hashable(self):
+        assert hash(parse("A ⟿ ⊕").compile()) == hash(parse("A ⟿ ⊕[1]").compile())
+
+
+# =============================================================================
+#                              REPETITION
+# =============================================================================
+
+class TestRepetition:
+    """Tests for (...)^N groups and their lazy evaluation."""
+
+    @staticmethod
+    def _expanded(seq):
+        ops = []
+        for op in seq.operations:
+            ops.extend(op.expand() if isinstance(op, Repetition) else [op])
+        return TransformationSequence(seq.origin, ops, seq.destination)
+
+    def test_parses_group_as_one_node(self):
+        seq = parse("Earth ⟿ (⊕[1]⟲[90])^1000 ⟿ Sky")
+        assert len(seq.operations) == 1
+        group = seq.operations[0]
+        assert isinstance(group, Repetition)
+        assert group.count == 1000
+        assert [op.name for op in group.operations] == ['ascend', 'rotate_cw']
+
+    def test_count_defaults_to_one(self):
+        seq = parse("A ⟿ (⊕⇄) ⟿ B")
+        assert seq.operations[0].count == 1
+
+    def test_nested_groups(self):
+        seq = parse("A ⟿ ((⊕)^3⊖)^4 ⟿ B")
+        assert seq.dimension_delta == 8
+        assert seq.complexity == 16
+        assert seq.execute()[0].dimension == 8
+
+    def test_notation_round_trip(self):
+        notation = "A ⟿ ⊕[2]((⟲[45]∿)^3◬)^10⇄ ⟿ B"
+        assert parse(notation).notation() == notation
+
+    def test_matches_expanded_execution(self):
+        for notation in ["A ⟿ (⊕[1]⟲[90])^7 ⟿ B",
+                         "A ⟿ ⊖(⊕[2]∅⟳[30]∿)^3∥ ⟿ B",
+                         "A ⟿ (⊕⊠(◬⇄)^2)^3 ⟿ B"]:
+            seq = parse(notation)
+            expanded = self._expanded(seq)
+            final, trail = seq.execute()
+            expected, expected_trail = expanded.execute()
+            assert final == expected
+            assert trail == expected_trail
+            assert seq.complexity == expanded.complexity
+            assert seq.dimension_delta == expanded.dimension_delta
+
+    def test_huge_count_evaluated_without_expansion(self):
+        seq = parse("A ⟿ (⊕[1]⟲[90])^1000000000 ⟿ B")
+        assert seq.complexity == 2 * 10**9
+        assert seq.dimension_delta == 10**9
+        assert seq.compile().apply(seq.origin).dimension == 10**9
+        fields = seq.to_function()(*seq.origin.fields())
+        assert Position(*fields).dimension == 10**9
+
+    def test_void_inside_group_resets_delta(self):
+        seq = parse("A ⟿ ⊕[5](⊕[3]∅⊕[2])^4 ⟿ B")
+        assert seq.dimension_delta == 2
+
+    def test_reverse_inverts_group(self):
+        seq = parse("A ⟿ (⊕[2]⟲[30])^5 ⟿ B")
+        back = seq.reverse()
+        assert back.notation() == "B ⟿ (⟳[30]⊖[2])^5 ⟿ A"
+        assert back.execute()[0].dimension == -10
+
+    def test_recursion_marker_inside_group(self):
+        assert parse("A ⟿ (⊕∞)^2 ⟿ B").recursive
+
+    def test_optimize_keeps_group(self):
+        seq = parse("A ⟿ (⊕⊕⟲[10]⟲[20])^4 ⟿ B")
+        optimized = seq.optimize()
+        assert optimized.notation() == "A ⟿ (⊕[2]⟲[30])^4 ⟿ B"
+        assert optimized.execute()[0] == seq.execute()[0]
+
+    def test_describe_group(self):
+        text = parse("A ⟿ (⊕[1]⇄)^3 ⟿ B").describe()
+        assert "Repeat 3 times [" in text
+
+    def test_unbalanced_parentheses(self):
+        with pytest.raises(ValueError):
+            parse("A ⟿ (⊕⟲ ⟿ B")
+        with pytest.raises(ValueError):
+            parse("A ⟿ ⊕)^2 ⟿ B")
+        with pytest.raises(ValueError):
+            parse("A ⟿ (⊕)^ ⟿ B")
+
+
+# =============================================================================
+#                             JOURNEY TABLE
+# =============================================================================
+
+class TestJourneyTable:
+    """Tests for JourneyTable columnar route summaries."""
+
+    LIBRARY = [
+        "Earth ⟿ ⊕[6]◬◬◬ ⟿ Sky",
+        "Earth ⟿ ⊕[2]◬⊠⟲[90] ⟿ Sea",
+        "Sea ⟿ ⊕[9]◬∞ ⟿ Sky",
+        "Sky ⟿ ⊖[3]⟲[120]◬◬◬⊠⊠",
+        "Earth ⟿ (⊕◬)^5⟲[180] ⟿ Moon",
+    ]
+
+    @pytest.fixture
+    def table(self):
+        return JourneyTable.from_sequences(self.LIBRARY)
+
+    def test_row_summary(self, table):
+        row = table.row(1)
+        assert row.origin == "Earth"
+        assert row.destination == "Sea"
+        assert row.complexity == 4
+        assert row.dimension_delta == 2
+        assert row.final_angle == 90.0
+        assert row.crossings == 1
+        assert row.intersections == 1
+        assert row.recursive is False
+
+    def test_rows_match_execution(self, table):
+        for i, notation in enumerate(self.LIBRARY):
+            seq = parse(notation)
+            final, _ = seq.execute()
+            row = table.row(i)
+            assert row.dimension_delta == seq.dimension_delta
+            assert row.final_angle == final.angle
+            assert row.crossings == final.crossings
+            assert row.intersections == len(final.intersections)
+
+    def test_missing_destination(self, table):
+        assert table.row(3).destination is None
+        assert table.where(table.destination == None) == [3]  # noqa: E711
+
+    def test_query(self, table):
+        assert table.query("dimension_delta >= 5 & crossings > 2") == [0, 4]
+
+    def test_query_or_binds_looser(self, table):
+        assert table.query("recursive == true | origin == Sky & intersections > 1") == [2, 3]
+
+    def test_mask_operators(self, table):
+        mask = (table.origin == "Earth") & ~(table.crossings > 3)
+        assert table.where(mask) == [0, 1]
+        assert mask.count() == 2
+        assert table.where((table.origin == "Sea") | (table.origin == "Sky")) == [2, 3]
+
+    def test_unknown_realm_matches_nothing(self, table):
+        assert table.where(table.origin == "Atlantis") == []
+
+    def test_realm_columns_reject_ordering(self, table):
+        with pytest.raises(TypeError):
+            table.origin > "Earth"
+        with pytest.raises(TypeError):
+            table.range("origin", 0, 1)
+
+    def test_range_in_value_order(self, table):
+        assert table.range("final_angle", 90, 180) == [1, 3, 4]
+        assert table.range("dimension_delta", low=5) == [4, 0, 2]
+        assert table.range("dimension_delta", high=0) == [3]
+
+    def test_range_index_refreshed_on_append(self, table):
+        assert table.range("crossings", 10) == []
+        table.append("A ⟿ (◬)^12")
+        assert table.range("crossings", 10) == [5]
+
+    def test_realm_codes_are_shared(self, table):
+        assert table.realms == ["Earth", "Sky", "Sea", "Moon"]
+        assert list(table.values("origin")) == [0, 0, 2, 1, 0]
+
+    def test_bad_clause(self, table):
+        with pytest.raises(ValueError):
+            table.query("crossings ~ 3")
+        with pytest.raises(KeyError):
+            table.query("speed > 3")
+
+
+# =============================================================================
+#                            INTERNED TRAILS
+# =============================================================================
+
+class TestInternedTrail:
+    """Tests for InternedTrail state deduplication."""
+
+    def test_matches_list_trail(self):
+        seq = parse("A ⟿ ⊕[2]⟲[90]⊠∿∅⇄◬⊥ ⟿ B")
+        trail = InternedTrail()
+        final, returned = seq.execute(trail=trail)
+        assert returned is trail
+        assert list(trail) == seq.execute()[1]
+        assert final == seq.execute()[0]
+
+    def test_cycle_stores_few_states(self):
+        seq = parse("A ⟿ (⟲[90]∿)^1000 ⟿ B")
+        trail = InternedTrail()
+        seq.execute(trail=trail)
+        stats = trail.stats()
+        assert stats["steps"] == 2000
+        assert stats["distinct_states"] == 8
+        assert stats["distinct_operations"] == 2
+        assert stats["dedup_ratio"] == 500.0
+
+    def test_indexing(self):
+        seq = parse("A ⟿ ⊕⊕⊕ ⟿ B")
+        trail = InternedTrail()
+        seq.execute(trail=trail)
+        assert len(trail) == 3
+        assert trail[-1].after.dimension == 3
+        assert trail[1].before.dimension == 1
+        with pytest.raises(IndexError):
+            trail[3]
+
+    def test_disconnected_steps(self):
+        first = parse("A ⟿ ⊕⊕").execute()[1]
+        second = parse("B ⟿ ⊖").execute()[1]
+        trail = InternedTrail(first + second)
+        assert list(trail) == first + second
+
+    def test_reads_are_independent_copies(self):
+        trail = InternedTrail(parse("A ⟿ ⊕∿").execute()[1])
+        trail[0].after.dimension = 99
+        assert trail[0].after.dimension == 1
+        assert trail[1].before.dimension == 1
+
+    def test_empty(self):
+        trail = InternedTrail()
+        assert len(trail) == 0
+        assert trail.stats()["dedup_ratio"] == 0.0
+
+
+# =============================================================================
+#                          DELTA-ENCODED TRAILS
+# =============================================================================
+
+class TestDeltaTrail:
+    """Tests for DeltaTrail delta-encoded step storage."""
+
+    NOTATION = "A ⟿ ⊕[2]⟲[90]⊠∿∅⇄◬⊥⟳[33.3]⊠⊖∥ ⟿ B"
+
+    def test_iteration_matches_list_trail(self):
+        seq = parse(self.NOTATION)
+        trail = DeltaTrail()
+        final, returned = seq.execute(trail=trail)
+        assert returned is trail
+        assert list(trail) == seq.execute()[1]
+        assert final == seq.execute()[0]
+
+    def test_random_access_between_checkpoints(self):
+        steps = parse(self.NOTATION).execute()[1]
+        trail = DeltaTrail(steps, checkpoint_every=4)
+        assert len(trail) == len(steps)
+        for i in range(len(steps)):
+            assert trail[i] == steps[i]
+        assert trail[-1] == steps[-1]
+        with pytest.raises(IndexError):
+            trail[len(steps)]
+
+    def test_repeated_operations_share_deltas(self):
+        trail = DeltaTrail()
+        parse("A ⟿ (⊕◬⟲[10])^500").execute(trail=trail)
+        stats = trail.stats()
+        assert stats["steps"] == 1500
+        assert stats["distinct_deltas"] == 3
+        assert stats["distinct_operations"] == 3
+        assert stats["checkpoints"] == 2
+
+    def test_disconnected_steps(self):
+        first = parse("A ⟿ ⊕⊕").execute()[1]
+        second = parse("B ⟿ ⊖⊠").execute()[1]
+        trail = DeltaTrail(first + second)
+        assert list(trail) == first + second
+        assert trail[2] == second[0]
+
+    def test_off_grid_angle(self):
+        origin = Position(angle=0.12345678912)
+        steps = TransformationSequence(origin, parse("A ⟿ ⟲[1]∅").operations).execute()[1]
+        assert list(DeltaTrail(steps)) == steps
+
+    def test_reads_are_independent_copies(self):
+        trail = DeltaTrail(parse("A ⟿ ⊕⊠∿").execute()[1])
+        for step in trail:
+            step.after.dimension = 99
+            step.after.intersections.clear()
+        assert [s.after.dimension for s in trail] == [1, 1, 1]
+        assert len(trail[2].after.intersections) == 1
+
+    def test_checkpoint_validation(self):
+        with pytest.raises(ValueError):
+            DeltaTrail(checkpoint_every=0)
+
+
+# =============================================================================
+#                              ROUTE CACHE
+# =============================================================================
+
+class TestRouteCache:
+    """Tests for the persistent RouteCache."""
+
+    ROUTES = [
+        "Earth ⟿ ⊕[3]⟲[90]◬∿ ⟿ Celestial_Realm",
+        "Earth ⟿ ⊕[3]⟲[90]◬⊠∿ ⟿ Celestial_Realm",
+        "HOME ⟿ (⊕[1]⟳[45.5])^1000∞∥",
+        "Sky ⟿ ∅((⇄)^3◬)^2⊥ ⟿ ",
+    ]
+
+    @pytest.fixture
+    def path(self, tmp_path):
+        path = str(tmp_path / "routes.cache")
+        with RouteCache(path) as cache:
+            for notation in self.ROUTES:
+                cache.load(notation)
+            cache.save()
+        return path
+
+    def test_round_trip(self, path):
+        with RouteCache(path) as cache:
+            assert len(cache) == len(self.ROUTES)
+            for notation in self.ROUTES:
+                sequence, _ = cache.get(notation)
+                expected = parse(notation)
+                assert sequence.notation() == expected.notation()
+                assert sequence.destination == expected.destination
+                assert sequence.execute() == expected.execute()
+
+    def test_compiled_summary_stored(self, path):
+        with RouteCache(path) as cache:
+            _, compiled = cache.get(self.ROUTES[0])
+            assert compiled == parse(self.ROUTES[0]).compile()
+            _, compiled = cache.get(self.ROUTES[2])
+            assert compiled.dimension == 1000
+
+    def test_intersection_routes_have_no_summary(self, path):
+        with RouteCache(path) as cache:
+            assert cache.get(self.ROUTES[1])[1] is None
+
+    def test_miss_and_load(self, path):
+        with RouteCache(path) as cache:
+            assert cache.get("A ⟿ ⊖") is None
+            sequence, compiled = cache.load("A ⟿ ⊖")
+            assert compiled.dimension == -1
+            assert "A ⟿ ⊖" in cache
+            assert cache.misses == 2
+            assert cache.hits == 0
+
+    def test_save_merges_new_routes(self, path):
+        with RouteCache(path) as cache:
+            cache.load("A ⟿ ⊖")
+            cache.save()
+        with RouteCache(path) as cache:
+            assert len(cache) == len(self.ROUTES) + 1
+            assert all(notation in cache for notation in self.ROUTES + ["A ⟿ ⊖"])
+
+    def test_engine_version_change_invalidates(self, path, monkeypatch):
+        import omnidirectional_math
+        monkeypatch.setattr(omnidirectional_math, "ENGINE_VERSION", "0.0-test")
+        with RouteCache(path) as cache:
+            assert cache.invalidated
+            assert len(cache) == 0
+            cache.load(self.ROUTES[0])
+            cache.save()
+            assert not cache.invalidated
+        with RouteCache(path) as cache:
+            assert len(cache) == 1
+
+    def test_foreign_file_is_invalidated(self, tmp_path):
+        path = tmp_path / "other.cache"
+        path.write_bytes(b"not a route cache" * 10)
+        with RouteCache(str(path)) as cache:
+            assert cache.invalidated
+            assert cache.get(self.ROUTES[0]) is None
+
+    def test_missing_file_starts_empty(self, tmp_path):
+        with RouteCache(str(tmp_path / "new.cache")) as cache:
+            assert len(cache) == 0
+            assert not cache.invalidated
+
+    def test_oversized_repeat_count_kept_in_memory(self, path):
+        huge = "A ⟿ (⊕)^99999999999999999999"
+        with RouteCache(path) as cache:
+            cache.load(huge)
+            cache.load("A ⟿ ⊖")
+            cache.save()
+            assert cache.get(huge)[0].operations[0].count == 99999999999999999999
+        with RouteCache(path) as cache:
+            assert "A ⟿ ⊖" in cache
+            assert huge not in cache
+            assert len(cache) == len(self.ROUTES) + 1
+
+    def test_truncated_file_is_invalidated(self, path):
+        with open(path, "r+b") as f:
+            f.truncate(os.path.getsize(path) - 5)
+        with RouteCache(path) as cache:
+            assert cache.invalidated
+            assert cache.get(self.ROUTES[0]) is None
+            cache.load(self.ROUTES[0])
+            cache.save()
+        with RouteCache(path) as cache:
+            assert not cache.invalidated and len(cache) == 1
+
+    def test_corrupt_record_is_invalidated(self, path):
+        with open(path, "r+b") as f:
+            f.seek(RouteCache.HEADER_SIZE)
+            f.write(b"\xee" * 64)
+        with RouteCache(path) as cache:
+            for notation in self.ROUTES:
+                cache.get(notation)
+            assert cache.invalidated
+            assert cache.get(self.ROUTES[0]) is None
+
+
+# =============================================================================
+#                             REALM REGISTRY
+# =============================================================================
+
+class TestRealmRegistry:
+    """Tests for RealmRegistry and realm names on positions and sequences."""
+
+    def test_ids_in_first_seen_order(self):
+        registry = RealmRegistry()
+        assert registry.id("Earth") == 0
+        assert registry.id("Sky") == 1
+        assert registry.id("Earth") == 0
+        assert registry.name(1) == "Sky"
+        assert registry.names() == ["Earth", "Sky"]
+        assert "Sky" in registry and "Sea" not in registry
+        assert len(registry) == 2
+
+    def test_get_does_not_register(self):
+        registry = RealmRegistry(["Earth"])
+        assert registry.get("Earth") == 0
+        assert registry.get("Sky") is None
+        assert registry.get("Sky", -2) == -2
+        assert len(registry) == 1
+
+    def test_concurrent_registration_gives_unique_ids(self):
+        registry = RealmRegistry()
+        names = [f"Realm_{i}" for i in range(2000)]
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda chunk: [registry.id(n) for n in chunk], [names] * 8))
+        assert sorted(registry.id(n) for n in names) == list(range(2000))
+        assert all(registry.name(registry.id(n)) == n for n in names)
+
+    def test_tables_own_their_realms(self):
+        first = JourneyTable.from_sequences(["Earth ⟿ ⊕ ⟿ Sky"])
+        second = JourneyTable.from_sequences(["Sea ⟿ ⊕ ⟿ Moon"])
+        assert first.realms == ["Earth", "Sky"]
+        assert second.realms == ["Sea", "Moon"]
+
+    def test_positions_store_realm_ids(self):
+        p = Position(realm="Earth")
+        q = p.copy()
+        q.realm = "Sky"
+        assert p.realm == "Earth" and q.realm == "Sky"
+        assert p.realm_id == REALMS.id("Earth") and q.realm_id == REALMS.id("Sky")
+        assert p.state_key()[0] == p.realm_id
+        final, _ = parse("Earth ⟿ ⊕∅").execute()
+        assert final.realm == "Void" and final.realm_id == REALMS.id("Void")
+        final, _ = parse("Earth ⟿ ⊕ ⟿ Sky").execute()
+        assert final.realm_id == q.realm_id
+
+    def test_full_registry_keeps_names(self, monkeypatch):
+        import omnidirectional_math
+        monkeypatch.setattr(omnidirectional_math, "REALMS", RealmRegistry(["Origin", "Void"], limit=3))
+        earth = Position(realm="Earth")
+        assert earth.realm_id == 2
+        sea = Position(realm="Sea")  # no room: kept as a name
+        assert sea.realm == "Sea" and sea.realm_id is None
+        assert sea.state_key() == Position(realm="Sea").state_key()
+        final, _ = parse("Sea ⟿ ⊕∅ ⟿ Moon").execute()
+        assert final.realm == "Moon"
+        assert len(omnidirectional_math.REALMS) == 3
+        assert pickle.loads(pickle.dumps(sea)) == sea
+        with pytest.raises(ValueError, match="full"):
+            omnidirectional_math.REALMS.id("Moon")
+
+    def test_pickles_round_trip(self):
+        seq = parse("Pickled_Origin ⟿ ⊕ ⟿ Pickled_Destination")
+        restored = pickle.loads(pickle.dumps(seq))
+        assert restored.destination == "Pickled_Destination"
+        assert pickle.loads(pickle.dumps(Position(realm="Pickled_Origin"))) == seq.origin
+
+
+# =============================================================================
+#                           CORPUS STATISTICS
+# =============================================================================
+
+class TestCorpusStats:
+    """Tests for CorpusStats streaming aggregation."""
+
+    CORPUS = [
+        "Earth ⟿ ⊕[3]⟲[90]◬ ⟿ Sky",
+        "Earth ⟿ ⊕[3]⟲[90]◬ ⟿ Sky",
+        "Earth ⟿ ∅⊕ ⟿ Sky",
+        "Sky ⟿ (⊖⇄)^4∞",
+        "# a comment",
+        "",
+        "not a journey",
+    ]
+
+    def test_counts_and_rates(self):
+        stats = CorpusStats().update(self.CORPUS)
+        assert stats.journeys == 4
+        assert stats.errors == 1
+        summary = stats.summary()
+        assert summary["void_rate"] == 0.25
+        assert summary["recursion_rate"] == 0.25
+
+    def test_operator_histogram_multiplies_groups(self):
+        stats = CorpusStats().update(self.CORPUS)
+        assert stats.operators["ascend"] == 3
+        assert stats.operators["descend"] == 4
+        assert stats.operators["polarity"] == 4
+        assert stats.operators["infinite"] == 1
+
+    def test_accepts_sequences(self):
+        stats = CorpusStats()
+        stats.add(parse("A ⟿ ⊕⊕"))
+        assert stats.summary()["complexity"]["max"] == 2
+
+    def test_quantiles(self):
+        stats = CorpusStats().update(f"A ⟿ (⊕)^{n}" for n in range(1, 1001))
+        complexity = stats.summary()["complexity"]
+        assert complexity["min"] == 1 and complexity["max"] == 1000
+        assert abs(complexity["p50"] - 500) <= 5
+        assert abs(complexity["p90"] - 900) <= 5
+        assert abs(complexity["p99"] - 990) <= 2
+        assert abs(stats.summary()["dimension_delta"]["p50"] - 500) <= 5
+
+    def test_top_routes(self):
+        stats = CorpusStats(top_n=2).update(self.CORPUS)
+        assert stats.top_routes() == [("Earth ⟿ ⊕[3]⟲[90]◬ ⟿ Sky", 2), ("Earth ⟿ ∅⊕ ⟿ Sky", 1)]
+
+    def test_heavy_hitters_found_among_many_rare_routes(self):
+        stats = CorpusStats(top_n=3)
+        for i in range(5000):
+            stats.add(f"A ⟿ ⊕[{i + 10}]")
+            if i % 10 == 0:
+                stats.add("A ⟿ ⊖")
+            if i % 25 == 0:
+                stats.add("A ⟿ ⇄")
+        assert [route for route, _ in stats.top_routes(2)] == ["A ⟿ ⊖", "A ⟿ ⇄"]
+
+    def test_memory_stays_bounded(self):
+        stats = CorpusStats(top_n=5)
+        stats.update(f"A ⟿ ⊕[{i}]⟲[{i % 360}]" for i in range(1, 20001))
+        assert len(stats._routes.counts) <= 50
+        assert len(stats.complexity.centroids) + len(stats.complexity._buffer) < 2000
+        assert len(stats.dimension_delta.centroids) <= 200
+
+    def test_merge(self):
+        left = CorpusStats().update(self.CORPUS[:2])
+        right = CorpusStats().update(self.CORPUS[2:])
+        merged = left.merge(right).summary()
+        whole = CorpusStats().update(self.CORPUS).summary()
+        assert merged["journeys"] == whole["journeys"]
+        assert merged["operators"] == whole["operators"]
+        assert merged["top_routes"] == whole["top_routes"]
+        assert merged["complexity"] == whole["complexity"]
+
+    def test_empty_summary(self):
+        summary = CorpusStats().summary()
+        assert summary["journeys"] == 0
+        assert summary["complexity"]["p50"] is None
+        assert summary["void_rate"] == 0.0
+
+    def test_validation(self):
+        with pytest.raises(ValueError):
+            CorpusStats(top_n=0)